@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Fuzz corpus and throughput benchmark for infra.json_scan.
+
+The corpus wraps random JSON objects (quotes with braces, escaped quotes,
+backslashes, unicode) in random prose, including unmatched braces and quotes,
+and feeds them to the scanner. The whole-text search must yield exactly the
+embedded object, and its candidates must match a naive per-position brace
+matcher. The streaming scanner fed in random chunk sizes must yield the
+top-level subset of those candidates. The legacy brace counter is checked on
+the same corpus for comparison. Pathological inputs (runs of unmatched "{"
+and quotes) are timed for both scanners to catch quadratic rescans.
+
+Run:  python -m benchmarks.bench_json_scan [--cases 2000] [--seed 1] [--mb 8] [--pathological 8000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+if __package__ in (None, ""):
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from infra.json_scan import extract_first_json_object, iter_candidates_by_start, iter_json_object_candidates
+
+_ATOMS = ["{", "}", "[", "]", '"', "\\", "\\\"", "п. {3.1}", "}{", "«", "»", "\n", "\t", "₽", "a", " ", "ё"]
+_PROSE = [
+    "Вот результат:", "Готово.", "см. {приложение 1}", "Ответ ниже", "}", "{не JSON}", "\"", "\\",
+    "```", "Итого", "", "Note {see below.", "Use braces like { here.",
+]
+
+
+def legacy_coerce(text: str) -> Optional[str]:
+    """The pre-scanner brace counter (no string awareness, stops at the first candidate)."""
+    s = text.strip()
+    start = s.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    for i in range(start, len(s)):
+        ch = s[i]
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                candidate = s[start:i + 1]
+                try:
+                    json.loads(candidate)
+                    return candidate
+                except Exception:
+                    return None
+    return None
+
+
+def _rand_str(rng: random.Random) -> str:
+    return "".join(rng.choice(_ATOMS) for _ in range(rng.randint(0, 12)))
+
+
+def _rand_value(rng: random.Random, depth: int = 0):
+    kind = rng.randint(0, 5 if depth < 3 else 2)
+    if kind == 0:
+        return _rand_str(rng)
+    if kind == 1:
+        return rng.choice([None, True, False, rng.randint(-10**6, 10**6), rng.random()])
+    if kind == 2:
+        return _rand_str(rng)
+    if kind == 3:
+        return [_rand_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {_rand_str(rng): _rand_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+def make_case(rng: random.Random) -> tuple[str, str]:
+    obj = {_rand_str(rng): _rand_value(rng) for _ in range(rng.randint(1, 5))}
+    body = json.dumps(obj, ensure_ascii=rng.random() < 0.3, indent=rng.choice([None, 2]))
+    # проза до объекта не должна содержать валидный JSON-объект; кавычки/скобки — пожалуйста
+    before = " ".join(rng.choice(_PROSE) for _ in range(rng.randint(0, 4)))
+    after = " ".join(rng.choice(_PROSE) for _ in range(rng.randint(0, 4)))
+    return before + "\n" + body + "\n" + after, body
+
+
+def _chunks(text: str, rng: random.Random) -> List[str]:
+    out, pos = [], 0
+    while pos < len(text):
+        step = rng.randint(1, 64)
+        out.append(text[pos:pos + step])
+        pos += step
+    return out
+
+
+def _scan_streaming(chunks: List[str]) -> List[str]:
+    return list(iter_json_object_candidates(chunks))
+
+
+_OPEN = re.compile(r'\{\s*["}]')
+
+
+def _naive_end(text: str, start: int) -> Optional[int]:
+    """Char-by-char match of the object opened at text[start] (string/escape aware)."""
+    depth, in_string, escape = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def _naive_spans(text: str) -> List[Tuple[int, int]]:
+    """Reference for iter_candidates_by_start: every object-looking "{" matched from scratch."""
+    spans = []
+    for start in range(len(text)):
+        if _OPEN.match(text, start):
+            end = _naive_end(text, start)
+            if end is not None:
+                spans.append((start, end))
+    return spans
+
+
+def _top_level(text: str, spans: List[Tuple[int, int]]) -> List[str]:
+    """What the streaming scanner must yield: candidates not nested in an earlier one."""
+    out, last = [], 0
+    for start, end in spans:
+        if start >= last:
+            out.append(text[start:end])
+            last = end
+    return out
+
+
+def run_fuzz(cases: int, seed: int) -> None:
+    rng = random.Random(seed)
+    legacy_ok = 0
+    for i in range(cases):
+        text, expected = make_case(rng)
+        got = extract_first_json_object(text)
+        if got is None or json.loads(got) != json.loads(expected):
+            raise SystemExit(f"case {i}: whole-text scan mismatch\n{text!r}")
+        spans = _naive_spans(text)
+        if list(iter_candidates_by_start(text)) != [text[a:b] for a, b in spans]:
+            raise SystemExit(f"case {i}: candidates by start differ from the naive matcher\n{text!r}")
+        if _scan_streaming(_chunks(text, rng)) != _top_level(text, spans):
+            raise SystemExit(f"case {i}: streaming scan differs from candidates by start\n{text!r}")
+        legacy = legacy_coerce(text)
+        if legacy is not None and json.loads(legacy) == json.loads(expected):
+            legacy_ok += 1
+    print(f"fuzz: {cases} cases OK (legacy brace counter: {legacy_ok}/{cases} correct)")
+
+
+def run_throughput(megabytes: float) -> None:
+    item = {"field": "product.name", "quote": "см. {п. 3.1} \"Поставка\" \\ ₽", "where": "ТЗ"}
+    count = max(1, int(megabytes * 1024 * 1024 / len(json.dumps(item, ensure_ascii=False))))
+    text = "Результат:\n" + json.dumps({"evidence": [item] * count}, ensure_ascii=False) + "\nГотово."
+    size_mb = len(text.encode("utf-8")) / 1024 / 1024
+
+    started = time.perf_counter()
+    assert extract_first_json_object(text) is not None
+    scan = time.perf_counter() - started
+
+    started = time.perf_counter()
+    legacy_coerce(text)
+    legacy = time.perf_counter() - started
+
+    print(f"throughput on {size_mb:.1f} MB: scanner {size_mb / scan:.1f} MB/s "
+          f"(incl. json.loads), legacy {size_mb / legacy:.1f} MB/s")
+
+
+def run_pathological(n: int, limit_sec: float = 2.0) -> None:
+    """Runs of unmatched openers and quotes: both scanners must stay linear."""
+    cases = {
+        "stray {": "{" * n + '{"a":1}',
+        "quoted {": '{"{"' * n + '{"a":1}',
+        "open keys": '{"a":' * n + ' {"a":1}',
+        "spaced {": "{ " * n + '{"a":1}',
+    }
+    for name, text in cases.items():
+        started = time.perf_counter()
+        whole = extract_first_json_object(text)
+        whole_sec = time.perf_counter() - started
+        started = time.perf_counter()
+        streamed = _scan_streaming([text[i:i + 4096] for i in range(0, len(text), 4096)])
+        stream_sec = time.perf_counter() - started
+        if whole != '{"a":1}' or streamed[-1:] != [whole]:
+            raise SystemExit(f"pathological {name!r}: wrong result {whole!r} / {streamed[-1:]!r}")
+        print(f"pathological {name!r} x{n}: whole-text {whole_sec * 1000:.1f} ms, streaming {stream_sec * 1000:.1f} ms")
+        if max(whole_sec, stream_sec) > limit_sec:
+            raise SystemExit(f"pathological {name!r}: over {limit_sec} s — scanner is not linear")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mb", type=float, default=8.0)
+    parser.add_argument("--pathological", type=int, default=8000, help="Repeats in pathological inputs.")
+    args = parser.parse_args()
+    run_fuzz(args.cases, args.seed)
+    run_pathological(args.pathological)
+    run_throughput(args.mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end throughput benchmark: run_pipeline + cleanup against the local mock API.
+
+For every concurrency level the same synthetic tenders (``--tenders`` x
+``--files`` files of ``--file-kb`` KB) go through run_pipeline (upload,
+attach, index polling, Responses call, validation) on a thread pool, then
+every store is removed with cleanup_store. The mock (benchmarks.mock_openai)
+runs as a subprocess, so the resource figures cover the client only.
+
+Reported per level: tenders/min, p50/p95/p99 of each stage (from the run's
+trace spans) and of whole tenders, cleanup latency, peak RSS, peak thread
+count and peak open sockets (Linux /proc; None elsewhere), mock request and
+injection counters.
+
+Latency profiles (``--profile``) preset the mock knobs; any mock flag
+(``--latency OP=MEDIAN[:SIGMA]``, ``--index-delay``, ``--rate-limit``, ...)
+overrides the profile. ``--out`` saves the report as JSON; ``--baseline``
+compares with a saved report and exits with 1 on a regression beyond
+``--tolerance``.
+
+Run:  python -m benchmarks.bench_pipeline [--tenders 20] [--files 3] [--file-kb 64]
+          [--jobs 1,4,8] [--profile fast|realistic|flaky] [--out r.json] [--baseline base.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+if __package__ in (None, ""):
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.mock_openai import add_mock_arguments
+from infra.journal_stats import LogHistogram
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # client overhead only: the mock answers almost at once
+    "fast": {"default_latency": "0.002", "latency": ["create_response=0.05"], "index_delay": "0.1"},
+    # roughly what the real API looks like for small tenders
+    "realistic": {
+        "default_latency": "0.08:0.3",
+        "latency": ["upload_file=0.4:0.5", "attach_file=0.3:0.4", "create_response=6:0.4"],
+        "index_delay": "3:0.4",
+        "upload_mb_s": 20.0,
+    },
+    # realistic-but-shorter with throttling and server errors
+    "flaky": {
+        "default_latency": "0.05:0.3",
+        "latency": ["create_response=1:0.4"],
+        "index_delay": "1:0.3",
+        "rate_limit": 0.05,
+        "retry_after": 0.2,
+        "error_rate": 0.01,
+    },
+}
+
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _percentiles(hist: LogHistogram) -> Optional[Dict[str, float]]:
+    if not hist.count:
+        return None
+    out = {"count": hist.count, "mean": round(hist.total / hist.count, 4)}
+    for q in _QUANTILES:
+        out[f"p{int(q * 100)}"] = round(hist.quantile(q), 4)
+    out["max"] = round(hist.max, 4)
+    return out
+
+
+# ============================== resources ==============================
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1048576.0
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _open_sockets() -> Optional[int]:
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    n = 0
+    for fd in fds:
+        try:
+            if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                n += 1
+        except OSError:
+            continue
+    return n
+
+
+class ResourceSampler:
+    """Background sampler of RSS, thread count and open sockets; keeps the peaks."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_rss_mb: Optional[float] = None
+        self.peak_threads = 0
+        self.peak_sockets: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bench-sampler", daemon=True)
+
+    def _sample(self) -> None:
+        rss = _rss_mb()
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, rss)
+        self.peak_threads = max(self.peak_threads, threading.active_count() - 1)  # minus the sampler
+        socks = _open_sockets()
+        if socks is not None:
+            self.peak_sockets = max(self.peak_sockets or 0, socks)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "ResourceSampler":
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        if self.peak_rss_mb is None:  # no /proc: fall back to the lifetime peak
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak_rss_mb = maxrss / (1048576.0 if sys.platform == "darwin" else 1024.0)
+
+
+# ============================== mock ==============================
+
+def _mock_argv(args: argparse.Namespace) -> List[str]:
+    argv = ["--default-latency", args.default_latency, "--index-delay", args.index_delay,
+            "--upload-mb-s", str(args.upload_mb_s), "--index-failure-rate", str(args.index_failure_rate),
+            "--rate-limit", str(args.rate_limit), "--retry-after", str(args.retry_after),
+            "--error-rate", str(args.error_rate), "--invalid-output-rate", str(args.invalid_output_rate)]
+    for item in args.latency or []:
+        argv += ["--latency", item]
+    if args.seed is not None:
+        argv += ["--seed", str(args.seed)]
+    return argv
+
+
+def start_mock(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    root = str(Path(__file__).resolve().parents[1])
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_openai", "--port", "0", *_mock_argv(args)],
+        cwd=root, stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline() if proc.stdout else ""
+    if "http" not in line:
+        proc.kill()
+        raise RuntimeError(f"mock did not start: {line!r}")
+    return proc, line.split(" at ", 1)[1].strip()
+
+
+def _mock_call(url: str, method: str, path: str) -> Dict[str, Any]:
+    root = url.rsplit("/v1", 1)[0]
+    return requests.request(method, f"{root}/__mock/{path}", timeout=10).json()
+
+
+# ============================== run ==============================
+
+def make_corpus(folder: str, tenders: int, files: int, file_kb: int) -> List[List[str]]:
+    """Synthetic tenders: text files of the requested size (incompressible enough for uploads)."""
+    corpus = []
+    for t in range(tenders):
+        paths = []
+        for f in range(files):
+            path = os.path.join(folder, f"t{t:04d}_{f}.txt")
+            with open(path, "wb") as fp:
+                fp.write(os.urandom(file_kb * 1024 // 2).hex().encode("ascii"))
+            paths.append(path)
+        corpus.append(paths)
+    return corpus
+
+
+def run_level(corpus: List[List[str]], jobs: int, mock_url: str) -> Dict[str, Any]:
+    from core.batch import BATCH_STAGES, stage_durations
+    from core.pipeline import run_pipeline
+    from core.vector_store_cleanup import cleanup_store
+    from infra.tracing import get_trace
+
+    _mock_call(mock_url, "POST", "reset")
+    stages = {name: LogHistogram() for name in BATCH_STAGES}
+    tender_hist = LogHistogram()
+    cleanup_hist = LogHistogram()
+    store_ids: List[str] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def one(files: List[str]) -> None:
+        t0 = time.perf_counter()
+        try:
+            out = run_pipeline(files, auto_cleanup_min=0)
+        except Exception as exc:
+            with lock:
+                errors.append(f"{type(exc).__name__}: {exc}"[:300])
+            return
+        elapsed = time.perf_counter() - t0
+        trace = get_trace(out.trace_id) if out.trace_id else None
+        with lock:
+            store_ids.append(out.store_id)
+            tender_hist.add(elapsed)
+            for name, sec in (stage_durations(trace) if trace else {}).items():
+                stages[name].add(sec)
+
+    def clean(store_id: str) -> None:
+        t0 = time.perf_counter()
+        try:
+            cleanup_store(store_id, on_progress=None)
+        except Exception as exc:
+            with lock:
+                errors.append(f"cleanup {type(exc).__name__}: {exc}"[:300])
+            return
+        with lock:
+            cleanup_hist.add(time.perf_counter() - t0)
+
+    with ResourceSampler() as sampler:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="bench") as pool:
+            list(pool.map(one, corpus))
+        wall = time.perf_counter() - started
+        cleanup_started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="bench-clean") as pool:
+            list(pool.map(clean, store_ids))
+        cleanup_wall = time.perf_counter() - cleanup_started
+
+    ok = tender_hist.count
+    return {
+        "jobs": jobs,
+        "tenders": len(corpus),
+        "ok": ok,
+        "failed": len(corpus) - ok,
+        "wall_sec": round(wall, 3),
+        "tenders_per_min": round(ok / wall * 60.0, 2) if wall > 0 else None,
+        "tender_sec": _percentiles(tender_hist),
+        "stages_sec": {name: _percentiles(h) for name, h in stages.items() if h.count},
+        "cleanup_sec": _percentiles(cleanup_hist),
+        "cleanup_wall_sec": round(cleanup_wall, 3),
+        "peak_rss_mb": round(sampler.peak_rss_mb, 1) if sampler.peak_rss_mb is not None else None,
+        "peak_threads": sampler.peak_threads,
+        "peak_sockets": sampler.peak_sockets,
+        "errors": errors[:20],
+        "mock": _mock_call(mock_url, "GET", "stats"),
+    }
+
+
+# ============================== baseline ==============================
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            min_delta_sec: float = 0.05) -> List[str]:
+    """Regressions of ``report`` against ``baseline`` (levels matched by ``jobs``)."""
+    problems: List[str] = []
+    base_levels = {lvl["jobs"]: lvl for lvl in baseline.get("levels", [])}
+    for lvl in report["levels"]:
+        base = base_levels.get(lvl["jobs"])
+        if base is None:
+            continue
+        tag = f"jobs={lvl['jobs']}"
+        cur_tpm, base_tpm = lvl.get("tenders_per_min"), base.get("tenders_per_min")
+        if cur_tpm is not None and base_tpm and cur_tpm < base_tpm * (1 - tolerance):
+            problems.append(f"{tag}: tenders/min {cur_tpm} < baseline {base_tpm}")
+        pairs = [("tender", lvl.get("tender_sec"), base.get("tender_sec"))]
+        pairs += [(f"stage {name}", stat, (base.get("stages_sec") or {}).get(name))
+                  for name, stat in (lvl.get("stages_sec") or {}).items()]
+        for label, cur, old in pairs:
+            if not cur or not old:
+                continue
+            if cur["p95"] > old["p95"] * (1 + tolerance) and cur["p95"] - old["p95"] > min_delta_sec:
+                problems.append(f"{tag}: {label} p95 {cur['p95']}s > baseline {old['p95']}s")
+        cur_rss, base_rss = lvl.get("peak_rss_mb"), base.get("peak_rss_mb")
+        if cur_rss and base_rss and cur_rss > base_rss * (1 + tolerance):
+            problems.append(f"{tag}: peak RSS {cur_rss} MB > baseline {base_rss} MB")
+        if lvl["failed"] > base.get("failed", 0):
+            problems.append(f"{tag}: {lvl['failed']} failed tenders (baseline {base.get('failed', 0)})")
+    return problems
+
+
+def _print_level(lvl: Dict[str, Any]) -> None:
+    t = lvl["tender_sec"] or {}
+    print(f"jobs={lvl['jobs']:<3} ok={lvl['ok']}/{lvl['tenders']}  {lvl['tenders_per_min']} tenders/min  "
+          f"tender p50/p95/p99 {t.get('p50')}/{t.get('p95')}/{t.get('p99')} s  "
+          f"rss {lvl['peak_rss_mb']} MB  threads {lvl['peak_threads']}  sockets {lvl['peak_sockets']}")
+    for name, st in lvl["stages_sec"].items():
+        print(f"    {name:<15} p50 {st['p50']:<8} p95 {st['p95']:<8} p99 {st['p99']:<8} n={st['count']}")
+    c = lvl["cleanup_sec"] or {}
+    print(f"    {'cleanup':<15} p50 {c.get('p50')!s:<8} p95 {c.get('p95')!s:<8} wall {lvl['cleanup_wall_sec']} s")
+    for err in lvl["errors"][:3]:
+        print(f"    ! {err}")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=str(Path(__file__).resolve().parents[1]), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main() -> None:
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    profile = pre.parse_known_args()[0].profile
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--tenders", type=int, default=20)
+    parser.add_argument("--files", type=int, default=3, help="files per tender")
+    parser.add_argument("--file-kb", type=int, default=64)
+    parser.add_argument("--jobs", default="1,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--out", help="save the report as JSON")
+    parser.add_argument("--baseline", help="report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    add_mock_arguments(parser)
+    parser.set_defaults(**PROFILES[profile])
+    args = parser.parse_args()
+    levels = [int(x) for x in args.jobs.split(",") if x.strip()]
+
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    proc, url = start_mock(args)
+    os.environ["OPENAI_BASE_URL"] = url
+    os.environ["OPENAI_API_KEY"] = "mock"
+    # keep the benchmark's journal and store registry out of the real results/
+    import core.store_registry as store_registry
+    import infra.log_journal as log_journal
+    store_registry.STORE_REGISTRY_PATH = os.path.join(workdir, "store_registry.jsonl")
+    log_journal.LOG_FILE = os.path.join(workdir, "journal.jsonl")
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "profile": args.profile,
+            "mock_args": _mock_argv(args),
+            "tenders": args.tenders,
+            "files_per_tender": args.files,
+            "file_kb": args.file_kb,
+        },
+        "levels": [],
+    }
+    try:
+        corpus = make_corpus(workdir, args.tenders, args.files, args.file_kb)
+        print(f"mock at {url}; profile {args.profile}; {args.tenders} tenders x {args.files} x {args.file_kb} KB")
+        for jobs in levels:
+            lvl = run_level(corpus, jobs, url)
+            report["levels"].append(lvl)
+            _print_level(lvl)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+        print(f"report: {args.out}")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fp:
+            problems = compare(report, json.load(fp), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        if problems:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
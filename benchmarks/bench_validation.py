@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark: one-parse ValidatedResult vs the legacy string round trips.
+
+Legacy flow per response: validate_and_dump_json (parse + dumps), then
+json.loads in _save_result_record, append_result_entry and the GUI formatter.
+New flow: validate_extraction once, consumers reuse ``data``/``clean_json``.
+
+Run:  python -m benchmarks.bench_validation [--evidence 2000] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.bench_json_scan import legacy_coerce
+from infra.models import TenderExtract, validate_extraction
+
+
+def make_response(evidence: int, prose: bool = False) -> str:
+    body = {
+        "product": {"name": "Станок токарный 16К20", "qty": 3, "condition": "new"},
+        "delivery": {"address": "г. Москва, ул. Ленина, д. 1", "deadline": "2025-03-15"},
+        "payment_terms": "Оплата в течение 30 дней после поставки",
+        "restrictions": {"gov_1875_applicable": True},
+        "evidence": [
+            {"field": "product.name", "quote": f"Цитата №{i}: «поставка станка»", "where": f"ТЗ, стр. {i}"}
+            for i in range(evidence)
+        ],
+        "uncertainties": [{"field": "product.qty", "reason": None, "hint": "спецификация"}],
+    }
+    text = json.dumps(body, ensure_ascii=False, indent=2)
+    if prose:
+        text = "Вот результат извлечения:\n" + text + "\nГотово."
+    return text
+
+
+def _legacy_validate(text: str) -> str:
+    # Копия поведения до ValidatedResult: парс, при ошибке — json.loads кандидата и повторный парс
+    s = text.strip()
+    try:
+        obj = TenderExtract.model_validate_json(s)
+    except Exception:
+        candidate = legacy_coerce(s) or s
+        json.loads(candidate)
+        obj = TenderExtract.model_validate_json(candidate)
+    return json.dumps(obj.model_dump(exclude_none=True), ensure_ascii=False)
+
+
+def legacy_flow(text: str) -> None:
+    clean = _legacy_validate(text)
+    json.loads(clean)                                                   # _save_result_record
+    json.loads(clean)                                                   # append_result_entry
+    json.dumps(json.loads(clean), ensure_ascii=False, indent=2)         # GUI _format_json
+
+
+def new_flow(text: str) -> None:
+    result = validate_extraction(text)
+    _ = result.data                                                     # save_result
+    _ = result.data                                                     # append_result_entry
+    result.pretty()                                                     # GUI / CLI
+
+
+def _best_of(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--evidence", type=int, nargs="+", default=[10, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'evidence':>9} {'prose':>6} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for n in args.evidence:
+        for prose in (False, True):
+            text = make_response(n, prose=prose)
+            old = _best_of(legacy_flow, text, args.repeat)
+            new = _best_of(new_flow, text, args.repeat)
+            print(f"{n:>9} {str(prose):>6} {old * 1000:>10.2f} {new * 1000:>8.2f} {old / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,653 @@
+# -*- coding: utf-8 -*-
+"""
+Offline stand-in for the parts of the OpenAI API the pipeline uses.
+
+Serves /files, /vector_stores (create/get/list/delete, attach/list/detach
+files, file batches) and /responses from memory, with:
+
+  * per-operation latency (lognormal: median and sigma) and an optional
+    upload bandwidth limit;
+  * indexing delay per attached file (stores stay ``in_progress`` until
+    every file is done) and an indexing failure rate;
+  * 429 (with Retry-After) and 5xx injection rates;
+  * canned schema-valid outputs, chosen by the ``schema`` front-matter of
+    the system prompt in the request, plus an invalid-output rate.
+
+Operation names match VectorStoreClient (upload_file, attach_file,
+create_store, get_store, create_response, ...). ``GET /__mock/stats``
+returns request and injection counters; ``POST /__mock/reset`` clears state.
+
+Run:  python -m benchmarks.mock_openai [--port 8780] [--latency create_response=4:0.4]
+          [--index-delay 2] [--rate-limit 0.02] [--error-rate 0.01] [--seed 1]
+Then: OPENAI_BASE_URL=http://127.0.0.1:8780/v1 OPENAI_API_KEY=mock python cli.py ...
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+if __package__ in (None, ""):
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from infra.models import parse_front_matter
+
+
+class Latency:
+    """Lognormal delay with the given median (seconds); sigma 0 means a fixed delay."""
+
+    def __init__(self, median: float = 0.0, sigma: float = 0.0):
+        self.median = max(0.0, float(median))
+        self.sigma = max(0.0, float(sigma))
+
+    @classmethod
+    def parse(cls, text: str) -> "Latency":
+        """``"0.2"`` or ``"0.2:0.5"`` (median:sigma)."""
+        median, _, sigma = text.partition(":")
+        return cls(float(median), float(sigma or 0.0))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median
+        return self.median * math.exp(rng.gauss(0.0, self.sigma))
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"Latency({self.median}, {self.sigma})"
+
+
+_TENDER = {
+    "product": {"name": "Станок токарный 16К20", "qty": 3, "condition": "new"},
+    "delivery": {"address": "г. Москва, ул. Ленина, д. 1", "deadline": "2025-03-15"},
+    "payment_terms": "Оплата в течение 30 дней после поставки",
+    "restrictions": {"gov_1875_applicable": True},
+    "evidence": [{"field": "product.name", "quote": "поставка станка токарного 16К20", "where": "ТЗ, п. 1"}],
+    "uncertainties": [],
+}
+_CONTRACT = {
+    "contract": {"number": "12/25-П", "date": "2025-02-01", "subject": "Поставка станка"},
+    "parties": {"customer": "ООО «Заказчик»", "supplier": "АО «Поставщик»"},
+    "price": {"amount": 1250000.0, "currency": "RUB", "vat_included": True},
+    "delivery": {"address": "г. Москва, ул. Ленина, д. 1", "deadline": "2025-03-15"},
+    "payment_terms": "30 дней после подписания УПД",
+    "penalties": "0,1% за день просрочки",
+    "evidence": [{"field": "price.amount", "quote": "1 250 000 руб.", "where": "п. 2.1"}],
+    "uncertainties": [],
+}
+_PRICE_REQUEST = {
+    "request": {"number": "ЗЦ-77", "customer": "ООО «Заказчик»", "response_deadline": "2025-02-20"},
+    "items": [{"name": "Станок токарный 16К20", "qty": 3, "unit": "шт", "condition": "new"}],
+    "delivery": {"address": "г. Москва, ул. Ленина, д. 1", "deadline": "2025-03-15"},
+    "payment_terms": None,
+    "evidence": [{"field": "items[0].name", "quote": "Станок токарный 16К20 — 3 шт.", "where": "таблица 1"}],
+    "uncertainties": [],
+}
+CANNED_OUTPUTS: Dict[str, Dict[str, Any]] = {
+    "tender_extract": _TENDER,
+    "contract_extract": _CONTRACT,
+    "price_request_extract": _PRICE_REQUEST,
+}
+
+
+class MockConfig:
+    """Knobs of the mock; every field can be changed between runs."""
+
+    def __init__(
+        self,
+        *,
+        latency: Optional[Dict[str, Latency]] = None,
+        upload_mb_s: float = 0.0,
+        index_delay: Optional[Latency] = None,
+        index_failure_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        error_rate: float = 0.0,
+        invalid_output_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = dict(latency or {})
+        self.upload_mb_s = upload_mb_s
+        self.index_delay = index_delay or Latency(0.0)
+        self.index_failure_rate = index_failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.invalid_output_rate = invalid_output_rate
+        self.seed = seed
+
+    def latency_for(self, op: str) -> Latency:
+        return self.latency.get(op) or self.latency.get("default") or Latency(0.0)
+
+
+class _MockError(Exception):
+    def __init__(self, status: int, message: str, kind: str = "invalid_request_error",
+                 headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.kind = kind
+        self.headers = headers or {}
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}{uuid4().hex[:24]}"
+
+
+def _page(items: List[Dict[str, Any]], query: Dict[str, str]) -> Dict[str, Any]:
+    """Cursor pagination like the real API: limit/after, has_more, first_id/last_id."""
+    items = sorted(items, key=lambda x: (x.get("created_at", 0), x["id"]), reverse=query.get("order", "desc") == "desc")
+    limit = max(1, min(100, int(query.get("limit", 20))))
+    after = query.get("after")
+    if after:
+        ids = [x["id"] for x in items]
+        items = items[ids.index(after) + 1:] if after in ids else []
+    page = items[:limit]
+    return {
+        "object": "list",
+        "data": page,
+        "first_id": page[0]["id"] if page else None,
+        "last_id": page[-1]["id"] if page else None,
+        "has_more": len(items) > limit,
+    }
+
+
+class MockOpenAI:
+    """In-memory API state plus the HTTP server around it."""
+
+    def __init__(self, config: Optional[MockConfig] = None):
+        self.config = config or MockConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.reset()
+
+    # -------- state --------
+
+    def reset(self) -> None:
+        with self._lock:
+            self.files: Dict[str, Dict[str, Any]] = {}
+            self.stores: Dict[str, Dict[str, Any]] = {}
+            self.store_files: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            self.batches: Dict[str, Dict[str, Any]] = {}
+            self.requests: Dict[str, int] = {}
+            self.injected: Dict[str, int] = {"429": 0, "5xx": 0, "invalid_output": 0, "index_failed": 0}
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "injected": dict(self.injected),
+                "files": len(self.files),
+                "stores": len(self.stores),
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+            }
+
+    def _random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _sample(self, latency: Latency) -> float:
+        with self._rng_lock:
+            return latency.sample(self._rng)
+
+    def _store(self, store_id: str) -> Dict[str, Any]:
+        store = self.stores.get(store_id)
+        if store is None:
+            raise _MockError(404, f"No vector store found with id '{store_id}'.")
+        return store
+
+    def _refresh_store(self, store: Dict[str, Any]) -> Dict[str, Any]:
+        """Advance indexing of the store's files and derive the store status (call under the lock)."""
+        now = time.time()
+        counts = {"in_progress": 0, "completed": 0, "failed": 0, "cancelled": 0, "total": 0}
+        for vf in self.store_files.get(store["id"], {}).values():
+            if vf["status"] == "in_progress" and now >= vf["_ready_at"]:
+                vf["status"] = "failed" if vf["_fail"] else "completed"
+                if vf["_fail"]:
+                    vf["last_error"] = {"code": "server_error", "message": "Mock indexing failure."}
+            counts[vf["status"]] += 1
+            counts["total"] += 1
+        store["file_counts"] = counts
+        expires_at = store.get("expires_at")
+        if expires_at and now >= expires_at:
+            store["status"] = "expired"
+        else:
+            store["status"] = "in_progress" if counts["in_progress"] else "completed"
+        return store
+
+    @staticmethod
+    def _public(obj: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in obj.items() if not k.startswith("_")}
+
+    # -------- operations --------
+
+    def upload_file(self, filename: str, size: int, purpose: str) -> Dict[str, Any]:
+        obj = {
+            "id": _new_id("file-"),
+            "object": "file",
+            "bytes": size,
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        with self._lock:
+            self.files[obj["id"]] = obj
+        return obj
+
+    def create_store(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        now = int(time.time())
+        store = {
+            "id": _new_id("vs_"),
+            "object": "vector_store",
+            "name": body.get("name"),
+            "created_at": now,
+            "last_active_at": now,
+            "status": "completed",
+            "usage_bytes": 0,
+            "file_counts": {},
+            "expires_after": body.get("expires_after"),
+            "expires_at": None,
+            "metadata": body.get("metadata") or {},
+        }
+        days = (body.get("expires_after") or {}).get("days")
+        if days:
+            store["expires_at"] = now + int(float(days) * 86400)
+        with self._lock:
+            self.stores[store["id"]] = store
+            self.store_files[store["id"]] = {}
+            return self._public(self._refresh_store(store))
+
+    def attach_file(self, store_id: str, file_id: str) -> Dict[str, Any]:
+        delay = self._sample(self.config.index_delay)
+        fail = self._random() < self.config.index_failure_rate
+        with self._lock:
+            store = self._store(store_id)
+            f = self.files.get(file_id)
+            if f is None:
+                raise _MockError(404, f"No file found with id '{file_id}'.")
+            vf = {
+                "id": file_id,
+                "object": "vector_store.file",
+                "vector_store_id": store_id,
+                "created_at": int(time.time()),
+                "usage_bytes": f["bytes"],
+                "status": "in_progress",
+                "last_error": None,
+                "_ready_at": time.time() + delay,
+                "_fail": fail,
+            }
+            if fail:
+                self.injected["index_failed"] += 1
+            self.store_files[store_id][file_id] = vf
+            store["usage_bytes"] += f["bytes"]
+            store["last_active_at"] = int(time.time())
+            self._refresh_store(store)
+            return self._public(vf)
+
+    def create_file_batch(self, store_id: str, file_ids: List[str]) -> Dict[str, Any]:
+        for fid in file_ids:
+            self.attach_file(store_id, fid)
+        batch = {
+            "id": _new_id("vsfb_"),
+            "object": "vector_store.file_batch",
+            "vector_store_id": store_id,
+            "created_at": int(time.time()),
+            "_file_ids": list(file_ids),
+        }
+        with self._lock:
+            self.batches[batch["id"]] = batch
+        return self.get_file_batch(store_id, batch["id"])
+
+    def get_file_batch(self, store_id: str, batch_id: str) -> Dict[str, Any]:
+        with self._lock:
+            batch = self.batches.get(batch_id)
+            if batch is None or batch["vector_store_id"] != store_id:
+                raise _MockError(404, f"No file batch found with id '{batch_id}'.")
+            self._refresh_store(self._store(store_id))
+            files = [self.store_files[store_id].get(fid) for fid in batch["_file_ids"]]
+            counts = {"in_progress": 0, "completed": 0, "failed": 0, "cancelled": 0, "total": len(files)}
+            for vf in files:
+                counts[vf["status"] if vf else "cancelled"] += 1
+            out = self._public(batch)
+            out["file_counts"] = counts
+            out["status"] = "in_progress" if counts["in_progress"] else ("failed" if counts["failed"] else "completed")
+            return out
+
+    def create_response(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        messages = payload.get("input") or []
+        system = next((m.get("content") for m in messages if isinstance(m, dict) and m.get("role") == "system"), "")
+        prompt_chars = sum(len(str(m.get("content") or "")) for m in messages if isinstance(m, dict))
+        store_bytes = 0
+        with self._lock:
+            for tool in payload.get("tools") or []:
+                for sid in tool.get("vector_store_ids") or []:
+                    store = self._refresh_store(self._store(sid))
+                    if store["status"] == "expired":
+                        raise _MockError(400, f"Vector store {sid} is expired.")
+                    store["last_active_at"] = int(time.time())
+                    store_bytes += store["usage_bytes"]
+        schema = parse_front_matter(str(system or "")).get("schema") or "tender_extract"
+        if self._random() < self.config.invalid_output_rate:
+            with self._lock:
+                self.injected["invalid_output"] += 1
+            text = "Не удалось найти в документах данные для заполнения схемы."
+        else:
+            text = json.dumps(CANNED_OUTPUTS.get(schema, _TENDER), ensure_ascii=False, indent=2)
+        input_tokens = prompt_chars // 4 + min(store_bytes // 4, 20000)
+        output_tokens = max(1, len(text) // 4)
+        return {
+            "id": _new_id("resp_"),
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": payload.get("model"),
+            "output": [
+                {"type": "file_search_call", "id": _new_id("fs_"), "status": "completed"},
+                {
+                    "type": "message",
+                    "id": _new_id("msg_"),
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                },
+            ],
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                      "total_tokens": input_tokens + output_tokens},
+        }
+
+    # -------- routing --------
+
+    def route(self, method: str, parts: List[str], query: Dict[str, str],
+              body: Dict[str, Any], upload: Optional[Tuple[str, int, str]]) -> Tuple[str, Dict[str, Any]]:
+        """(operation, JSON response) for a request path split into parts (after /v1)."""
+        n = len(parts)
+        if parts[:1] == ["files"]:
+            if n == 1 and method == "POST":
+                if upload is None:
+                    raise _MockError(400, "Missing 'file' part.")
+                return "upload_file", self.upload_file(*upload)
+            if n == 1 and method == "GET":
+                with self._lock:
+                    items = [f for f in self.files.values()
+                             if not query.get("purpose") or f["purpose"] == query["purpose"]]
+                return "list_uploaded_files", _page(items, query)
+            if n == 2 and method == "GET":
+                with self._lock:
+                    f = self.files.get(parts[1])
+                if f is None:
+                    raise _MockError(404, f"No such File object: {parts[1]}")
+                return "get_uploaded_file", f
+            if n == 2 and method == "DELETE":
+                with self._lock:
+                    if self.files.pop(parts[1], None) is None:
+                        raise _MockError(404, f"No such File object: {parts[1]}")
+                return "delete_uploaded_file", {"id": parts[1], "object": "file", "deleted": True}
+        if parts[:1] == ["vector_stores"]:
+            if n == 1 and method == "POST":
+                return "create_store", self.create_store(body)
+            if n == 1 and method == "GET":
+                with self._lock:
+                    items = [self._public(self._refresh_store(s)) for s in self.stores.values()]
+                return "list_stores", _page(items, query)
+            sid = parts[1] if n > 1 else ""
+            if n == 2 and method == "GET":
+                with self._lock:
+                    return "get_store", self._public(self._refresh_store(self._store(sid)))
+            if n == 2 and method == "DELETE":
+                with self._lock:
+                    self._store(sid)
+                    del self.stores[sid]
+                    self.store_files.pop(sid, None)
+                return "delete_store", {"id": sid, "object": "vector_store.deleted", "deleted": True}
+            if n >= 3 and parts[2] == "files":
+                if n == 3 and method == "POST":
+                    return "attach_file", self.attach_file(sid, str(body.get("file_id") or ""))
+                with self._lock:
+                    self._refresh_store(self._store(sid))
+                    files = self.store_files.get(sid, {})
+                    if n == 3 and method == "GET":
+                        return "list_files", _page([self._public(v) for v in files.values()], query)
+                    vf = files.get(parts[3]) if n == 4 else None
+                    if vf is None:
+                        raise _MockError(404, f"No file found with id '{parts[3] if n == 4 else ''}' in vector store.")
+                    if method == "GET":
+                        return "get_file", self._public(vf)
+                    if method == "DELETE":
+                        del files[parts[3]]
+                        return "delete_file", {"id": parts[3], "object": "vector_store.file.deleted", "deleted": True}
+            if n >= 3 and parts[2] == "file_batches":
+                if n == 3 and method == "POST":
+                    return "create_file_batch", self.create_file_batch(sid, list(body.get("file_ids") or []))
+                if n == 4 and method == "GET":
+                    return "get_file_batch", self.get_file_batch(sid, parts[3])
+                if n == 5 and parts[4] == "files" and method == "GET":
+                    self.get_file_batch(sid, parts[3])  # 404 for unknown batches
+                    with self._lock:
+                        ids = self.batches[parts[3]]["_file_ids"]
+                        items = [self._public(self.store_files[sid][f]) for f in ids if f in self.store_files[sid]]
+                    return "list_file_batch_files", _page(items, query)
+        if parts == ["responses"] and method == "POST":
+            return "create_response", self.create_response(body)
+        raise _MockError(404, f"Unknown route {method} /{'/'.join(parts)}")
+
+    @staticmethod
+    def operation_of(method: str, parts: List[str]) -> str:
+        """Operation name for latency/injection before the request is executed."""
+        n = len(parts)
+        head = parts[0] if parts else ""
+        if head == "responses":
+            return "create_response"
+        if head == "files":
+            return {("POST", 1): "upload_file", ("GET", 1): "list_uploaded_files",
+                    ("DELETE", 2): "delete_uploaded_file"}.get((method, n), "get_uploaded_file")
+        if head == "vector_stores":
+            if n <= 2:
+                return {("POST", 1): "create_store", ("GET", 1): "list_stores",
+                        ("GET", 2): "get_store", ("DELETE", 2): "delete_store"}.get((method, n), "vector_stores")
+            if parts[2] == "files":
+                return {("POST", 3): "attach_file", ("GET", 3): "list_files",
+                        ("GET", 4): "get_file", ("DELETE", 4): "delete_file"}.get((method, n), "files")
+            if parts[2] == "file_batches":
+                return {("POST", 3): "create_file_batch", ("GET", 4): "get_file_batch",
+                        ("GET", 5): "list_file_batch_files"}.get((method, n), "file_batches")
+        return "unknown"
+
+    # -------- server --------
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "MockOpenAI":
+        handler = type("MockOpenAIHandler", (_MockHandler,), {"mock": self})
+        self.server = ThreadingHTTPServer((host, int(port)), handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="mock-openai", daemon=True).start()
+        return self
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as OPENAI_BASE_URL."""
+        assert self.server is not None, "call start() first"
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def _parse_upload(content_type: str, body: bytes) -> Tuple[Optional[Tuple[str, int, str]], Dict[str, Any]]:
+    head = f"Content-Type: {content_type}\r\nMIME-Version: 1.0\r\n\r\n".encode("latin-1")
+    message = BytesParser(policy=HTTP).parsebytes(head + body)
+    upload = None
+    fields: Dict[str, Any] = {}
+    for part in message.iter_parts() if message.is_multipart() else []:
+        payload = part.get_payload(decode=True) or b""
+        if part.get_filename() is not None:
+            upload = (part.get_filename(), len(payload))
+        else:
+            fields[part.get_param("name", header="content-disposition")] = payload.decode("utf-8", "replace")
+    if upload is not None:
+        return (upload[0], upload[1], fields.get("purpose") or "assistants"), fields
+    return None, fields
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    mock: MockOpenAI
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str) -> None:
+        mock = self.mock
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if parts[:1] == ["v1"]:
+            parts = parts[1:]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        if parts[:1] == ["__mock"]:
+            if parts == ["__mock", "stats"]:
+                return self._send(200, mock.stats())
+            if parts == ["__mock", "reset"] and method == "POST":
+                mock.reset()
+                return self._send(200, {"reset": True})
+            return self._send(404, {"error": {"message": "unknown mock endpoint"}})
+
+        op = mock.operation_of(method, parts)
+        with mock._lock:
+            mock.requests[op] = mock.requests.get(op, 0) + 1
+            mock.in_flight += 1
+            mock.max_in_flight = max(mock.max_in_flight, mock.in_flight)
+        try:
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                raise _MockError(401, "You didn't provide an API key.", "invalid_api_key")
+            cfg = mock.config
+            delay = mock._sample(cfg.latency_for(op))
+            if op == "upload_file" and cfg.upload_mb_s > 0:
+                delay += len(raw) / (cfg.upload_mb_s * 1024 * 1024)
+            if delay:
+                time.sleep(delay)
+            roll = mock._random()
+            if roll < cfg.rate_limit_rate:
+                with mock._lock:
+                    mock.injected["429"] += 1
+                raise _MockError(429, "Rate limit reached (mock).", "rate_limit_exceeded",
+                                 {"Retry-After": f"{cfg.retry_after:g}"})
+            if roll < cfg.rate_limit_rate + cfg.error_rate:
+                with mock._lock:
+                    mock.injected["5xx"] += 1
+                raise _MockError(500, "The server had an error while processing your request (mock).", "server_error")
+
+            upload = None
+            body: Dict[str, Any] = {}
+            ctype = self.headers.get("Content-Type", "")
+            if ctype.startswith("multipart/form-data"):
+                upload, body = _parse_upload(ctype, raw)
+            elif raw:
+                try:
+                    body = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    raise _MockError(400, "We could not parse the JSON body of your request.")
+            _op, payload = mock.route(method, parts, query, body, upload)
+            self._send(200, payload)
+        except _MockError as exc:
+            self._send(exc.status, {"error": {"message": str(exc), "type": exc.kind, "code": None}}, exc.headers)
+        finally:
+            with mock._lock:
+                mock.in_flight -= 1
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._handle("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self._handle("DELETE")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    latency = {"default": Latency.parse(args.default_latency)}
+    for item in args.latency or []:
+        op, _, spec = item.partition("=")
+        latency[op.strip()] = Latency.parse(spec)
+    return MockConfig(
+        latency=latency,
+        upload_mb_s=args.upload_mb_s,
+        index_delay=Latency.parse(args.index_delay),
+        index_failure_rate=args.index_failure_rate,
+        rate_limit_rate=args.rate_limit,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        invalid_output_rate=args.invalid_output_rate,
+        seed=args.seed,
+    )
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    """Mock knobs, shared with benchmarks that start the mock in-process."""
+    parser.add_argument("--latency", action="append", metavar="OP=MEDIAN[:SIGMA]",
+                        help="per-operation latency, e.g. create_response=4:0.4 (repeatable)")
+    parser.add_argument("--default-latency", default="0.01", metavar="MEDIAN[:SIGMA]")
+    parser.add_argument("--upload-mb-s", type=float, default=0.0, help="upload bandwidth limit (0 = none)")
+    parser.add_argument("--index-delay", default="0.5:0.3", metavar="MEDIAN[:SIGMA]", help="per-file indexing time")
+    parser.add_argument("--index-failure-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--invalid-output-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock = MockOpenAI(config_from_args(args)).start(args.host, args.port)
+    print(f"mock OpenAI API at {mock.url}", flush=True)
+    print(f"  OPENAI_BASE_URL={mock.url} OPENAI_API_KEY=mock python cli.py <files>", flush=True)
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(mock.stats(), ensure_ascii=False, indent=2))
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
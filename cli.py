@@ -6,15 +6,30 @@ import argparse
 import json
 import os
 import sys
-from datetime import datetime
-from uuid import uuid4
 
 import tkinter as tk
 from tkinter import filedialog
 
 from core.uploader import upload_to_vector_store_ex
 from core.vector_store_query import run_extraction_with_vector_store
-from infra.config import DEFAULT_MODEL, SYSTEM_PROMPT_PATH
+from infra.config import (
+    AUTO_DELETE_DEFAULT_MIN,
+    BATCH_JOBS,
+    DEFAULT_MODEL,
+    DOCUMENT_PROMPTS,
+    HOTFOLDER_JOBS,
+    HOTFOLDER_MARKER,
+    HOTFOLDER_POLL_SEC,
+    HOTFOLDER_QUEUE_SIZE,
+    HOTFOLDER_SETTLE_SEC,
+    JOB_API_HOST,
+    JOB_API_JOBS,
+    JOB_API_PORT,
+    JOB_API_QUEUE_SIZE,
+)
+from infra.metrics import ensure_exporters
+from infra.result_sink import save_result
+from infra.tracing import get_trace, span
 from infra import localization as i18n
 from infra.localization import translate as T
 
@@ -37,71 +52,248 @@ def pick_files_via_dialog() -> list[str]:
         root.destroy()
 
 
-def _save_result_record(save_dir: str, store_id: str, clean_json: str) -> str:
-    """Persist a copy of the validated extraction result alongside CLI usage."""
-    os.makedirs(save_dir, exist_ok=True)
-    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    suffix = uuid4().hex[:6]
-    base = f"extract_{stamp}_{(store_id or 'noid').replace('/', '_')}_{suffix}.json"
-    out_path = os.path.join(save_dir, base)
+def journal_command(argv: list[str]) -> None:
+    """`cli.py journal ...` — filtered, paginated view of the journal."""
+    from infra.log_journal import import_jsonl_to_db, query_journal
 
-    try:
-        payload = json.loads(clean_json)
-    except Exception:
-        payload = {"raw_text": clean_json}
-
-    record = {
-        "ts": datetime.now().isoformat(timespec="seconds"),
-        "phase": "result",
-        "store_id": store_id,
-        "result": payload,
-        "note": "validated",
-    }
-    with open(out_path, "w", encoding="utf-8") as fp:
-        json.dump(record, fp, ensure_ascii=False, indent=2)
-    return out_path
-
-
-def main() -> None:
-    parser = argparse.ArgumentParser(description=T("cli.description"))
-    parser.add_argument("files", nargs="*", help=T("cli.arg.files"))
+    parser = argparse.ArgumentParser(prog="cli.py journal", description=T("cli.journal.description"))
+    parser.add_argument("--phase", help=T("cli.journal.arg.phase"))
+    parser.add_argument("--store-id", dest="store_id", help=T("cli.journal.arg.store_id"))
+    parser.add_argument("--model", help=T("cli.journal.arg.model"))
+    parser.add_argument("--since", help=T("cli.journal.arg.since"))
+    parser.add_argument("--until", help=T("cli.journal.arg.until"))
+    parser.add_argument("--min-elapsed", dest="min_elapsed", type=float, help=T("cli.journal.arg.min_elapsed"))
+    parser.add_argument("--limit", type=int, default=50, help=T("cli.journal.arg.limit"))
+    parser.add_argument("--offset", type=int, default=0, help=T("cli.journal.arg.offset"))
     parser.add_argument(
-        "--no-wait-index",
-        dest="no_wait_index",
+        "--import-jsonl",
+        dest="import_jsonl",
         action="store_true",
-        help=T("cli.arg.no_wait_index"),
+        help=T("cli.journal.arg.import_jsonl"),
     )
+    args = parser.parse_args(argv)
+
+    if args.import_jsonl:
+        stats = import_jsonl_to_db()
+        print(T("cli.journal.imported", **stats), flush=True)
+        return
+
+    rows = query_journal(
+        phase=args.phase,
+        store_id=args.store_id,
+        model=args.model,
+        since=args.since,
+        until=args.until,
+        min_elapsed=args.min_elapsed,
+        limit=args.limit,
+        offset=args.offset,
+    )
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False), flush=True)
+
+
+def _format_summary(summary) -> str:
+    if not summary:
+        return "-"
+    return T("cli.stats.summary", **summary)
+
+
+def stats_command(argv: list[str]) -> None:
+    """`cli.py stats ...` — latency percentiles, throughput and cost from the journal."""
+    from infra.journal_stats import GROUP_BY_CHOICES, compute_stats, parse_window
+
+    parser = argparse.ArgumentParser(prog="cli.py stats", description=T("cli.stats.description"))
+    parser.add_argument("--since", help=T("cli.journal.arg.since"))
+    parser.add_argument("--until", help=T("cli.journal.arg.until"))
+    parser.add_argument("--last", help=T("cli.stats.arg.last"))
+    parser.add_argument("--group-by", dest="group_by", choices=GROUP_BY_CHOICES, default="none",
+                        help=T("cli.stats.arg.group_by"))
+    parser.add_argument("--json", dest="as_json", action="store_true", help=T("cli.stats.arg.json"))
+    args = parser.parse_args(argv)
+
+    since = args.since
+    if args.last:
+        try:
+            since = parse_window(args.last)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    report = compute_stats(since=since, until=args.until, group_by=args.group_by)
+    if args.as_json:
+        print(json.dumps(report, ensure_ascii=False, indent=2), flush=True)
+        return
+
+    if not report["groups"]:
+        print(T("cli.stats.empty"), flush=True)
+        return
+    for key, group in report["groups"].items():
+        print(T("cli.stats.group", group=key, records=group["records"]), flush=True)
+        latency = group["latency_sec"]
+        print(T("cli.stats.upload_latency", value=_format_summary(latency["upload"])), flush=True)
+        if latency["file_upload"]:
+            print(T("cli.stats.file_upload_latency", value=_format_summary(latency["file_upload"])), flush=True)
+            print(T("cli.stats.file_attach_latency", value=_format_summary(latency["file_attach"])), flush=True)
+        print(T("cli.stats.index_latency", value=_format_summary(latency["index"])), flush=True)
+        print(T("cli.stats.response_latency", value=_format_summary(latency["response"])), flush=True)
+        upload = group["upload"]
+        print(T("cli.stats.upload_speed", total_mb=upload["total_mb"],
+                overall=upload["overall_mb_s"] if upload["overall_mb_s"] is not None else "-",
+                value=_format_summary(upload["mb_s"])), flush=True)
+        if upload["file_mb_s"]:
+            print(T("cli.stats.file_speed", value=_format_summary(upload["file_mb_s"]),
+                    retries=upload["file_retries"]), flush=True)
+        print(T("cli.stats.tokens", value=_format_summary(group["tokens_per_extraction"])), flush=True)
+        for model, m in group["models"].items():
+            print(T("cli.stats.model", model=model, **m), flush=True)
+        validation = group["validation"]
+        rate = validation["failure_rate"]
+        print(T("cli.stats.validation", results=validation["results"], errors=validation["errors"],
+                rate=f"{rate:.1%}" if rate is not None else "-"), flush=True)
+        print(flush=True)
+
+
+def batch_command(argv: list[str]) -> None:
+    """`cli.py batch MANIFEST --output OUT.jsonl` — run the pipeline for many tenders."""
+    from core.batch import default_state_path, iter_manifest, run_batch
+    from core.job_store import JobStore
+
+    parser = argparse.ArgumentParser(prog="cli.py batch", description=T("cli.batch.description"))
+    parser.add_argument("manifest", help=T("cli.batch.arg.manifest"))
+    parser.add_argument("--output", "-o", required=True, help=T("cli.batch.arg.output"))
+    parser.add_argument("--failures", help=T("cli.batch.arg.failures"))
+    parser.add_argument("--jobs", "-j", type=int, default=BATCH_JOBS, help=T("cli.batch.arg.jobs"))
     parser.add_argument(
-        "--save-dir",
-        dest="save_dir",
-        help=T("cli.arg.save_dir"),
+        "--document-type",
+        dest="document_type",
+        choices=sorted(DOCUMENT_PROMPTS),
+        default="tender",
+        help=T("cli.arg.document_type"),
     )
+    parser.add_argument("--no-wait-index", dest="no_wait_index", action="store_true",
+                        help=T("cli.arg.no_wait_index"))
+    parser.add_argument("--cleanup-min", dest="cleanup_min", type=int, default=AUTO_DELETE_DEFAULT_MIN,
+                        help=T("cli.batch.arg.cleanup_min"))
+    parser.add_argument("--summary", help=T("cli.batch.arg.summary"))
+    parser.add_argument("--state", help=T("cli.batch.arg.state"))
+    parser.add_argument("--no-state", dest="no_state", action="store_true", help=T("cli.batch.arg.no_state"))
+    parser.add_argument("--verbose", "-v", action="store_true", help=T("cli.batch.arg.verbose"))
+    args = parser.parse_args(argv)
+    ensure_exporters()
+    job_store = None if args.no_state else JobStore(args.state or default_state_path(args.output))
+
+    summary = run_batch(
+        iter_manifest(args.manifest),
+        args.output,
+        failures_path=args.failures,
+        jobs=args.jobs,
+        on_progress=lambda msg: print(msg, flush=True),
+        verbose=args.verbose,
+        wait_index=not args.no_wait_index,
+        system_prompt_path=DOCUMENT_PROMPTS[args.document_type],
+        auto_cleanup_min=args.cleanup_min,
+        job_store=job_store,
+    )
+    print(summary, flush=True)
+    report = summary.as_dict()
+    for stage, value in report["latency_sec"].items():
+        if value:
+            print(T("cli.batch.stage", stage=stage, value=_format_summary(value)), flush=True)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+    if summary.failed:
+        sys.exit(3)
+
+
+def watch_command(argv: list[str]) -> None:
+    """`cli.py watch INBOX --outbox OUTBOX` — long-running hot-folder daemon."""
+    from core.hotfolder import HotFolder
+
+    parser = argparse.ArgumentParser(prog="cli.py watch", description=T("cli.watch.description"))
+    parser.add_argument("inbox", help=T("cli.watch.arg.inbox"))
+    parser.add_argument("--outbox", required=True, help=T("cli.watch.arg.outbox"))
+    parser.add_argument("--jobs", "-j", type=int, default=HOTFOLDER_JOBS, help=T("cli.watch.arg.jobs"))
+    parser.add_argument("--queue-size", dest="queue_size", type=int, default=HOTFOLDER_QUEUE_SIZE,
+                        help=T("cli.watch.arg.queue_size"))
+    parser.add_argument("--settle-sec", dest="settle_sec", type=float, default=HOTFOLDER_SETTLE_SEC,
+                        help=T("cli.watch.arg.settle_sec"))
+    parser.add_argument("--marker", default=HOTFOLDER_MARKER, help=T("cli.watch.arg.marker"))
+    parser.add_argument("--poll-sec", dest="poll_sec", type=float, default=HOTFOLDER_POLL_SEC,
+                        help=T("cli.watch.arg.poll_sec"))
     parser.add_argument(
-        "--language",
-        dest="language",
-        choices=i18n.available_languages(),
-        help=T("cli.arg.language"),
+        "--document-type",
+        dest="document_type",
+        choices=sorted(DOCUMENT_PROMPTS),
+        default="tender",
+        help=T("cli.arg.document_type"),
     )
+    parser.add_argument("--cleanup-min", dest="cleanup_min", type=int, default=AUTO_DELETE_DEFAULT_MIN,
+                        help=T("cli.batch.arg.cleanup_min"))
+    parser.add_argument("--verbose", "-v", action="store_true", help=T("cli.batch.arg.verbose"))
+    args = parser.parse_args(argv)
+    ensure_exporters()
 
-    args = parser.parse_args()
+    HotFolder(
+        args.inbox,
+        args.outbox,
+        jobs=args.jobs,
+        queue_size=args.queue_size,
+        settle_sec=args.settle_sec,
+        marker=args.marker,
+        poll_sec=args.poll_sec,
+        on_progress=lambda msg: print(msg, flush=True),
+        verbose=args.verbose,
+        system_prompt_path=DOCUMENT_PROMPTS[args.document_type],
+        auto_cleanup_min=args.cleanup_min,
+    ).run_forever()
 
-    if args.language:
-        code = i18n.set_language(args.language)
-        print(
-            T(
-                "cli.language_set",
-                language_name=i18n.language_name(code),
-                language_code=code,
-            ),
-            flush=True,
-        )
-    else:
-        i18n.reload_language_from_settings()
 
-    files = args.files or pick_files_via_dialog()
-    if not files:
-        print(T("cli.no_files"), flush=True)
-        sys.exit(0)
+def serve_command(argv: list[str]) -> None:
+    """`cli.py serve` — local HTTP job API (see core/job_api.py for the endpoints)."""
+    import time
+
+    from core.job_api import JobService, start_api_server
+
+    parser = argparse.ArgumentParser(prog="cli.py serve", description=T("cli.serve.description"))
+    parser.add_argument("--host", default=JOB_API_HOST, help=T("cli.serve.arg.host"))
+    parser.add_argument("--port", type=int, default=JOB_API_PORT, help=T("cli.serve.arg.port"))
+    parser.add_argument("--jobs", "-j", type=int, default=JOB_API_JOBS, help=T("cli.serve.arg.jobs"))
+    parser.add_argument("--queue-size", dest="queue_size", type=int, default=JOB_API_QUEUE_SIZE,
+                        help=T("cli.serve.arg.queue_size"))
+    parser.add_argument("--cleanup-min", dest="cleanup_min", type=int, default=AUTO_DELETE_DEFAULT_MIN,
+                        help=T("cli.batch.arg.cleanup_min"))
+    args = parser.parse_args(argv)
+    ensure_exporters()
+
+    service = JobService(
+        jobs=args.jobs,
+        queue_size=args.queue_size,
+        auto_cleanup_min=args.cleanup_min,
+        on_progress=lambda msg: print(msg, flush=True),
+    ).start()
+    server = start_api_server(service, args.host, args.port)
+    print(T("api.started", url=f"http://{args.host}:{server.server_port}", jobs=args.jobs), flush=True)
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        print(T("api.stopping"), flush=True)
+    finally:
+        server.shutdown()
+        service.stop()
+
+
+COMMANDS = {
+    "journal": journal_command,
+    "stats": stats_command,
+    "batch": batch_command,
+    "watch": watch_command,
+    "serve": serve_command,
+}
+
+
+def _run(args: argparse.Namespace, files: list[str]) -> None:
+    """Upload the files, run the extraction and print/save the result."""
 
     def on_progress(msg: str) -> None:
         print(msg, flush=True)
@@ -129,27 +321,95 @@ def main() -> None:
 
     print(T("cli.processing_start"), flush=True)
     try:
-        clean_json = run_extraction_with_vector_store(
+        result = run_extraction_with_vector_store(
             store_id=store_id,
             user_instruction=T("prompt.extract_instruction"),
             model=DEFAULT_MODEL,
-            system_prompt_path=SYSTEM_PROMPT_PATH,
+            system_prompt_path=DOCUMENT_PROMPTS[args.document_type],
         )
-        try:
-            pretty = json.dumps(json.loads(clean_json), ensure_ascii=False, indent=2)
-        except Exception:
-            pretty = clean_json
         print(T("log.extraction_header"), flush=True)
-        print(pretty, flush=True)
+        print(result.pretty(), flush=True)
         print(T("log.extraction_footer"), flush=True)
 
         if args.save_dir:
-            out_path = _save_result_record(args.save_dir, store_id, clean_json)
+            with span("save", path=args.save_dir):
+                out_path = save_result(args.save_dir, store_id, result)
             print(T("cli.saved_result", path=out_path), flush=True)
 
     except Exception as exc:
         print(T("cli.processing_error", error=exc), flush=True)
 
 
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description=T("cli.description"))
+    parser.add_argument("files", nargs="*", help=T("cli.arg.files"))
+    parser.add_argument(
+        "--no-wait-index",
+        dest="no_wait_index",
+        action="store_true",
+        help=T("cli.arg.no_wait_index"),
+    )
+    parser.add_argument(
+        "--save-dir",
+        dest="save_dir",
+        help=T("cli.arg.save_dir"),
+    )
+    parser.add_argument(
+        "--document-type",
+        dest="document_type",
+        choices=sorted(DOCUMENT_PROMPTS),
+        default="tender",
+        help=T("cli.arg.document_type"),
+    )
+    parser.add_argument(
+        "--language",
+        dest="language",
+        choices=i18n.available_languages(),
+        help=T("cli.arg.language"),
+    )
+    parser.add_argument(
+        "--trace",
+        dest="trace",
+        metavar="PATH",
+        help=T("cli.arg.trace"),
+    )
+
+    args = parser.parse_args()
+    ensure_exporters()
+
+    if args.language:
+        code = i18n.set_language(args.language)
+        print(
+            T(
+                "cli.language_set",
+                language_name=i18n.language_name(code),
+                language_code=code,
+            ),
+            flush=True,
+        )
+    else:
+        i18n.reload_language_from_settings()
+
+    files = args.files or pick_files_via_dialog()
+    if not files:
+        print(T("cli.no_files"), flush=True)
+        sys.exit(0)
+
+    trace_id = None
+    try:
+        with span("cli", files=len(files), document_type=args.document_type) as root:
+            trace_id = root.trace_id
+            _run(args, files)
+    finally:
+        trace = get_trace(trace_id) if (args.trace and trace_id) else None
+        if trace is not None:
+            trace.export_chrome(args.trace)
+            print(T("cli.trace_saved", path=args.trace), flush=True)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""Batch mode: run the pipeline for many tenders listed in a manifest.
+
+Manifest formats (paths are resolved relative to the manifest file):
+
+* JSONL — one object per line: ``{"tender_id": "T-1", "files": ["a.pdf", "b.docx"]}``;
+  ``"path"`` may be given instead of ``"files"`` and may point to a folder.
+* CSV — header with ``tender_id`` and ``path`` columns; ``path`` may be a file,
+  a folder or several paths separated by ``;``. Consecutive rows with the same
+  ``tender_id`` are merged into one tender.
+
+Tenders run concurrently (``jobs`` at a time, the manifest is read lazily).
+Every finished tender is appended to the output JSONL in the same record
+format as saved result copies, failures go to a separate JSONL, and the
+returned :class:`BatchSummary` reports throughput and per-stage latency taken
+from each tender's trace.
+
+With a :class:`~core.job_store.JobStore` each tender's stages are checkpointed:
+a rerun of the same manifest skips finished tenders and resumes the others
+from their last completed stage. A tender whose result line was written just
+before a crash may appear twice in the output (the line is written before the
+``saved`` checkpoint).
+"""
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from core.job_store import JobStore
+from core.pipeline import run_pipeline
+from infra.config import AUTO_DELETE_DEFAULT_MIN, BATCH_JOBS, DEFAULT_MODEL, SYSTEM_PROMPT_PATH
+from infra.journal_stats import LogHistogram
+from infra.tracing import span
+from infra.localization import translate as T
+
+# Spans of a pipeline run reported per tender (see infra.tracing call sites).
+BATCH_STAGES = ("hash", "create_store", "upload", "attach", "index_wait", "responses_call", "validation", "save")
+
+
+class BatchItem:
+    """One tender of the manifest: its id and the files to upload."""
+
+    __slots__ = ("tender_id", "files")
+
+    def __init__(self, tender_id: str, files: List[str]):
+        self.tender_id = tender_id
+        self.files = files
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"BatchItem({self.tender_id!r}, files={len(self.files)})"
+
+
+def _expand_paths(raw: Iterable[str], base_dir: str) -> List[str]:
+    out: List[str] = []
+    for value in raw:
+        value = (value or "").strip()
+        if not value:
+            continue
+        path = value if os.path.isabs(value) else os.path.join(base_dir, value)
+        if os.path.isdir(path):
+            out.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if not name.startswith(".") and os.path.isfile(os.path.join(path, name))
+            )
+        else:
+            out.append(path)
+    return out
+
+
+def _iter_jsonl_manifest(path: str, base_dir: str) -> Iterator[BatchItem]:
+    seen: set[str] = set()
+    with open(path, "r", encoding="utf-8-sig") as fp:
+        for lineno, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{lineno}: invalid JSON: {exc}") from exc
+            tender_id = str(obj.get("tender_id") or obj.get("id") or "").strip()
+            if not tender_id:
+                raise ValueError(f"{path}:{lineno}: missing tender_id")
+            if tender_id in seen:
+                raise ValueError(f"{path}:{lineno}: duplicate tender_id {tender_id!r}")
+            seen.add(tender_id)
+            raw = obj.get("files") or obj.get("path") or []
+            if isinstance(raw, str):
+                raw = [raw]
+            yield BatchItem(tender_id, _expand_paths(raw, base_dir))
+
+
+def _iter_csv_manifest(path: str, base_dir: str) -> Iterator[BatchItem]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as fp:
+        reader = csv.DictReader(fp)
+        if not reader.fieldnames or "tender_id" not in reader.fieldnames or "path" not in reader.fieldnames:
+            raise ValueError(f"{path}: CSV manifest needs 'tender_id' and 'path' columns")
+        rows = ((str(row.get("tender_id") or "").strip(), row.get("path") or "") for row in reader)
+        seen: set[str] = set()
+        for tender_id, group in itertools.groupby(rows, key=lambda r: r[0]):
+            if not tender_id:
+                continue
+            if tender_id in seen:
+                raise ValueError(f"{path}:{reader.line_num}: rows of tender_id {tender_id!r} are not contiguous")
+            seen.add(tender_id)
+            raw = [part for _, value in group for part in value.split(";")]
+            yield BatchItem(tender_id, _expand_paths(raw, base_dir))
+
+
+def iter_manifest(path: str) -> Iterator[BatchItem]:
+    """Lazily read a JSONL or CSV manifest (format chosen by extension).
+
+    A tender id may appear only once (CSV: in one contiguous run of rows):
+    every item becomes its own job, and two workers must not share one.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    if path.lower().endswith(".csv"):
+        return _iter_csv_manifest(path, base_dir)
+    return _iter_jsonl_manifest(path, base_dir)
+
+
+class BatchSummary:
+    """Counters, throughput and per-stage latency of a batch run."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.ok = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self.elapsed_sec = 0.0
+        self.tender_latency = LogHistogram()
+        self.stages: Dict[str, LogHistogram] = {name: LogHistogram() for name in BATCH_STAGES}
+        self._lock = threading.Lock()
+
+    def add(self, ok: bool, elapsed: float, stages: Dict[str, float]) -> None:
+        with self._lock:
+            self.total += 1
+            if ok:
+                self.ok += 1
+            else:
+                self.failed += 1
+            self.tender_latency.add(elapsed)
+            for name, value in stages.items():
+                if name in self.stages:
+                    self.stages[name].add(value)
+
+    def add_skipped(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def finish(self) -> "BatchSummary":
+        self.elapsed_sec = time.perf_counter() - self.started
+        return self
+
+    @property
+    def tenders_per_hour(self) -> Optional[float]:
+        return self.total * 3600.0 / self.elapsed_sec if self.elapsed_sec > 0 else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        rate = self.tenders_per_hour
+        return {
+            "total": self.total,
+            "ok": self.ok,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "tenders_per_hour": round(rate, 1) if rate is not None else None,
+            "latency_sec": {
+                "tender": self.tender_latency.summary(),
+                **{name: hist.summary() for name, hist in self.stages.items()},
+            },
+        }
+
+    def __str__(self) -> str:
+        rate = self.tenders_per_hour
+        text = T(
+            "batch.summary",
+            total=self.total,
+            ok=self.ok,
+            failed=self.failed,
+            elapsed=f"{self.elapsed_sec:.1f}",
+            rate=f"{rate:.1f}" if rate is not None else "-",
+        )
+        if self.skipped:
+            text += "; " + T("batch.skipped", skipped=self.skipped)
+        return text
+
+
+class _JsonlWriter:
+    """Thread-safe line-per-record appender, flushed after every record."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
+        self.path = path
+        self._fp = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._fp.write(line)
+            self._fp.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fp.close()
+
+
+def default_failures_path(output_path: str) -> str:
+    stem, _ext = os.path.splitext(output_path)
+    return f"{stem}.failures.jsonl"
+
+
+def default_state_path(output_path: str) -> str:
+    stem, _ext = os.path.splitext(output_path)
+    return f"{stem}.jobs.sqlite3"
+
+
+def stage_durations(trace) -> Dict[str, float]:
+    """Sum of span durations per reported stage (a tender uploads several files)."""
+    totals: Dict[str, float] = {}
+    for sp in trace.spans:
+        if sp.name in BATCH_STAGES and sp.duration_us is not None:
+            totals[sp.name] = totals.get(sp.name, 0.0) + sp.duration_us / 1_000_000
+    return totals
+
+
+def _run_item(
+    item: BatchItem,
+    results: _JsonlWriter,
+    failures: _JsonlWriter,
+    summary: BatchSummary,
+    emit: Callable[[str], None],
+    verbose: bool,
+    job_store: Optional[JobStore],
+    pipeline_kwargs: Dict[str, Any],
+) -> bool:
+    started = time.perf_counter()
+    ok = False
+    stages: Dict[str, float] = {}
+    job = None
+    with span("tender", tender_id=item.tender_id, files=len(item.files)) as root:
+        try:
+            if not item.files:
+                raise ValueError(T("batch.no_files"))
+            missing = [p for p in item.files if not os.path.isfile(p)]
+            if missing:
+                raise FileNotFoundError(T("batch.missing_files", files=", ".join(missing)))
+            if job_store is not None:
+                job = job_store.open_job(item.tender_id, item.files)
+                if job.done:
+                    summary.add_skipped()
+                    emit(T("batch.item_skipped", tender_id=item.tender_id))
+                    return True
+                job.start()
+            emit(T("batch.item_start", tender_id=item.tender_id, files=len(item.files)))
+            outcome = run_pipeline(
+                item.files,
+                on_progress=(lambda msg: emit(f"[{item.tender_id}] {msg}")) if verbose else None,
+                job=job,
+                **pipeline_kwargs,
+            )
+            elapsed = time.perf_counter() - started
+            stages = stage_durations(root.trace)
+            result = outcome.result
+            results.write({
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "phase": "result" if result is not None else "upload",
+                "tender_id": item.tender_id,
+                "store_id": outcome.store_id,
+                "trace_id": root.trace_id,
+                "files": [os.path.basename(p) for p in item.files],
+                "schema": result.schema if result is not None else None,
+                "result": result.data if result is not None else None,
+                "normalized": result.normalized if result is not None else None,
+                "elapsed_sec": round(elapsed, 3),
+                "stages_sec": {k: round(v, 3) for k, v in stages.items()},
+                "note": "validated" if result is not None else "not_extracted",
+            })
+            if job is not None and result is not None:
+                job.mark_saved()
+            ok = True
+            emit(T("batch.item_done", tender_id=item.tender_id, elapsed=f"{elapsed:.1f}"))
+        except Exception as exc:
+            elapsed = time.perf_counter() - started
+            stages = stage_durations(root.trace)
+            failures.write({
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "tender_id": item.tender_id,
+                "trace_id": root.trace_id,
+                "files": item.files,
+                "error_type": type(exc).__name__,
+                "error": str(exc),
+                "elapsed_sec": round(elapsed, 3),
+                "stage": job.stage if job is not None else None,
+            })
+            if job is not None:
+                job.mark_failed(f"{type(exc).__name__}: {exc}")
+            emit(T("batch.item_failed", tender_id=item.tender_id, error=exc))
+    summary.add(ok, elapsed, stages)
+    return ok
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    output_path: str,
+    *,
+    failures_path: Optional[str] = None,
+    jobs: int = BATCH_JOBS,
+    on_progress: Optional[Callable[[str], None]] = None,
+    verbose: bool = False,
+    wait_index: bool = True,
+    model: str = DEFAULT_MODEL,
+    system_prompt_path: str = SYSTEM_PROMPT_PATH,
+    auto_cleanup_min: Optional[int] = AUTO_DELETE_DEFAULT_MIN,
+    job_store: Optional[JobStore] = None,
+) -> BatchSummary:
+    """Run :func:`run_pipeline` for every manifest item, ``jobs`` tenders at a time.
+
+    Results and failures are appended (one JSON object per line) as tenders
+    finish; at most ``2 * jobs`` items are read ahead from ``items``.
+    ``on_progress`` gets one line per tender start/finish, plus every pipeline
+    message (prefixed with the tender id) when ``verbose`` is set.
+    ``job_store`` enables checkpointing and resume (tender id = job id).
+    """
+    emit = on_progress or (lambda _msg: None)
+    jobs = max(1, int(jobs))
+    summary = BatchSummary()
+    results = _JsonlWriter(output_path)
+    failures = _JsonlWriter(failures_path or default_failures_path(output_path))
+    pipeline_kwargs = dict(
+        wait_index=wait_index,
+        model=model,
+        system_prompt_path=system_prompt_path,
+        auto_cleanup_min=auto_cleanup_min,
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="batch") as pool:
+            in_flight: set[Future] = set()
+            for item in items:
+                if len(in_flight) >= 2 * jobs:
+                    _done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                in_flight.add(pool.submit(
+                    _run_item, item, results, failures, summary, emit, verbose, job_store, pipeline_kwargs
+                ))
+            wait(in_flight)
+    finally:
+        results.close()
+        failures.close()
+    return summary.finish()
+
+
+__all__ = [
+    "BATCH_STAGES",
+    "BatchItem",
+    "BatchSummary",
+    "default_failures_path",
+    "default_state_path",
+    "iter_manifest",
+    "stage_durations",
+    "run_batch",
+]
@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""
+core/cleanup_scheduler.py — отложенная очистка Vector Stores одним потоком.
+
+Вместо потока со sleep на каждое хранилище — один планировщик:
+  * задания лежат в min-heap по времени срабатывания; поток-таймер спит
+    до ближайшего срока (или до появления более раннего задания);
+  * сработавшие задания выполняются пулом ограниченного размера;
+  * очередь хранится на диске (CLEANUP_QUEUE_PATH, атомарная запись через
+    временный файл) — задание удаляется из файла только после успешной
+    очистки, поэтому выход GUI/CLI не приводит к утечке хранилищ;
+  * при старте просроченные задания из файла запускаются сразу.
+
+Файл очереди общий для процессов (GUI, batch, serve, CLI). У каждого
+задания есть владелец — процесс (pid и время его старта): процесс
+выполняет только свои задания и подхватывает задания умерших владельцев
+(при старте и затем раз в CLEANUP_SYNC_SEC). Чтение-изменение-запись
+файла идут под файловой блокировкой; задание, исчезнувшее из файла
+(выполнено или отменено через --cancel), владелец не возвращает, а перед
+запуском проверяет, что оно всё ещё в файле и принадлежит ему.
+
+    python -m core.cleanup_scheduler --list
+    python -m core.cleanup_scheduler --cancel vs_abc123
+    python -m core.cleanup_scheduler --run      # выполнить очередь и выйти
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl  # POSIX: блокировка файла очереди между процессами
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+from infra.config import (
+    CLEANUP_MAX_ATTEMPTS,
+    CLEANUP_QUEUE_PATH,
+    CLEANUP_RETRY_DELAY_MIN,
+    CLEANUP_SCHEDULER_WORKERS,
+)
+from infra.metrics import CLEANUPS
+
+DoneCallback = Callable[[str], None]
+ErrorCallback = Callable[[str, BaseException], None]
+
+CLEANUP_SYNC_SEC = 30   # как часто сверяться с файлом: отмены извне, задания умерших процессов
+
+
+# -------- владелец заданий --------
+
+def _proc_start(pid: int) -> Optional[str]:
+    """Время старта процесса (Linux, в тиках с загрузки) — отличает процесс от повторно выданного pid."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+        return data[data.rindex(b")") + 2:].split()[19].decode()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if sys.platform == "win32":  # pragma: no cover - Windows
+        import ctypes
+
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_token() -> str:
+    pid = os.getpid()
+    return f"{pid}:{_proc_start(pid) or int(time.time())}"
+
+
+def owner_alive(owner: Optional[str]) -> bool:
+    """Жив ли процесс-владелец задания (задания без владельца — из старых версий — ничьи)."""
+    if not owner:
+        return False
+    pid_text, _, start = str(owner).partition(":")
+    try:
+        pid = int(pid_text)
+    except ValueError:
+        return False
+    if not _pid_alive(pid):
+        return False
+    actual = _proc_start(pid)
+    return actual is None or not start or actual == start
+
+
+@contextmanager
+def _locked(path: str) -> Iterator[None]:
+    """Исключительная блокировка файла очереди (рядом лежит path.lock)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a+b") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:  # pragma: no cover - Windows
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:  # pragma: no cover - Windows
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_queue(path: str) -> List[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError):
+        return []
+    return [j for j in data if isinstance(j, dict) and j.get("id") and j.get("store_id")] if isinstance(data, list) else []
+
+
+def _write_queue(path: str, jobs: List[Dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(jobs, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def read_pending(path: str = CLEANUP_QUEUE_PATH) -> List[Dict[str, Any]]:
+    """Задания из файла очереди (без запуска планировщика) — для просмотра и сверки."""
+    return _read_queue(path)
+
+
+def cancel_pending(key: str, path: str = CLEANUP_QUEUE_PATH) -> List[str]:
+    """
+    Убирает из файла очереди задания с id или store_id = key (любого владельца);
+    владелец увидит это перед запуском и не выполнит их. Возвращает id заданий.
+    """
+    with _locked(path):
+        jobs = _read_queue(path)
+        removed = [j["id"] for j in jobs if key in (j["id"], j["store_id"])]
+        if removed:
+            _write_queue(path, [j for j in jobs if j["id"] not in removed])
+    return removed
+
+
+class CleanupScheduler:
+    """Один поток-таймер + пул исполнителей + очередь на диске."""
+
+    def __init__(
+        self,
+        queue_path: str = CLEANUP_QUEUE_PATH,
+        workers: int = CLEANUP_SCHEDULER_WORKERS,
+        cleanup_fn: Optional[Callable[[str], Any]] = None,
+    ):
+        self.queue_path = queue_path
+        self._cleanup_fn = cleanup_fn
+        self._cond = threading.Condition()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._callbacks: Dict[str, Tuple[Optional[DoneCallback], Optional[ErrorCallback]]] = {}
+        self._running: Set[str] = set()     # сняты с heap (ждут пула или выполняются)
+        self._executing: Set[str] = set()   # подтверждены по файлу и выполняются
+        self._removed: Set[str] = set()     # свои завершённые/отменённые — убрать из файла
+        self._known: Set[str] = set()       # свои задания, уже записанные в файл
+        self._dirty = False
+        self._persisting = False
+        self._io_lock = threading.Lock()
+        self.owner = _owner_token()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cleanup-job")
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # задания умерших процессов (и прошлых запусков) подхватываются; просроченные срабатывают сразу
+        self._sync()
+
+    # -------- служебное --------
+
+    def _push(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["id"]] = job
+        heapq.heappush(self._heap, (float(job["due_at"]), next(self._seq), job["id"]))
+
+    def _sync(self) -> None:
+        """
+        Сверка с файлом под блокировкой: свои задания, исчезнувшие из файла,
+        снимаются; задания без живого владельца подхватываются; свои
+        изменения записываются, чужие задания остаются как есть.
+        """
+        with self._io_lock, _locked(self.queue_path):
+            on_disk = {j["id"]: j for j in _read_queue(self.queue_path)}
+            with self._cond:
+                for jid in list(self._jobs):
+                    if jid in self._known and jid not in on_disk and jid not in self._executing:
+                        self._jobs.pop(jid, None)   # выполнено или отменено другим процессом
+                        self._callbacks.pop(jid, None)
+                        self._known.discard(jid)
+                for jid, job in on_disk.items():
+                    if jid in self._jobs or jid in self._removed:
+                        continue
+                    owner = job.get("owner")
+                    if owner != self.owner and not owner_alive(owner):
+                        self._push(dict(job, owner=self.owner))
+                for jid in self._removed:
+                    on_disk.pop(jid, None)
+                on_disk.update({jid: dict(job) for jid, job in self._jobs.items()})
+                written = set(self._jobs)
+                removed = set(self._removed)
+                self._cond.notify_all()
+            try:
+                _write_queue(self.queue_path, sorted(on_disk.values(), key=lambda j: j["due_at"]))
+            except OSError:
+                return
+            with self._cond:
+                self._known |= written
+                self._known -= removed
+                self._removed -= removed
+
+    def _persist(self) -> None:
+        """
+        Записывает изменения (см. _sync). Пока один поток пишет, остальные только
+        помечают очередь «грязной» — пачка изменений ложится на диск одной записью.
+        """
+        with self._cond:
+            self._dirty = True
+            if self._persisting:
+                return
+            self._persisting = True
+        try:
+            while True:
+                with self._cond:
+                    if not self._dirty:
+                        return
+                    self._dirty = False
+                self._sync()
+        finally:
+            with self._cond:
+                self._persisting = False
+
+    def _cleanup(self, store_id: str) -> None:
+        if self._cleanup_fn is not None:
+            self._cleanup_fn(store_id)
+            return
+        from core.vector_store_cleanup import cleanup_store
+
+        summary = cleanup_store(store_id)
+        if summary.failed:
+            raise RuntimeError("; ".join(summary.errors) or f"Очистка {store_id} завершилась с ошибками")
+
+    # -------- API --------
+
+    def start(self) -> "CleanupScheduler":
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cleanup-scheduler", daemon=True)
+                self._thread.start()
+        return self
+
+    def schedule(
+        self,
+        store_id: str,
+        delay_min: float,
+        on_done: Optional[DoneCallback] = None,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> str:
+        """Ставит (или переносит) очистку хранилища через delay_min минут; возвращает id задания."""
+        with self._cond:
+            for jid, job in list(self._jobs.items()):
+                if job["store_id"] == store_id and jid not in self._running:
+                    self._drop(jid)
+            job = {
+                "id": uuid.uuid4().hex[:12],
+                "store_id": store_id,
+                "due_at": time.time() + max(0.0, float(delay_min)) * 60,
+                "created_at": time.time(),
+                "attempts": 0,
+                "owner": self.owner,
+            }
+            self._push(job)
+            self._callbacks[job["id"]] = (on_done, on_error)
+            self._cond.notify_all()
+        self._persist()
+        self.start()
+        return job["id"]
+
+    def _drop(self, job_id: str) -> None:
+        self._jobs.pop(job_id, None)
+        self._callbacks.pop(job_id, None)
+        self._removed.add(job_id)
+        # запись в heap остаётся и пропускается при извлечении
+
+    def cancel(self, key: str) -> bool:
+        """
+        Отменяет задание по его id или по store_id — своё и чужое (в файле).
+        Уже начатую очистку не прерывает. True, если что-то отменено.
+        """
+        with self._cond:
+            ids = [jid for jid, job in self._jobs.items()
+                   if (jid == key or job["store_id"] == key) and jid not in self._executing]
+            for jid in ids:
+                self._drop(jid)
+            self._cond.notify_all()
+        if ids:
+            self._persist()
+        return bool(cancel_pending(key, self.queue_path)) or bool(ids)
+
+    def hold(self, store_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        Снимает отложенную очистку хранилища и дожидается уже начатой — после
+        этого проверка «хранилище существует» не устареет посреди работы.
+        False — если начатая очистка не закончилась за timeout.
+        """
+        self.cancel(store_id)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while any(self._jobs.get(jid, {}).get("store_id") == store_id for jid in self._running):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Ожидающие и выполняющиеся задания, по времени срабатывания."""
+        with self._cond:
+            out = [dict(job, running=jid in self._running) for jid, job in self._jobs.items()]
+        return sorted(out, key=lambda j: j["due_at"])
+
+    def stop(self, wait: bool = True) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._pool.shutdown(wait=wait)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Ждёт, пока очередь опустеет (для `--run`). False — если вышел timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._jobs:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # -------- поток-таймер --------
+
+    def _run(self) -> None:
+        next_sync = time.monotonic() + CLEANUP_SYNC_SEC
+        while True:
+            if time.monotonic() >= next_sync:
+                self._persist()  # отмены извне и задания умерших процессов
+                next_sync = time.monotonic() + CLEANUP_SYNC_SEC
+            with self._cond:
+                while not self._stopped:
+                    # снимаем с вершины отменённые/устаревшие записи
+                    while self._heap and (
+                        self._heap[0][2] not in self._jobs
+                        or self._jobs[self._heap[0][2]]["due_at"] != self._heap[0][0]
+                    ):
+                        heapq.heappop(self._heap)
+                    if self._heap and self._heap[0][0] <= time.time():
+                        break
+                    until_sync = next_sync - time.monotonic()
+                    if until_sync <= 0:
+                        break
+                    timeout = min(self._heap[0][0] - time.time(), until_sync) if self._heap else until_sync
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                if not (self._heap and self._heap[0][0] <= time.time()):
+                    continue  # пора сверяться с файлом
+                _, _, job_id = heapq.heappop(self._heap)
+                self._running.add(job_id)
+                job = self._jobs[job_id]
+                job["attempts"] = int(job.get("attempts", 0)) + 1
+            try:
+                self._pool.submit(self._execute, job_id, job["store_id"])
+            except RuntimeError:
+                return  # пул остановлен (stop); задание останется в файле до следующего запуска
+
+    def _execute(self, job_id: str, store_id: str) -> None:
+        # подтверждение по файлу: задание могли отменить или выполнить в другом процессе
+        self._sync()
+        with self._cond:
+            if job_id not in self._jobs:
+                self._running.discard(job_id)
+                self._cond.notify_all()
+                return
+            self._executing.add(job_id)
+        on_done, on_error = self._callbacks.get(job_id, (None, None))
+        try:
+            self._cleanup(store_id)
+        except Exception as e:
+            with self._cond:
+                self._running.discard(job_id)
+                self._executing.discard(job_id)
+                job = self._jobs.get(job_id)
+                retry = job is not None and job["attempts"] < CLEANUP_MAX_ATTEMPTS
+                if retry:
+                    job["due_at"] = time.time() + CLEANUP_RETRY_DELAY_MIN * 60
+                    heapq.heappush(self._heap, (job["due_at"], next(self._seq), job_id))
+                elif job is not None:
+                    self._drop(job_id)
+                self._cond.notify_all()
+            self._persist()
+            CLEANUPS.inc(outcome="scheduled_retry" if retry else "scheduled_error")
+            if on_error and not retry:
+                on_error(store_id, e)
+            return
+
+        with self._cond:
+            self._running.discard(job_id)
+            self._executing.discard(job_id)
+            self._drop(job_id)
+            self._cond.notify_all()
+        self._persist()
+        CLEANUPS.inc(outcome="scheduled_done")
+        if on_done:
+            on_done(store_id)
+
+
+_scheduler: Optional[CleanupScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> CleanupScheduler:
+    """Общий планировщик процесса (создаётся и запускается при первом обращении)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = CleanupScheduler().start()
+        return _scheduler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m core.cleanup_scheduler",
+        description="Очередь отложенной очистки Vector Stores.",
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--list", action="store_true", help="Показать ожидающие задания (по умолчанию).")
+    group.add_argument("--cancel", metavar="ID", help="Отменить задание по id или store_id.")
+    group.add_argument("--run", action="store_true", help="Выполнить очередь (с учётом сроков) и выйти.")
+    args = parser.parse_args(argv)
+
+    if args.cancel:
+        ok = cancel_pending(args.cancel)
+        print("✅ Отменено." if ok else "Задание не найдено.")
+        return
+    if args.run:
+        scheduler = get_scheduler()
+        scheduler.drain()
+        scheduler.stop()
+        print("✨ Очередь очистки выполнена.")
+        return
+
+    jobs = read_pending()
+    if not jobs:
+        print("Очередь очистки пуста.")
+    for job in jobs:
+        due = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(job["due_at"]))
+        owner = job.get("owner") or "—"
+        state = "" if owner_alive(job.get("owner")) else "  (владелец не запущен)"
+        print(f"{job['id']}  {job['store_id']}  срок: {due}  попыток: {job.get('attempts', 0)}  "
+              f"владелец: {owner}{state}")
+
+
+__all__ = ["CleanupScheduler", "cancel_pending", "get_scheduler", "owner_alive", "read_pending"]
+
+
+if __name__ == "__main__":
+    main()
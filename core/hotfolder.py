@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+"""Hot-folder daemon: pick up tender packages dropped into an inbox and run the pipeline.
+
+Layout::
+
+    inbox/
+        <package>/...              folders dropped by users
+        .processing/<stamp>_<package>/   claimed packages (survive a restart)
+    outbox/
+        processed/<stamp>_<package>/     package files + result.json
+        failed/<stamp>_<package>/        package files + error.json
+        status.json                      queue depth, rate and latency (rewritten every poll)
+        hotfolder.jobs.sqlite3           stage checkpoints (see core.job_store)
+
+A package is *ready* when it contains the marker file (``HOTFOLDER_MARKER``)
+or when its file list, sizes and mtimes have not changed for
+``HOTFOLDER_SETTLE_SEC``; folders with partial-download files (``.part``,
+``.tmp``, ``.crdownload``) are never ready. Polling uses only ``os.scandir``,
+so no watcher service is needed.
+
+Ready packages are claimed by renaming them into ``.processing`` and put on
+a bounded queue served by ``jobs`` worker threads. When the queue is full
+the scanner stops claiming, so a burst of arrivals waits in the inbox instead
+of piling up in memory. On start, packages left in ``.processing`` by a
+previous run are queued first and resume from their last checkpoint.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from core.batch import stage_durations
+from core.job_store import JobStore
+from core.pipeline import run_pipeline
+from infra.config import (
+    AUTO_DELETE_DEFAULT_MIN,
+    DEFAULT_MODEL,
+    HOTFOLDER_JOBS,
+    HOTFOLDER_MARKER,
+    HOTFOLDER_POLL_SEC,
+    HOTFOLDER_QUEUE_SIZE,
+    HOTFOLDER_SETTLE_SEC,
+    SYSTEM_PROMPT_PATH,
+)
+from infra.journal_stats import LogHistogram
+from infra.metrics import HOTFOLDER_PACKAGES, HOTFOLDER_SECONDS, REGISTRY
+from infra.tracing import span
+from infra.localization import translate as T
+
+PROCESSING_DIR = ".processing"
+_PARTIAL_SUFFIXES = (".part", ".tmp", ".crdownload", ".partial")
+_RATE_WINDOW_SEC = 15 * 60
+
+Signature = Tuple[int, int, int]
+
+
+def _package_files(path: str, marker: Optional[str]) -> Tuple[List[str], bool, bool]:
+    """(files to upload, marker present, has partial files) — hidden files are ignored."""
+    files: List[str] = []
+    has_marker = partial = False
+    for root, dirs, names in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(names):
+            if marker and name == marker and root == path:
+                has_marker = True
+                continue
+            if name.startswith((".", "~$")):
+                continue
+            if name.lower().endswith(_PARTIAL_SUFFIXES):
+                partial = True
+                continue
+            files.append(os.path.join(root, name))
+    return files, has_marker, partial
+
+
+def _signature(files: List[str]) -> Signature:
+    size = mtime = 0
+    for p in files:
+        st = os.stat(p)
+        size += st.st_size
+        mtime = max(mtime, st.st_mtime_ns)
+    return len(files), size, mtime
+
+
+def _unique_dir(parent: str, name: str) -> str:
+    dest = os.path.join(parent, name)
+    n = 1
+    while os.path.exists(dest):
+        n += 1
+        dest = os.path.join(parent, f"{name}-{n}")
+    return dest
+
+
+def _write_json(path: str, payload: Any) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(payload, fp, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+class HotFolder:
+    """Inbox scanner + bounded queue + worker pool in front of :func:`run_pipeline`."""
+
+    def __init__(
+        self,
+        inbox: str,
+        outbox: str,
+        *,
+        jobs: int = HOTFOLDER_JOBS,
+        queue_size: int = HOTFOLDER_QUEUE_SIZE,
+        settle_sec: float = HOTFOLDER_SETTLE_SEC,
+        marker: Optional[str] = HOTFOLDER_MARKER,
+        poll_sec: float = HOTFOLDER_POLL_SEC,
+        on_progress: Optional[Callable[[str], None]] = None,
+        verbose: bool = False,
+        model: str = DEFAULT_MODEL,
+        system_prompt_path: str = SYSTEM_PROMPT_PATH,
+        auto_cleanup_min: Optional[int] = AUTO_DELETE_DEFAULT_MIN,
+    ):
+        self.inbox = os.path.abspath(inbox)
+        self.outbox = os.path.abspath(outbox)
+        self.processing = os.path.join(self.inbox, PROCESSING_DIR)
+        self.processed_dir = os.path.join(self.outbox, "processed")
+        self.failed_dir = os.path.join(self.outbox, "failed")
+        for d in (self.inbox, self.processing, self.processed_dir, self.failed_dir):
+            os.makedirs(d, exist_ok=True)
+
+        self.jobs = max(1, int(jobs))
+        self.settle_sec = float(settle_sec)
+        self.marker = marker or None
+        self.poll_sec = max(0.1, float(poll_sec))
+        self.verbose = verbose
+        self._emit = on_progress or (lambda _msg: None)
+        self._pipeline_kwargs = dict(
+            wait_index=True,
+            model=model,
+            system_prompt_path=system_prompt_path,
+            auto_cleanup_min=auto_cleanup_min,
+        )
+        self.job_store = JobStore(os.path.join(self.outbox, "hotfolder.jobs.sqlite3"))
+
+        self._queue: "queue.Queue[Tuple[str, float]]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._seen: Dict[str, Tuple[Signature, float, float]] = {}  # name -> (signature, changed_at, first_seen)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counts = {"processed": 0, "failed": 0}
+        self._finished: Deque[float] = deque()
+        self._latency = LogHistogram()
+        self._backlog: List[str] = []  # claimed on a previous run, queued before new arrivals
+
+        REGISTRY.add_collector(self._collect)
+
+    # -------- scanning --------
+
+    def _recover(self) -> None:
+        for name in sorted(os.listdir(self.processing)):
+            if os.path.isdir(os.path.join(self.processing, name)):
+                self._backlog.append(name)
+        if self._backlog:
+            self._emit(T("hotfolder.recovered", count=len(self._backlog)))
+
+    def _ready_packages(self) -> List[Tuple[str, float]]:
+        """Scan the inbox once; return (name, first_seen) of packages that are ready."""
+        now = time.time()
+        ready: List[Tuple[str, float]] = []
+        present = set()
+        with os.scandir(self.inbox) as it:
+            entries = sorted((e for e in it if e.is_dir() and not e.name.startswith(".")), key=lambda e: e.name)
+        for entry in entries:
+            present.add(entry.name)
+            try:
+                files, has_marker, partial = _package_files(entry.path, self.marker)
+                sig = _signature(files)
+            except OSError:
+                continue  # being written/moved right now — next poll
+            prev = self._seen.get(entry.name)
+            if prev is None or prev[0] != sig:
+                first_seen = prev[2] if prev else now
+                self._seen[entry.name] = (sig, now, first_seen)
+                prev = self._seen[entry.name]
+            if partial or not files:
+                continue
+            settled = self.settle_sec > 0 and now - prev[1] >= self.settle_sec
+            if has_marker or settled:
+                ready.append((entry.name, prev[2]))
+        for name in list(self._seen):
+            if name not in present:
+                del self._seen[name]
+        return ready
+
+    def _claim(self, name: str) -> Optional[str]:
+        job_name = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{name}"
+        dest = _unique_dir(self.processing, job_name)
+        try:
+            os.rename(os.path.join(self.inbox, name), dest)
+        except OSError:
+            return None
+        self._seen.pop(name, None)
+        return os.path.basename(dest)
+
+    def scan_once(self) -> int:
+        """One poll: queue recovered and newly ready packages while there is room. Returns how many were queued."""
+        queued = 0
+        while self._backlog and not self._queue.full():
+            self._queue.put((self._backlog.pop(0), time.time()))
+            queued += 1
+        if self._backlog:
+            return queued
+        for name, first_seen in self._ready_packages():
+            if self._queue.full():
+                break  # backpressure: the rest stays in the inbox until a worker frees a slot
+            job_name = self._claim(name)
+            if job_name is None:
+                continue
+            self._queue.put((job_name, first_seen))
+            self._emit(T("hotfolder.queued", name=name, depth=self._queue.qsize()))
+            queued += 1
+        return queued
+
+    def _scan_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.scan_once()
+            except Exception as exc:  # one bad package must not kill the scanner
+                self._emit(T("hotfolder.scan_error", error=exc))
+            self._write_status()
+            self._stop.wait(self.poll_sec)
+
+    # -------- processing --------
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job_name, first_seen = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            with self._lock:
+                self._in_flight += 1
+            try:
+                self.process(job_name, first_seen)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                self._queue.task_done()
+
+    def process(self, job_name: str, first_seen: Optional[float] = None) -> bool:
+        """Run the pipeline for a claimed package and move it to processed/ or failed/."""
+        src = os.path.join(self.processing, job_name)
+        started = time.perf_counter()
+        first_seen = first_seen or time.time()
+        ok = False
+        with span("package", package=job_name) as root:
+            try:
+                files, _marker, _partial = _package_files(src, self.marker)
+                if not files:
+                    raise ValueError(T("batch.no_files"))
+                job = self.job_store.open_job(job_name, files)
+                outcome = None
+                if not job.done:
+                    job.start()
+                    self._emit(T("batch.item_start", tender_id=job_name, files=len(files)))
+                    try:
+                        outcome = run_pipeline(
+                            files,
+                            on_progress=(lambda msg: self._emit(f"[{job_name}] {msg}")) if self.verbose else None,
+                            job=job,
+                            **self._pipeline_kwargs,
+                        )
+                    except Exception as exc:
+                        job.mark_failed(f"{type(exc).__name__}: {exc}")
+                        raise
+                result = outcome.result if outcome is not None else None
+                if result is None and job.result:
+                    record_result = job.result
+                else:
+                    record_result = {"schema": result.schema, "data": result.data} if result is not None else None
+                record = {
+                    "ts": datetime.now().isoformat(timespec="seconds"),
+                    "phase": "result",
+                    "tender_id": job_name,
+                    "store_id": job.store_id,
+                    "trace_id": root.trace_id,
+                    "files": [os.path.relpath(p, src) for p in files],
+                    "schema": record_result["schema"] if record_result else None,
+                    "result": record_result["data"] if record_result else None,
+                    "normalized": result.normalized if result is not None else None,
+                    "elapsed_sec": round(time.perf_counter() - started, 3),
+                    "stages_sec": {k: round(v, 3) for k, v in stage_durations(root.trace).items()},
+                    "note": "validated",
+                }
+                dest = _unique_dir(self.processed_dir, job_name)
+                shutil.move(src, dest)
+                _write_json(os.path.join(dest, "result.json"), record)
+                job.mark_saved(os.path.join(dest, "result.json"))
+                ok = True
+                self._emit(T("hotfolder.processed", name=job_name, path=dest))
+            except Exception as exc:
+                dest = _unique_dir(self.failed_dir, job_name)
+                try:
+                    shutil.move(src, dest)
+                    _write_json(os.path.join(dest, "error.json"), {
+                        "ts": datetime.now().isoformat(timespec="seconds"),
+                        "package": job_name,
+                        "trace_id": root.trace_id,
+                        "error_type": type(exc).__name__,
+                        "error": str(exc),
+                        "elapsed_sec": round(time.perf_counter() - started, 3),
+                    })
+                except OSError as move_exc:
+                    self._emit(T("hotfolder.move_failed", name=job_name, error=move_exc))
+                self._emit(T("batch.item_failed", tender_id=job_name, error=exc))
+        self._record(ok, time.time() - first_seen)
+        return ok
+
+    def _record(self, ok: bool, latency: float) -> None:
+        status = "processed" if ok else "failed"
+        HOTFOLDER_PACKAGES.inc(status=status)
+        HOTFOLDER_SECONDS.observe(latency, status=status)
+        now = time.time()
+        with self._lock:
+            self._counts[status] += 1
+            self._latency.add(latency)
+            self._finished.append(now)
+            while self._finished and self._finished[0] < now - _RATE_WINDOW_SEC:
+                self._finished.popleft()
+
+    # -------- status --------
+
+    def status(self) -> Dict[str, Any]:
+        """Queue depth, in-flight and waiting packages, rate over the last 15 min and latency percentiles."""
+        now = time.time()
+        with self._lock:
+            recent = sum(1 for t in self._finished if t >= now - _RATE_WINDOW_SEC)
+            return {
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "queue_depth": self._queue.qsize() + len(self._backlog),
+                "queue_capacity": self._queue.maxsize,
+                "in_flight": self._in_flight,
+                "waiting_in_inbox": len(self._seen),
+                "processed": self._counts["processed"],
+                "failed": self._counts["failed"],
+                "rate_per_min": round(recent / (_RATE_WINDOW_SEC / 60.0), 3),
+                "latency_sec": self._latency.summary(),
+            }
+
+    def _write_status(self) -> None:
+        try:
+            _write_json(os.path.join(self.outbox, "status.json"), self.status())
+        except OSError:
+            pass
+
+    def _collect(self):
+        st = self.status()
+        return [
+            ("hotfolder_queue_depth", "gauge", "Hot-folder packages queued for processing.",
+             [("hotfolder_queue_depth", {}, st["queue_depth"])]),
+            ("hotfolder_in_flight", "gauge", "Hot-folder packages being processed.",
+             [("hotfolder_in_flight", {}, st["in_flight"])]),
+            ("hotfolder_waiting", "gauge", "Hot-folder packages in the inbox that are not ready yet.",
+             [("hotfolder_waiting", {}, st["waiting_in_inbox"])]),
+        ]
+
+    # -------- lifecycle --------
+
+    def start(self) -> "HotFolder":
+        self._recover()
+        self._threads = [threading.Thread(target=self._scan_loop, name="hotfolder-scan", daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._worker, name=f"hotfolder-worker-{i}", daemon=True)
+            for i in range(self.jobs)
+        ]
+        for t in self._threads:
+            t.start()
+        self._emit(T("hotfolder.started", inbox=self.inbox, outbox=self.outbox, jobs=self.jobs))
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop scanning and let in-flight packages finish; queued ones stay in .processing for the next start."""
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._write_status()
+
+    def run_forever(self) -> None:
+        self.start()
+        try:
+            while not self._stop.is_set():
+                self._stop.wait(1.0)
+        except KeyboardInterrupt:
+            self._emit(T("hotfolder.stopping"))
+        finally:
+            self.stop()
+
+
+__all__ = ["HotFolder", "PROCESSING_DIR"]
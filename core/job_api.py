@@ -0,0 +1,553 @@
+# -*- coding: utf-8 -*-
+"""Local HTTP job API in front of :func:`run_pipeline` (stdlib only).
+
+Endpoints (JSON in, JSON out)::
+
+    POST   /jobs                  submit: multipart/form-data with ``file`` parts,
+                                  or JSON ``{"paths": [...]}`` for files on this host
+    GET    /jobs                  all known jobs (newest first)
+    GET    /jobs/<id>             status and the last progress message
+    GET    /jobs/<id>/events      progress messages; ``?since=N&wait=S`` long-polls for new ones
+    GET    /jobs/<id>/result      result record once the job is done (409 before that)
+    DELETE /jobs/<id>             cancel a queued job
+    GET    /health                queue depth and worker usage
+
+Optional submit fields (form fields or JSON keys): ``instruction``,
+``document_type`` (see ``DOCUMENT_PROMPTS``), ``wait_index`` (default true).
+
+Jobs wait on a bounded queue served by a fixed pool of worker threads, so a
+queued job is just an object in memory: hundreds of them cost no threads.
+When the queue is full, ``POST /jobs`` answers 503 with ``Retry-After``.
+Uploaded files are spooled to ``JOB_API_SPOOL_DIR/<id>/`` and removed when
+the job is evicted (``JOB_API_KEEP_FINISHED``). Server-side paths are only
+accepted under ``JOB_API_PATH_ROOTS``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+from core.batch import stage_durations
+from core.pipeline import run_pipeline
+from infra.config import (
+    AUTO_DELETE_DEFAULT_MIN,
+    DEFAULT_MODEL,
+    DOCUMENT_PROMPTS,
+    JOB_API_JOBS,
+    JOB_API_KEEP_FINISHED,
+    JOB_API_MAX_BODY_MB,
+    JOB_API_PATH_ROOTS,
+    JOB_API_QUEUE_SIZE,
+    JOB_API_SPOOL_DIR,
+)
+from infra.metrics import API_JOBS, API_JOB_SECONDS, REGISTRY
+from infra.tracing import span
+from infra.localization import translate as T
+
+_EVENTS_KEEP = 500          # progress messages kept per job
+_LONG_POLL_MAX_SEC = 30.0   # cap for ?wait= on /events
+
+
+class ApiError(Exception):
+    """Client error mapped to an HTTP status by the handler."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _safe_filename(name: str) -> str:
+    name = os.path.basename((name or "").replace("\\", "/")).strip()
+    return name if name not in ("", ".", "..") else "upload.bin"
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ("0", "false", "no", "off", "")
+
+
+class ApiJob:
+    """One submitted job: its inputs, state and progress messages."""
+
+    def __init__(self, job_id: str, files: List[str], spool_dir: Optional[str], options: Dict[str, Any]):
+        self.job_id = job_id
+        self.files = files
+        self.spool_dir = spool_dir
+        self.options = options
+        self.status = "queued"   # queued → running → done | failed | cancelled
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.submitted = time.time()
+        self.record: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.trace_id: Optional[str] = None
+        self._events: Deque[Tuple[int, str, str]] = deque(maxlen=_EVENTS_KEEP)
+        self._seq = 0
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def emit(self, message: str) -> None:
+        with self._changed:
+            self._seq += 1
+            self._events.append((self._seq, _now(), message))
+            self._changed.notify_all()
+
+    def set_status(self, status: str, **fields: Any) -> None:
+        with self._changed:
+            self.status = status
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self._changed.notify_all()
+
+    def events(self, since: int = 0, wait: float = 0.0) -> Tuple[List[Dict[str, Any]], int]:
+        """Messages with seq > since; waits up to ``wait`` seconds if there are none yet."""
+        deadline = time.monotonic() + max(0.0, wait)
+        with self._changed:
+            while self._seq <= since and not self.finished:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            items = [{"seq": s, "ts": ts, "message": m} for s, ts, m in self._events if s > since]
+            return items, self._seq
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._changed:
+            last = self._events[-1][2] if self._events else None
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "files": [os.path.basename(p) for p in self.files],
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "progress": self._seq,
+                "last_message": last,
+                "store_id": (self.record or {}).get("store_id"),
+                "trace_id": self.trace_id,
+                "error": self.error,
+            }
+
+
+class JobService:
+    """Bounded queue + worker pool executing :func:`run_pipeline` for submitted jobs."""
+
+    def __init__(
+        self,
+        *,
+        jobs: int = JOB_API_JOBS,
+        queue_size: int = JOB_API_QUEUE_SIZE,
+        spool_dir: str = JOB_API_SPOOL_DIR,
+        keep_finished: int = JOB_API_KEEP_FINISHED,
+        path_roots: Optional[List[str]] = None,
+        model: str = DEFAULT_MODEL,
+        auto_cleanup_min: Optional[int] = AUTO_DELETE_DEFAULT_MIN,
+        on_progress: Optional[Callable[[str], None]] = None,
+    ):
+        self.jobs = max(1, int(jobs))
+        self.spool_dir = os.path.abspath(spool_dir)
+        self.keep_finished = max(1, int(keep_finished))
+        roots = JOB_API_PATH_ROOTS if path_roots is None else path_roots
+        self.path_roots = [os.path.realpath(r) for r in roots]
+        self.model = model
+        self.auto_cleanup_min = auto_cleanup_min
+        self._emit = on_progress or (lambda _msg: None)
+
+        self.queue_size = max(1, int(queue_size))
+        self._pending: Deque[ApiJob] = deque()  # queued jobs only: cancel removes its job at once
+        self._jobs: "OrderedDict[str, ApiJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        os.makedirs(self.spool_dir, exist_ok=True)
+        REGISTRY.add_collector(self._collect)
+
+    # -------- submit --------
+
+    def _check_path(self, path: str) -> str:
+        real = os.path.realpath(path)
+        if not any(real == root or real.startswith(root + os.sep) for root in self.path_roots):
+            raise ApiError(403, f"path is outside JOB_API_PATH_ROOTS: {path}")
+        if not os.path.isfile(real):
+            raise ApiError(400, f"not a file: {path}")
+        return real
+
+    def submit(
+        self,
+        *,
+        uploads: Optional[List[Tuple[str, bytes]]] = None,
+        paths: Optional[List[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> ApiJob:
+        """Queue a job for uploaded (name, bytes) pairs and/or server-side paths."""
+        options = dict(options or {})
+        doc_type = options.get("document_type") or "tender"
+        if not isinstance(doc_type, str) or doc_type not in DOCUMENT_PROMPTS:
+            raise ApiError(400, f"unknown document_type: {doc_type!r}")
+        if not isinstance(options.get("instruction") or "", str):
+            raise ApiError(400, "'instruction' must be a string")
+        files = [self._check_path(p) for p in (paths or [])]
+        if not files and not uploads:
+            raise ApiError(400, "no files: send multipart 'file' parts or JSON 'paths'")
+        if self._full():
+            raise ApiError(503, "queue is full", {"Retry-After": "30"})
+
+        job_id = uuid4().hex[:12]
+        spool = None
+        if uploads:
+            spool = os.path.join(self.spool_dir, job_id)
+            os.makedirs(spool, exist_ok=True)
+            taken = set()
+            for name, data in uploads:
+                name = _safe_filename(name)
+                base, ext = os.path.splitext(name)
+                n = 1
+                while name in taken:
+                    n += 1
+                    name = f"{base}-{n}{ext}"
+                taken.add(name)
+                path = os.path.join(spool, name)
+                with open(path, "wb") as fp:
+                    fp.write(data)
+                files.append(path)
+
+        job = ApiJob(job_id, files, spool, options)
+        with self._ready:
+            accepted = not self._full()
+            if accepted:
+                self._jobs[job_id] = job
+                self._pending.append(job)
+                depth = len(self._pending)
+                self._ready.notify()
+        if not accepted:
+            if spool:
+                shutil.rmtree(spool, ignore_errors=True)
+            raise ApiError(503, "queue is full", {"Retry-After": "30"})
+        API_JOBS.inc(status="queued")
+        self._emit(T("api.job_queued", job_id=job_id, files=len(files), depth=depth))
+        return job
+
+    def _full(self) -> bool:
+        return len(self._pending) >= self.queue_size
+
+    def get(self, job_id: str) -> ApiJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise ApiError(404, f"unknown job: {job_id}")
+        return job
+
+    def list(self) -> List[ApiJob]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str) -> ApiJob:
+        """Cancel a queued job: it leaves the queue (and its capacity) and its spooled files are removed."""
+        job = self.get(job_id)
+        with self._lock:
+            queued = job in self._pending
+            if queued:
+                self._pending.remove(job)
+        if not queued:
+            raise ApiError(409, f"job is {job.status}; only queued jobs can be cancelled")
+        job.set_status("cancelled", finished_at=_now())
+        if job.spool_dir:
+            shutil.rmtree(job.spool_dir, ignore_errors=True)
+        API_JOBS.inc(status="cancelled")
+        self._evict()
+        return job
+
+    # -------- workers --------
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            with self._ready:
+                if not self._pending:
+                    self._ready.wait(0.5)
+                    continue
+                job = self._pending.popleft()
+                self._in_flight += 1
+            try:
+                self.process(job)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+            self._evict()
+
+    def process(self, job: ApiJob) -> None:
+        """Run the pipeline for ``job``; progress goes to the job's event list."""
+        job.set_status("running", started_at=_now())
+        started = time.perf_counter()
+        options = job.options
+        with span("api_job", job_id=job.job_id) as root:
+            job.trace_id = root.trace_id
+            try:
+                outcome = run_pipeline(
+                    job.files,
+                    wait_index=_truthy(options.get("wait_index", True)),
+                    on_progress=job.emit,
+                    user_instruction=options.get("instruction") or None,
+                    model=self.model,
+                    system_prompt_path=DOCUMENT_PROMPTS[options.get("document_type") or "tender"],
+                    auto_cleanup_min=self.auto_cleanup_min,
+                )
+                result = outcome.result
+                record = {
+                    "ts": _now(),
+                    "phase": "result",
+                    "job_id": job.job_id,
+                    "store_id": outcome.store_id,
+                    "trace_id": root.trace_id,
+                    "files": [os.path.basename(p) for p in job.files],
+                    "schema": result.schema if result is not None else None,
+                    "result": result.data if result is not None else None,
+                    "normalized": result.normalized if result is not None else None,
+                    "elapsed_sec": round(time.perf_counter() - started, 3),
+                    "stages_sec": {k: round(v, 3) for k, v in stage_durations(root.trace).items()},
+                    "note": "validated" if result is not None else "uploaded",
+                }
+                job.set_status("done", record=record, finished_at=_now())
+                status = "done"
+            except Exception as exc:
+                job.emit(f"{type(exc).__name__}: {exc}")
+                job.set_status("failed", error=f"{type(exc).__name__}: {exc}", finished_at=_now())
+                status = "failed"
+        API_JOBS.inc(status=status)
+        API_JOB_SECONDS.observe(time.time() - job.submitted, status=status)
+        self._emit(T("api.job_finished", job_id=job.job_id, status=status))
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond ``keep_finished`` together with their spooled files."""
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j.finished]
+            drop = finished[: max(0, len(finished) - self.keep_finished)]
+            for job in drop:
+                del self._jobs[job.job_id]
+        for job in drop:
+            if job.spool_dir:
+                shutil.rmtree(job.spool_dir, ignore_errors=True)
+
+    # -------- status --------
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                "ts": _now(),
+                "queue_depth": len(self._pending),
+                "queue_capacity": self.queue_size,
+                "in_flight": self._in_flight,
+                "workers": self.jobs,
+                "jobs": counts,
+            }
+
+    def _collect(self):
+        st = self.health()
+        return [
+            ("api_queue_depth", "gauge", "Job API submissions waiting for a worker.",
+             [("api_queue_depth", {}, st["queue_depth"])]),
+            ("api_in_flight", "gauge", "Job API submissions being processed.",
+             [("api_in_flight", {}, st["in_flight"])]),
+        ]
+
+    # -------- lifecycle --------
+
+    def start(self) -> "JobService":
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"api-worker-{i}", daemon=True)
+            for i in range(self.jobs)
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop taking queued jobs; running ones finish (or are abandoned after ``timeout``)."""
+        self._stop.set()
+        with self._ready:
+            self._ready.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+
+
+# ============================== HTTP ==============================
+
+def parse_multipart(content_type: str, body: bytes) -> Tuple[List[Tuple[str, bytes]], Dict[str, List[str]]]:
+    """Split a multipart/form-data body into file parts and plain fields using :mod:`email`."""
+    head = f"Content-Type: {content_type}\r\nMIME-Version: 1.0\r\n\r\n".encode("latin-1")
+    message = BytesParser(policy=HTTP).parsebytes(head + body)
+    if not message.is_multipart():
+        raise ApiError(400, "malformed multipart body")
+    uploads: List[Tuple[str, bytes]] = []
+    fields: Dict[str, List[str]] = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        filename = part.get_filename()
+        payload = part.get_payload(decode=True) or b""
+        if filename is not None:
+            uploads.append((filename, payload))
+        elif name:
+            charset = part.get_content_charset() or "utf-8"
+            fields.setdefault(name, []).append(payload.decode(charset, errors="replace"))
+    return uploads, fields
+
+
+class _JobApiHandler(BaseHTTPRequestHandler):
+    service: JobService
+    max_body: int = JOB_API_MAX_BODY_MB * 1024 * 1024
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes; avoid the delayed-ACK stall on keep-alive
+
+    # -------- plumbing --------
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise ApiError(411, "Content-Length required")
+        try:
+            length = int(length)
+        except ValueError:
+            raise ApiError(400, f"invalid Content-Length: {length!r}")
+        if length < 0:
+            raise ApiError(400, f"invalid Content-Length: {length}")
+        if length > self.max_body:
+            raise ApiError(413, f"request body exceeds {self.max_body} bytes")
+        return self.rfile.read(length)
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            status, payload = self._route(method, parts, query)
+            self._send_json(status, payload)
+        except ApiError as exc:
+            if method == "POST":
+                self.close_connection = True  # the body may not have been read
+            self._send_json(exc.status, {"error": str(exc)}, exc.headers)
+        except Exception as exc:  # pragma: no cover - defensive path
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, str]) -> Tuple[int, Any]:
+        svc = self.service
+        if parts == ["health"] and method == "GET":
+            return 200, svc.health()
+        if parts == ["jobs"]:
+            if method == "GET":
+                return 200, {"jobs": [j.to_dict() for j in svc.list()]}
+            if method == "POST":
+                job = self._submit()
+                return 202, dict(job.to_dict(), links={
+                    "self": f"/jobs/{job.job_id}",
+                    "events": f"/jobs/{job.job_id}/events",
+                    "result": f"/jobs/{job.job_id}/result",
+                })
+        if len(parts) == 2 and parts[0] == "jobs":
+            if method == "GET":
+                return 200, svc.get(parts[1]).to_dict()
+            if method == "DELETE":
+                return 200, svc.cancel(parts[1]).to_dict()
+        if len(parts) == 3 and parts[0] == "jobs" and method == "GET":
+            job = svc.get(parts[1])
+            if parts[2] == "events":
+                try:
+                    since = int(query.get("since", 0))
+                    wait = min(float(query.get("wait", 0)), _LONG_POLL_MAX_SEC)
+                except ValueError:
+                    raise ApiError(400, "since/wait must be numbers")
+                events, last = job.events(since, wait)
+                return 200, {"job_id": job.job_id, "status": job.status, "next": last, "events": events}
+            if parts[2] == "result":
+                if job.status != "done":
+                    return 409, {"job_id": job.job_id, "status": job.status, "error": job.error}
+                return 200, job.record
+        raise ApiError(404, f"no route for {method} /{'/'.join(parts)}")
+
+    def _submit(self) -> ApiJob:
+        ctype = self.headers.get("Content-Type", "")
+        body = self._read_body()
+        if ctype.startswith("multipart/form-data"):
+            uploads, fields = parse_multipart(ctype, body)
+            options = {k: v[-1] for k, v in fields.items() if k != "path"}
+            return self.service.submit(uploads=uploads, paths=fields.get("path"), options=options)
+        if ctype.startswith("application/json"):
+            try:
+                data = json.loads(body.decode("utf-8") or "{}")
+            except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+                raise ApiError(400, f"invalid JSON: {exc}")
+            if not isinstance(data, dict):
+                raise ApiError(400, "JSON body must be an object")
+            paths = data.pop("paths", None) or []
+            if not isinstance(paths, list):
+                raise ApiError(400, "'paths' must be a list")
+            return self.service.submit(paths=[str(p) for p in paths], options=data)
+        raise ApiError(415, "use multipart/form-data or application/json")
+
+    # -------- verbs --------
+
+    def do_GET(self) -> None:  # noqa: N802 - имя задаёт BaseHTTPRequestHandler
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self._dispatch("DELETE")
+
+    def log_message(self, format: str, *args) -> None:  # clients poll a lot; keep stdout for job progress
+        pass
+
+
+def start_api_server(
+    service: JobService,
+    host: str,
+    port: int,
+    max_body_mb: int = JOB_API_MAX_BODY_MB,
+) -> ThreadingHTTPServer:
+    """Start the HTTP front end in a background thread; ``server.shutdown()`` stops it."""
+    handler = type("JobApiHandler", (_JobApiHandler,), {
+        "service": service,
+        "max_body": int(max_body_mb) * 1024 * 1024,
+    })
+    server = ThreadingHTTPServer((host, int(port)), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="job-api-http", daemon=True).start()
+    return server
+
+
+__all__ = ["ApiError", "ApiJob", "JobService", "parse_multipart", "start_api_server"]
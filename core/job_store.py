@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+core/job_store.py — состояние заданий пакетного режима в SQLite.
+
+Для каждого тендера (job_id) хранится последний завершённый этап:
+
+    new → hashed → uploaded → indexed → extracted → saved
+
+и всё, что нужно, чтобы продолжить с него: sha256 и отпечатки (размер,
+mtime) файлов, store_id, file_id каждого уже привязанного файла,
+провалидированный результат. Каждая отметка — отдельная транзакция, так что
+после падения процесса перезапущенный batch продолжает задание с последнего
+этапа: не создаёт второе хранилище, не загружает файлы повторно и не
+тратит токены на уже выполненное извлечение.
+
+Если файлы задания изменились (другой набор путей, размер или mtime),
+задание начинается заново — старое хранилище удалит планировщик очистки.
+
+База в режиме WAL, соединения — по одному на поток (как infra/journal_db.py);
+каждое задание в каждый момент ведёт один поток.
+
+    python -m core.job_store results/batch.jobs.sqlite3            # сводка по этапам
+    python -m core.job_store results/batch.jobs.sqlite3 --failed   # ошибки
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+STAGES = ("new", "hashed", "uploaded", "indexed", "extracted", "saved")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id      TEXT PRIMARY KEY,
+    stage       TEXT NOT NULL DEFAULT 'new',
+    status      TEXT NOT NULL DEFAULT 'pending',
+    files       TEXT NOT NULL,
+    hashes      TEXT,
+    file_ids    TEXT NOT NULL DEFAULT '{}',
+    store_id    TEXT,
+    result      TEXT,
+    saved_copy  TEXT,
+    error       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs(status, stage);
+"""
+
+_COLUMNS = (
+    "job_id", "stage", "status", "files", "hashes", "file_ids", "store_id",
+    "result", "saved_copy", "error", "attempts", "created_at", "updated_at",
+)
+_JSON_COLUMNS = {"files", "hashes", "file_ids", "result"}
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path: str) -> List[int]:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class Job:
+    """
+    Одно задание и его контрольные точки. Методы mark_* сразу пишут в базу,
+    поэтому их можно передавать как колбэки (например, в upload_to_vector_store_ex).
+    """
+
+    def __init__(self, store: "JobStore", row: Dict[str, Any]):
+        self._store = store
+        self.job_id: str = row["job_id"]
+        self.stage: str = row["stage"]
+        self.status: str = row["status"]
+        self.files: List[str] = row["files"]
+        self.hashes: Optional[Dict[str, Dict[str, Any]]] = row["hashes"]
+        self.file_ids: Dict[str, str] = row["file_ids"] or {}
+        self.store_id: Optional[str] = row["store_id"]
+        self.result: Optional[Dict[str, Any]] = row["result"]
+        self.saved_copy: Optional[str] = row["saved_copy"]
+        self.error: Optional[str] = row["error"]
+        self.attempts: int = row["attempts"]
+
+    def reached(self, stage: str) -> bool:
+        """Пройден ли этап stage (или более поздний)."""
+        return STAGES.index(self.stage) >= STAGES.index(stage)
+
+    @property
+    def done(self) -> bool:
+        return self.status == "done"
+
+    def _update(self, **fields: Any) -> None:
+        self._store._update(self.job_id, **fields)
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    # -------- контрольные точки --------
+
+    def start(self) -> None:
+        self._update(status="running", attempts=self.attempts + 1, error=None)
+
+    def mark_hashed(self) -> None:
+        """Считает sha256 и отпечатки файлов (этап hashed)."""
+        hashes = {
+            path: {"sha256": file_sha256(path), "fingerprint": _fingerprint(path)}
+            for path in self.files
+        }
+        self._update(stage="hashed", hashes=hashes)
+
+    def mark_store(self, store_id: str) -> None:
+        self._update(store_id=store_id, file_ids={})
+
+    def mark_file(self, path: str, file_id: str) -> None:
+        self._update(file_ids=dict(self.file_ids, **{path: file_id}))
+
+    def reset_store(self) -> None:
+        """Хранилище исчезло (удалено/истекло) — загрузку придётся повторить."""
+        self._update(stage="hashed" if self.reached("hashed") else "new", store_id=None, file_ids={})
+
+    def mark_stage(self, stage: str) -> None:
+        self._update(stage=stage)
+
+    def mark_extracted(self, schema: str, data: Dict[str, Any]) -> None:
+        self._update(stage="extracted", result={"schema": schema, "data": data})
+
+    def mark_saved(self, saved_copy: Optional[str] = None) -> None:
+        self._update(stage="saved", status="done", saved_copy=saved_copy)
+
+    def mark_done(self) -> None:
+        """Задание завершено без дальнейших этапов (например, без ожидания индексации)."""
+        self._update(status="done")
+
+    def mark_failed(self, error: str) -> None:
+        self._update(status="failed", error=error)
+
+
+class JobStore:
+    """Задания пакетного запуска в SQLite (WAL, соединение на поток)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        out = dict(row)
+        for key in _JSON_COLUMNS:
+            if out.get(key) is not None:
+                out[key] = json.loads(out[key])
+        return out
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = _now()
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        args = [json.dumps(v, ensure_ascii=False) if k in _JSON_COLUMNS and v is not None else v
+                for k, v in fields.items()]
+        conn = self._conn()
+        with conn:
+            conn.execute(f"UPDATE jobs SET {cols} WHERE job_id = ?", (*args, job_id))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return Job(self, self._decode(row)) if row is not None else None
+
+    def open_job(self, job_id: str, files: List[str]) -> Job:
+        """
+        Задание с сохранённым состоянием или новое. Если набор файлов или их
+        отпечатки изменились с прошлого запуска — состояние сбрасывается.
+        """
+        files = [os.path.abspath(p) for p in files]
+        job = self.get(job_id)
+        if job is not None and not self._changed(job, files):
+            return job
+        now = _now()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, stage, status, files, file_ids, attempts, created_at, updated_at) "
+                "VALUES (?, 'new', 'pending', ?, '{}', ?, ?, ?)",
+                (job_id, json.dumps(files, ensure_ascii=False), job.attempts if job else 0, now, now),
+            )
+        return self.get(job_id)  # type: ignore[return-value]
+
+    @staticmethod
+    def _changed(job: Job, files: List[str]) -> bool:
+        if job.files != files:
+            return True
+        if not job.hashes:
+            return False
+        try:
+            return any(_fingerprint(p) != job.hashes.get(p, {}).get("fingerprint") for p in files)
+        except OSError:
+            return True
+
+    def jobs(self, status: Optional[str] = None) -> List[Job]:
+        sql, args = "SELECT * FROM jobs", ()
+        if status:
+            sql, args = sql + " WHERE status = ?", (status,)
+        return [Job(self, self._decode(r)) for r in self._conn().execute(sql + " ORDER BY created_at, job_id", args)]
+
+    def counts(self) -> Dict[str, int]:
+        """Число заданий по статусу и по этапу: {"done": 10, "failed": 1, "stage:uploaded": 3, …}."""
+        out: Dict[str, int] = {}
+        for status, stage, n in self._conn().execute("SELECT status, stage, COUNT(*) FROM jobs GROUP BY status, stage"):
+            out[status] = out.get(status, 0) + n
+            out[f"stage:{stage}"] = out.get(f"stage:{stage}", 0) + n
+        return out
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m core.job_store", description="Состояние заданий пакетного режима.")
+    parser.add_argument("path", help="Файл состояния (*.jobs.sqlite3).")
+    parser.add_argument("--failed", action="store_true", help="Показать задания с ошибкой.")
+    args = parser.parse_args(argv)
+
+    store = JobStore(args.path)
+    if args.failed:
+        for job in store.jobs(status="failed"):
+            print(f"{job.job_id}  этап: {job.stage}  попыток: {job.attempts}  {job.error}")
+        return
+    for key, n in sorted(store.counts().items()):
+        print(f"{key}: {n}")
+
+
+__all__ = ["STAGES", "Job", "JobStore", "file_sha256"]
+
+
+if __name__ == "__main__":
+    main()
@@ -2,63 +2,46 @@
 """High-level orchestration pipeline for Vector Store operations."""
 from __future__ import annotations
 
-import json
 import os
-from datetime import datetime
-from typing import Callable, Optional, Sequence
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence
 
-from core.uploader import upload_to_vector_store_ex
-from core.vector_store_cleanup import schedule_cleanup
+from core.uploader import store_exists, upload_to_vector_store_ex, wait_until_indexed
+from core.vector_store_cleanup import hold_cleanup, schedule_cleanup
 from core.vector_store_query import run_extraction_with_vector_store
 from infra.config import AUTO_DELETE_DEFAULT_MIN, DEFAULT_MODEL, SYSTEM_PROMPT_PATH
+from infra.metrics import PIPELINE_SECONDS, ensure_exporters
+from infra.result_sink import save_result
+from infra.models import ValidatedResult, registered_schemas
+from infra.tracing import span
 from infra import localization as i18n
 from infra.localization import translate as T
 
-i18n.reload_language_from_settings()
-
-
-def _ensure_dir(path: str) -> None:
-    if path:
-        os.makedirs(path, exist_ok=True)
-
-
-def _unique_filename(prefix: str, store_id: Optional[str], ext: str = "json") -> str:
-    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    sid = (store_id or "noid").replace("/", "_")
-    from uuid import uuid4
-    suffix = uuid4().hex[:6]
-    return f"{prefix}_{stamp}_{sid}_{suffix}.{ext}"
-
+if TYPE_CHECKING:
+    from core.job_store import Job
 
-def _save_result_record(save_dir: str, store_id: str, clean_json: str) -> str:
-    """Persist the validated extraction result in the same format as the journal."""
-    _ensure_dir(save_dir)
-    out_path = os.path.join(save_dir, _unique_filename("extract", store_id, "json"))
-
-    try:
-        payload = json.loads(clean_json)
-    except Exception:
-        payload = {"raw_text": clean_json}
-
-    record = {
-        "ts": datetime.now().isoformat(timespec="seconds"),
-        "phase": "result",
-        "store_id": store_id,
-        "result": payload,
-        "note": "validated",
-    }
-    with open(out_path, "w", encoding="utf-8") as fp:
-        json.dump(record, fp, ensure_ascii=False, indent=2)
-    return out_path
+i18n.reload_language_from_settings()
 
 
 class PipelineResult:
     """Outcome produced by :func:`run_pipeline`."""
 
-    def __init__(self, store_id: str, clean_json: Optional[str], saved_copy: Optional[str]):
+    def __init__(
+        self,
+        store_id: str,
+        result: Optional[ValidatedResult],
+        saved_copy: Optional[str],
+        trace_id: Optional[str] = None,
+    ):
         self.store_id = store_id
-        self.clean_json = clean_json
+        self.result = result
         self.saved_copy = saved_copy
+        self.trace_id = trace_id
+
+    @property
+    def clean_json(self) -> Optional[str]:
+        """Compact JSON string of the validated result (kept for older callers)."""
+        return self.result.clean_json if self.result is not None else None
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return (
@@ -80,12 +63,182 @@ def run_pipeline(
     model: str = DEFAULT_MODEL,
     system_prompt_path: str = SYSTEM_PROMPT_PATH,
     auto_cleanup_min: Optional[int] = AUTO_DELETE_DEFAULT_MIN,
+    job: Optional["Job"] = None,
+) -> PipelineResult:
+    """Upload, optionally wait for indexing, and run the extraction pipeline.
+
+    The whole run is traced (see :mod:`infra.tracing`); ``PipelineResult.trace_id``
+    matches the ``trace_id`` of the run's journal records.
+
+    With ``job`` (see :mod:`core.job_store`) every stage is checkpointed and a
+    rerun continues from the last completed one; ``files`` is then ignored in
+    favour of ``job.files``.
+    """
+
+    ensure_exporters()
+    started = time.perf_counter()
+    with span("pipeline", files=len(files), model=model) as root:
+        try:
+            result = _run_pipeline(
+                files,
+                wait_index=wait_index,
+                save_dir=save_dir,
+                on_progress=on_progress,
+                user_instruction=user_instruction,
+                model=model,
+                system_prompt_path=system_prompt_path,
+                auto_cleanup_min=auto_cleanup_min,
+                job=job,
+            )
+        except Exception:
+            PIPELINE_SECONDS.observe(time.perf_counter() - started, status="error")
+            raise
+        root.set(store_id=result.store_id)
+        result.trace_id = root.trace_id
+    PIPELINE_SECONDS.observe(time.perf_counter() - started, status="ok" if result.result is not None else "uploaded")
+    return result
+
+
+def _schedule_store_cleanup(store_id: str, auto_cleanup_min: Optional[int], emit: Callable[[str], None]) -> None:
+    if not auto_cleanup_min or auto_cleanup_min <= 0:
+        return
+    try:
+        schedule_cleanup(
+            vector_store_id=store_id,
+            delay_min=int(auto_cleanup_min),
+            on_done=lambda sid: emit(T("log.cleanup_done", store_id=sid)),
+            on_error=lambda sid, err: emit(
+                T("log.cleanup_error", store_id=sid, error=str(err))
+            ),
+        )
+        emit(T("log.cleanup_scheduled", minutes=int(auto_cleanup_min)))
+    except Exception as exc:  # pragma: no cover - defensive path
+        emit(T("log.cleanup_failed", error=str(exc)))
+
+
+def _restore_result(saved: Dict[str, Any]) -> ValidatedResult:
+    """Rebuild a checkpointed result without another Responses API call."""
+    schema = saved["schema"]
+    model_cls = registered_schemas()[schema]
+    return ValidatedResult.from_model(model_cls.model_validate(saved["data"]), schema=schema)
+
+
+def _run_job(
+    job: "Job",
+    *,
+    wait_index: bool,
+    save_dir: Optional[str],
+    on_progress: Optional[Callable[[str], None]],
+    instruction: str,
+    model: str,
+    system_prompt_path: str,
+    auto_cleanup_min: Optional[int],
 ) -> PipelineResult:
-    """Upload, optionally wait for indexing, and run the extraction pipeline."""
+    """Checkpointed variant of :func:`_run_pipeline`: skips every stage ``job`` has already reached."""
+    emit = on_progress or (lambda _msg: None)
+    if job.stage != "new":
+        emit(T("pipeline.job_resume", stage=job.stage))
+
+    if not job.reached("hashed"):
+        with span("hash", files=len(job.files)):
+            job.mark_hashed()
+
+    # The store may have been cleaned up or expired while the process was down.
+    # Hold the previous run's cleanup first: an overdue job would otherwise be
+    # picked up by the scheduler and delete the store after the check passed.
+    if job.store_id and not job.reached("extracted"):
+        hold_cleanup(job.store_id)
+        if store_exists(job.store_id):
+            _schedule_store_cleanup(job.store_id, auto_cleanup_min, emit)  # push the deadline back
+        else:
+            emit(T("pipeline.job_store_gone", store_id=job.store_id))
+            job.reset_store()
+
+    if not job.reached("uploaded"):
+        def on_store_created(store_id: str) -> None:
+            job.mark_store(store_id)
+            _schedule_store_cleanup(store_id, auto_cleanup_min, emit)
+
+        emit(T("log.upload_start"))
+        upload_summary = upload_to_vector_store_ex(
+            files=job.files,
+            on_progress=on_progress,
+            wait_index=False,
+            store_id=job.store_id,
+            uploaded=job.file_ids,
+            on_store_created=on_store_created,
+            on_file_attached=job.mark_file,
+        )
+        if not (upload_summary or {}).get("store_id"):
+            raise RuntimeError(T("pipeline.missing_store_id"))
+        if upload_summary.get("failed"):
+            failed = ", ".join(os.path.basename(p) for p in upload_summary["failed"])
+            raise RuntimeError(T("pipeline.job_upload_incomplete", files=failed))
+        job.mark_stage("uploaded")
+        emit(T("log.upload_complete"))
+
+    store_id = job.store_id
+    if not wait_index:
+        job.mark_done()
+        return PipelineResult(store_id=store_id, result=None, saved_copy=None)
+
+    if not job.reached("indexed"):
+        try:
+            wait_until_indexed(store_id, on_progress=on_progress, poll_sec=2.0, max_wait_sec=300)
+        except Exception as exc:
+            emit(T("pipeline.index_unconfirmed", error=str(exc)))
+        job.mark_stage("indexed")
+
+    if job.reached("extracted"):
+        result = _restore_result(job.result)
+    else:
+        emit(T("log.processing_start"))
+        result = run_extraction_with_vector_store(
+            store_id=store_id,
+            user_instruction=instruction,
+            model=model,
+            system_prompt_path=system_prompt_path,
+        )
+        job.mark_extracted(result.schema, result.data)
+        emit(T("log.processing_done"))
+
+    saved_copy = job.saved_copy
+    if save_dir and not saved_copy:
+        with span("save", path=save_dir):
+            saved_copy = save_result(save_dir, store_id, result, tender_id=job.job_id)
+        emit(T("log.saved_copy", path=saved_copy))
+        job.mark_saved(saved_copy)
+
+    return PipelineResult(store_id=store_id, result=result, saved_copy=saved_copy)
 
+
+def _run_pipeline(
+    files: Sequence[str],
+    *,
+    wait_index: bool,
+    save_dir: Optional[str],
+    on_progress: Optional[Callable[[str], None]],
+    user_instruction: Optional[str],
+    model: str,
+    system_prompt_path: str,
+    auto_cleanup_min: Optional[int],
+    job: Optional["Job"] = None,
+) -> PipelineResult:
     emit = on_progress or (lambda _msg: None)
     instruction = user_instruction or T("prompt.extract_instruction")
 
+    if job is not None:
+        return _run_job(
+            job,
+            wait_index=wait_index,
+            save_dir=save_dir,
+            on_progress=on_progress,
+            instruction=instruction,
+            model=model,
+            system_prompt_path=system_prompt_path,
+            auto_cleanup_min=auto_cleanup_min,
+        )
+
     emit(T("log.upload_start"))
     upload_summary = upload_to_vector_store_ex(
         files=files,
@@ -97,25 +250,13 @@ def run_pipeline(
         raise RuntimeError(T("pipeline.missing_store_id"))
     emit(T("log.upload_complete"))
 
-    if auto_cleanup_min and auto_cleanup_min > 0:
-        try:
-            schedule_cleanup(
-                vector_store_id=store_id,
-                delay_min=int(auto_cleanup_min),
-                on_done=lambda sid: emit(T("log.cleanup_done", store_id=sid)),
-                on_error=lambda sid, err: emit(
-                    T("log.cleanup_error", store_id=sid, error=str(err))
-                ),
-            )
-            emit(T("log.cleanup_scheduled", minutes=int(auto_cleanup_min)))
-        except Exception as exc:  # pragma: no cover - defensive path
-            emit(T("log.cleanup_failed", error=str(exc)))
+    _schedule_store_cleanup(store_id, auto_cleanup_min, emit)
 
     if not wait_index:
-        return PipelineResult(store_id=store_id, clean_json=None, saved_copy=None)
+        return PipelineResult(store_id=store_id, result=None, saved_copy=None)
 
     emit(T("log.processing_start"))
-    clean_json = run_extraction_with_vector_store(
+    result = run_extraction_with_vector_store(
         store_id=store_id,
         user_instruction=instruction,
         model=model,
@@ -126,12 +267,13 @@ def run_pipeline(
     saved_copy = None
     if save_dir:
         try:
-            saved_copy = _save_result_record(save_dir, store_id, clean_json)
+            with span("save", path=save_dir):
+                saved_copy = save_result(save_dir, store_id, result)
             emit(T("log.saved_copy", path=saved_copy))
         except Exception as exc:  # pragma: no cover - defensive path
             emit(T("log.save_copy_failed", error=str(exc)))
 
-    return PipelineResult(store_id=store_id, clean_json=clean_json, saved_copy=saved_copy)
+    return PipelineResult(store_id=store_id, result=result, saved_copy=saved_copy)
 
 
 __all__ = ["PipelineResult", "run_pipeline"]
\ No newline at end of file
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+core/store_registry.py — локальный реестр созданных нами Vector Stores.
+
+Каждое создание/удаление хранилища дописывается строкой в JSONL
+(STORE_REGISTRY_PATH, O_APPEND — строки из разных потоков не смешиваются).
+По реестру сверка (vector_store_cleanup.reconcile_stores) находит
+хранилища, которые пережили свой срок: процесс упал до очистки, задание
+отменили и т. п.
+
+Срок жизни на стороне сервера задаётся при создании (expires_after).
+API принимает его только в днях, поэтому минуты округляются вверх до
+целых суток (минимум 1) — это страховка, а точное удаление по-прежнему
+выполняет планировщик очистки.
+
+Дописывание и сжатие (compact_registry) разделяют файловую блокировку
+STORE_REGISTRY_PATH.lock: записи берут её совместно, сжатие — монопольно,
+поэтому строка, дописанная другим потоком или процессом во время сжатия,
+не теряется при замене файла.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from infra.config import STORE_REGISTRY_PATH
+
+try:
+    import fcntl  # POSIX: совместная/монопольная блокировка между процессами
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+_lock = threading.Lock()
+
+
+@contextmanager
+def _file_lock(path: str, exclusive: bool) -> Iterator[None]:
+    """Блокировка реестра через path.lock (в Windows — только монопольная)."""
+    with open(f"{path}.lock", "a+b") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        elif msvcrt is not None:  # pragma: no cover - Windows
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:  # pragma: no cover - Windows
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def expiry_policy(minutes: Optional[float]) -> Optional[Dict[str, Any]]:
+    """expires_after для POST /vector_stores: N минут -> целые сутки от последней активности."""
+    if not minutes or minutes <= 0:
+        return None
+    return {"anchor": "last_active_at", "days": max(1, math.ceil(float(minutes) / 1440))}
+
+
+def _append(record: Dict[str, Any], path: Optional[str] = None) -> None:
+    path = path or STORE_REGISTRY_PATH  # модульная переменная: её можно подменить (бенчмарки, отладка)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    with _file_lock(path, exclusive=False):  # не попасть между чтением и заменой файла в compact_registry
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+def record_created(store_id: str, name: Optional[str] = None, expires_after: Optional[Dict[str, Any]] = None) -> None:
+    try:
+        _append({"event": "created", "store_id": store_id, "name": name,
+                 "expires_after": expires_after, "ts": time.time()})
+    except OSError:
+        pass
+
+
+def record_deleted(store_id: str) -> None:
+    try:
+        _append({"event": "deleted", "store_id": store_id, "ts": time.time()})
+    except OSError:
+        pass
+
+
+def load_registry(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Живые (не удалённые) хранилища из реестра: store_id -> запись о создании."""
+    path = path or STORE_REGISTRY_PATH
+    live: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                sid = rec.get("store_id") if isinstance(rec, dict) else None
+                if not sid:
+                    continue
+                if rec.get("event") == "created":
+                    live[sid] = rec
+                elif rec.get("event") == "deleted":
+                    live.pop(sid, None)
+    except FileNotFoundError:
+        pass
+    return live
+
+
+def compact_registry(path: Optional[str] = None) -> int:
+    """Переписывает реестр, оставляя только живые хранилища; возвращает их число."""
+    path = path or STORE_REGISTRY_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _lock, _file_lock(path, exclusive=True):
+        live = load_registry(path)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for rec in sorted(live.values(), key=lambda r: r.get("ts") or 0):
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        os.replace(tmp, path)
+        return len(live)
+
+
+__all__ = ["expiry_policy", "record_created", "record_deleted", "load_registry", "compact_registry"]
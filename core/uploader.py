@@ -2,37 +2,27 @@ from __future__ import annotations
 
 import os
 import time
-import mimetypes
-from typing import Callable, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import requests
 
-from infra.config import API_KEY_PATH, BASE_URL, TIMEOUT
+from core.vector_store_client import get_client, load_api_key
+from infra.config import API_KEY_PATH, STORE_EXPIRES_AFTER_MIN, TIMEOUT
+from infra.journal_stats import LogHistogram
+from infra.metrics import ATTACH_SECONDS, FILES_UPLOADED, INDEX_SECONDS, UPLOAD_BYTES, UPLOAD_SECONDS
+from infra.tracing import span
+
+try:
+    # опционально: журнал метрик загрузки/индексации
+    from infra.log_journal import append_index_entry, append_upload_entry
+except Exception:
+    append_index_entry = None  # type: ignore[assignment]
+    append_upload_entry = None  # type: ignore[assignment]
 
 # ============================ ВСПОМОГАТЕЛЬНЫЕ ============================
 
 def _load_api_key(path: str = API_KEY_PATH) -> str:
-    if not os.path.exists(path):
-        raise FileNotFoundError(
-            f"Файл с API ключом не найден: {path}\n"
-            f"Убедитесь, что ключ сохранён в этом файле."
-        )
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read().strip()
-
-
-def _headers_json(api_key: str) -> dict:
-    return {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
-
-def _headers_multipart(api_key: str) -> dict:
-    # Для multipart заголовок Content-Type ставится автоматически requests'ом
-    return {
-        "Authorization": f"Bearer {api_key}",
-    }
+    return load_api_key(path)  # OPENAI_API_KEY или файл
 
 
 def _log(msg: str, cb: Optional[Callable[[str], None]]) -> None:
@@ -51,16 +41,21 @@ def _human_size(num_bytes: int) -> str:
 
 
 # ============================ HTTP ВЫЗОВЫ API ============================
-
-def create_vector_store(name: str, api_key: str, timeout: Tuple[int, int] = TIMEOUT) -> str:
+# Все запросы идут через общий VectorStoreClient (пул соединений, повторы 429/5xx).
+
+def create_vector_store(
+    name: str,
+    api_key: str,
+    timeout: Tuple[int, int] = TIMEOUT,
+    expires_after_min: Optional[float] = STORE_EXPIRES_AFTER_MIN,
+) -> str:
     """
     POST /vector_stores  ->  { id: "vs_..." }
+    expires_after_min — серверный срок жизни после последней активности
+    (API считает его в днях, см. core/store_registry.expiry_policy).
+    Созданное хранилище записывается в локальный реестр (это делает клиент).
     """
-    url = f"{BASE_URL}/vector_stores"
-    payload = {"name": name}
-    resp = requests.post(url, headers=_headers_json(api_key), json=payload, timeout=timeout)
-    resp.raise_for_status()
-    data = resp.json()
+    data = get_client(api_key).create_store(name, expires_after_min=expires_after_min, timeout=timeout)
     store_id = data.get("id")
     if not store_id:
         raise RuntimeError(f"Не удалось создать Vector Store: {data}")
@@ -72,18 +67,7 @@ def upload_file_to_files_api(path: str, api_key: str, timeout: Tuple[int, int] =
     POST /files  (multipart)  -> { id: "file_..." }
     purpose = "assistants" для последующей работы в file_search
     """
-    url = f"{BASE_URL}/files"
-    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
-    with open(path, "rb") as f:
-        files = {
-            "file": (os.path.basename(path), f, mime),
-        }
-        data = {
-            "purpose": "assistants",
-        }
-        resp = requests.post(url, headers=_headers_multipart(api_key), files=files, data=data, timeout=timeout)
-    resp.raise_for_status()
-    data = resp.json()
+    data = get_client(api_key).upload_file(path, purpose="assistants", timeout=timeout)
     file_id = data.get("id")
     if not file_id:
         raise RuntimeError(f"Не удалось загрузить файл {path}: {data}")
@@ -94,33 +78,27 @@ def attach_file_to_store(store_id: str, file_id: str, api_key: str, timeout: Tup
     """
     POST /vector_stores/{id}/files  -> связывает загруженный файл с хранилищем
     """
-    url = f"{BASE_URL}/vector_stores/{store_id}/files"
-    payload = {"file_id": file_id}
-    resp = requests.post(url, headers=_headers_json(api_key), json=payload, timeout=timeout)
-    resp.raise_for_status()
+    get_client(api_key).attach_file(store_id, file_id, timeout=timeout)
     # успешный ответ — достаточно 2xx; детали нам не обязательны
 
 
 def get_store_status(store_id: str, api_key: str, timeout: Tuple[int, int] = TIMEOUT) -> str:
     """
     GET /vector_stores/{id} -> { status: "in_progress" | "processing" | "indexed" | "failed", ... }
-    Названия статусов могут отличаться; нормализуем наиболее частые варианты.
+    Названия статусов могут отличаться; клиент нормализует наиболее частые варианты.
     """
-    url = f"{BASE_URL}/vector_stores/{store_id}"
-    resp = requests.get(url, headers=_headers_json(api_key), timeout=timeout)
-    resp.raise_for_status()
-    data = resp.json()
-    raw = (data.get("status") or "").lower()
-
-    # Нормализация к трем состояниям
-    if raw in {"ready", "indexed", "complete", "completed"}:
-        return "indexed"
-    if raw in {"in_progress", "processing", "pending"}:
-        return "processing"
-    if raw in {"failed", "error"}:
-        return "failed"
-    # если что-то новое — вернём как есть
-    return raw or "unknown"
+    return get_client(api_key).store_status(store_id, timeout=timeout)
+
+
+def store_exists(store_id: str, api_key: Optional[str] = None) -> bool:
+    """Есть ли хранилище на сервере (не удалено и не истекло) — для возобновления заданий."""
+    try:
+        status = get_store_status(store_id, api_key=api_key or _load_api_key())
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return False
+        raise
+    return status != "expired"
 
 
 # ============================ ОЖИДАНИЕ ИНДЕКСАЦИИ ============================
@@ -141,23 +119,46 @@ def wait_until_indexed(
     _log(f"⏳ Ожидаю индексацию хранилища {store_id} …", on_progress)
 
     last_status = None
-    while True:
-        st = get_store_status(store_id, api_key=api_key)
-        if st != last_status:
-            _log(f" • статус: {st}", on_progress)
-            last_status = st
-
-        if st == "indexed":
-            _log("✅ Индексация завершена.", on_progress)
-            return
-        if st == "failed":
-            raise RuntimeError(f"Индексация завершилась с ошибкой для store={store_id}")
-
-        elapsed = time.perf_counter() - started
-        if elapsed > max_wait_sec:
-            raise TimeoutError(f"Индексация не завершилась за {max_wait_sec} сек (store={store_id}).")
-
-        time.sleep(poll_sec)
+    polls = 0
+    outcome = "error"
+    with span("index_wait", store_id=store_id) as index_span:
+        try:
+            while True:
+                with span("poll", n=polls + 1) as poll_span:
+                    st = get_store_status(store_id, api_key=api_key)
+                    poll_span.set(status=st)
+                polls += 1
+                if st != last_status:
+                    _log(f" • статус: {st}", on_progress)
+                    last_status = st
+
+                if st == "indexed":
+                    outcome = "indexed"
+                    _log("✅ Индексация завершена.", on_progress)
+                    return
+                if st == "failed":
+                    outcome = "failed"
+                    raise RuntimeError(f"Индексация завершилась с ошибкой для store={store_id}")
+
+                elapsed = time.perf_counter() - started
+                if elapsed > max_wait_sec:
+                    outcome = "timeout"
+                    raise TimeoutError(f"Индексация не завершилась за {max_wait_sec} сек (store={store_id}).")
+
+                time.sleep(poll_sec)
+        finally:
+            index_span.set(outcome=outcome, polls=polls)
+            INDEX_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+            if append_index_entry:
+                try:
+                    append_index_entry(
+                        store_id=store_id,
+                        elapsed_sec=time.perf_counter() - started,
+                        status=outcome,
+                        polls=polls,
+                    )
+                except Exception:
+                    pass
 
 
 # ============================ ВЕРХНЕУРОВНЕВАЯ ФУНКЦИЯ ============================
@@ -167,6 +168,10 @@ def upload_to_vector_store_ex(
     on_progress: Optional[Callable[[str], None]] = None,
     wait_index: bool = False,
     store_name_prefix: str = "vs",
+    store_id: Optional[str] = None,
+    uploaded: Optional[Dict[str, str]] = None,
+    on_store_created: Optional[Callable[[str], None]] = None,
+    on_file_attached: Optional[Callable[[str, str], None]] = None,
 ) -> dict:
     """
     Загружает список локальных файлов в /files, привязывает к созданному Vector Store
@@ -176,8 +181,13 @@ def upload_to_vector_store_ex(
     :param on_progress: колбэк для логов (строка); может быть None
     :param wait_index: ждать ли индексацию внутри вызова
     :param store_name_prefix: префикс имени хранилища
+    :param store_id: продолжить загрузку в уже созданное хранилище (возобновление)
+    :param uploaded: {путь: file_id} файлов, уже привязанных к store_id, — пропускаются
+    :param on_store_created: колбэк (store_id) сразу после создания хранилища
+    :param on_file_attached: колбэк (путь, file_id) после успешной привязки файла
 
-    :return: словарь с итогами операции
+    :return: словарь с итогами операции (failed — пути, которые не удалось загрузить/привязать;
+             files — пофайловые замеры, file_summary — их перцентили p50/p90/p99)
     """
     api_key = _load_api_key()
 
@@ -185,52 +195,116 @@ def upload_to_vector_store_ex(
     if not file_list:
         raise ValueError("Список файлов пуст.")
 
-    # Создаём хранилище
-    ts = time.strftime("%Y%m%d-%H%M%S")
-    store_name = f"{store_name_prefix}-{ts}"
-    _log(f"создаю хранилище '{store_name}'…", on_progress)
-    store_id = create_vector_store(store_name, api_key=api_key)
-    _log(f"создано: id={store_id}", on_progress)
+    # Создаём хранилище (или продолжаем в уже созданном)
+    if store_id:
+        _log(f"продолжаю в хранилище id={store_id}", on_progress)
+    else:
+        ts = time.strftime("%Y%m%d-%H%M%S")
+        store_name = f"{store_name_prefix}-{ts}"
+        _log(f"создаю хранилище '{store_name}'…", on_progress)
+        with span("create_store", name=store_name) as sp:
+            store_id = create_vector_store(store_name, api_key=api_key)
+            sp.set(store_id=store_id)
+        _log(f"создано: id={store_id}", on_progress)
+        if on_store_created:
+            on_store_created(store_id)
 
     # Идём по файлам
     file_ids: List[str] = []
+    uploaded_sizes: List[Tuple[str, int]] = []
+    file_stats: List[Dict[str, Any]] = []  # пофайловые замеры для журнала, в порядке uploaded_sizes
+    client = get_client(api_key)
+    failed: List[str] = []
     attached = 0
+    upload_started = time.perf_counter()
 
     for path in file_list:
         base = os.path.basename(path)
+        if uploaded and uploaded.get(path):
+            file_ids.append(uploaded[path])
+            attached += 1
+            _log(f"[{base}] уже загружен (file_id={uploaded[path]}), пропускаю", on_progress)
+            continue
         try:
             size = os.path.getsize(path)
         except OSError:
             size = 0
         size_text = _human_size(size)
 
-        _log(f"[{base}] загрузка в /files…", on_progress)
-
-        try:
-            file_id = upload_file_to_files_api(path, api_key=api_key)
-        except requests.HTTPError as e:
-            _log(f"[{base}] ошибка загрузки: {e.response.status_code} {e.response.reason}; пропускаю", on_progress)
-            continue
-        except Exception as e:
-            _log(f"[{base}] ошибка загрузки: {e}; пропускаю", on_progress)
-            continue
-
-        file_ids.append(file_id)
-        _log(f"[{base}] file_id={file_id}, привязка к store…", on_progress)
-
-        # Привязываем к Store
+        with span("file", file=base, bytes=size):
+            _log(f"[{base}] загрузка в /files…", on_progress)
+
+            retries0 = client.thread_retries
+            t0 = time.perf_counter()
+            try:
+                with span("upload", file=base, bytes=size) as sp:
+                    file_id = upload_file_to_files_api(path, api_key=api_key)
+                    sp.set(file_id=file_id)
+            except requests.HTTPError as e:
+                FILES_UPLOADED.inc(status="error")
+                failed.append(path)
+                _log(f"[{base}] ошибка загрузки: {e.response.status_code} {e.response.reason}; пропускаю", on_progress)
+                continue
+            except Exception as e:
+                FILES_UPLOADED.inc(status="error")
+                failed.append(path)
+                _log(f"[{base}] ошибка загрузки: {e}; пропускаю", on_progress)
+                continue
+            upload_sec = time.perf_counter() - t0
+            UPLOAD_SECONDS.observe(upload_sec)
+            FILES_UPLOADED.inc(status="ok")
+            UPLOAD_BYTES.inc(size)
+
+            file_ids.append(file_id)
+            uploaded_sizes.append((path, size))
+            _log(f"[{base}] file_id={file_id}, привязка к store…", on_progress)
+
+            # Привязываем к Store
+            attach_sec = None
+            t0 = time.perf_counter()
+            try:
+                with span("attach", file_id=file_id):
+                    attach_file_to_store(store_id=store_id, file_id=file_id, api_key=api_key)
+                attach_sec = time.perf_counter() - t0
+                ATTACH_SECONDS.observe(attach_sec, status="ok")
+                attached += 1
+                _log(f"[{base}] готово ✅ ({size_text})", on_progress)
+                if on_file_attached:
+                    on_file_attached(path, file_id)
+            except requests.HTTPError as e:
+                ATTACH_SECONDS.observe(time.perf_counter() - t0, status="error")
+                failed.append(path)
+                _log(
+                    f"[{base}] ошибка привязки: {e.response.status_code} {e.response.reason} "
+                    f"{e.response.request.url}",
+                    on_progress,
+                )
+            except Exception as e:
+                ATTACH_SECONDS.observe(time.perf_counter() - t0, status="error")
+                failed.append(path)
+                _log(f"[{base}] ошибка привязки: {e}", on_progress)
+
+            file_stats.append({
+                "file_id": file_id,
+                "upload_sec": round(upload_sec, 3),
+                "attach_sec": round(attach_sec, 3) if attach_sec is not None else None,
+                "mb_s": round(size / 1048576.0 / upload_sec, 3) if upload_sec > 0 else None,
+                "retries": client.thread_retries - retries0,
+            })
+
+    upload_elapsed = time.perf_counter() - upload_started
+    if append_upload_entry and uploaded_sizes:
+        total_bytes = sum(sz for _, sz in uploaded_sizes)
         try:
-            attach_file_to_store(store_id=store_id, file_id=file_id, api_key=api_key)
-            attached += 1
-            _log(f"[{base}] готово ✅ ({size_text})", on_progress)
-        except requests.HTTPError as e:
-            _log(
-                f"[{base}] ошибка привязки: {e.response.status_code} {e.response.reason} "
-                f"{e.response.request.url}",
-                on_progress,
+            append_upload_entry(
+                store_id=store_id,
+                files=uploaded_sizes,
+                elapsed_sec=upload_elapsed,
+                avg_speed_kb_s=(total_bytes / 1024.0 / upload_elapsed) if upload_elapsed > 0 else None,
+                file_stats=file_stats,
             )
-        except Exception as e:
-            _log(f"[{base}] ошибка привязки: {e}", on_progress)
+        except Exception:
+            pass
 
     # Опционально ждём индексацию
     if wait_index and file_ids:
@@ -244,9 +318,21 @@ def upload_to_vector_store_ex(
         f"Store ID: {store_id}"
     )
 
+    file_summary: Dict[str, Any] = {}
+    for key in ("upload_sec", "attach_sec", "mb_s"):
+        hist = LogHistogram()
+        for st in file_stats:
+            if st[key] is not None:
+                hist.add(st[key])
+        file_summary[key] = hist.summary()
+    file_summary["retries"] = sum(st["retries"] for st in file_stats)
+
     return {
         "store_id": store_id,
         "file_ids": file_ids,
         "attached": attached,
+        "failed": failed,
         "summary": summary,
+        "files": file_stats,
+        "file_summary": file_summary,
     }
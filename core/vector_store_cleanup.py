@@ -1,21 +1,41 @@
 # -*- coding: utf-8 -*-
+"""
+Очистка Vector Stores: удаление файлов и хранилищ.
+
+HTTP — через общий VectorStoreClient (get_client): списки читаются
+постранично (курсор after / has_more / last_id), 429 и 5xx повторяются с
+паузой из Retry-After; удаления идут через ограниченный пул потоков. cleanup_all умеет фильтровать по
+префиксу имени и возрасту, работать вхолостую (dry_run) и возвращает сводку.
+
+reconcile_stores сверяет локальный реестр созданных нами хранилищ
+(core/store_registry.py) со списком на сервере и находит «утёкшие».
+
+DELETE /vector_stores/{id}/files/{file_id} только отвязывает файл — сам
+объект остаётся в /files. gc_orphan_files удаляет такие «сироты»: объекты
+нашего purpose, не привязанные ни к одному живому хранилищу.
+
+    python -m core.vector_store_cleanup --prefix vs- --older-than-min 60 --dry-run
+    python -m core.vector_store_cleanup --gc-files --dry-run
+    python -m core.vector_store_cleanup --reconcile --delete-leaked
+"""
 import os
-import requests
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional
 
 
 # стало:
-from infra.config import API_KEY_PATH as API_KEY_FILE, BASE_URL as API_BASE_URL, TIMEOUT as REQUEST_TIMEOUT
+from infra.config import API_KEY_PATH as API_KEY_FILE
+from infra.config import CLIENT_PAGE_SIZE, CLEANUP_WORKERS
+from infra.config import GC_FILES_MIN_AGE_MIN, GC_FILES_PURPOSE
+from infra.config import AUTO_DELETE_DEFAULT_MIN, STORE_RECONCILE_GRACE_MIN
+from infra.metrics import CLEANUPS
+from core.store_registry import compact_registry, load_registry, record_deleted
+from core.vector_store_client import VectorStoreClient, get_client
+from core.vector_store_client import load_api_key as _load_key
 
 
 def load_api_key(path: str = API_KEY_FILE) -> str:
-    if not os.path.isfile(path):
-        raise FileNotFoundError(
-            f"Файл с API ключом не найден: {path}\n"
-            f"Убедитесь, что ключ сохранён в этом файле."
-        )
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return _load_key(path)  # OPENAI_API_KEY или файл
 
 # --- ВВЕРХ ФАЙЛА (если ещё нет) ---
 import threading
@@ -24,126 +44,473 @@ import time
 # ... существующий код, в т.ч. cleanup_store(...)
 
 # --- В КОНЕЦ ФАЙЛА: ДОБАВИТЬ ---
-def schedule_cleanup(vector_store_id: str, delay_min: int, on_done=None, on_error=None) -> None:
+def schedule_cleanup(vector_store_id: str, delay_min: int, on_done=None, on_error=None) -> str:
     """
     Отложенно удалить хранилище через delay_min минут.
-    Ничего не блокирует: работает в отдельном потоке.
-    Ничего не удаляем из существующих функций.
+    Ничего не блокирует: задание ставится в общий планировщик
+    (core/cleanup_scheduler.py) — один поток на процесс, очередь на диске
+    переживает перезапуск. Возвращает id задания.
     """
-    def _worker():
-        try:
-            if delay_min > 0:
-                time.sleep(delay_min * 60)
-            # используем уже существующую функцию удаления
-            cleanup_store(vector_store_id)
-            if on_done:
-                on_done(vector_store_id)
-        except Exception as e:
-            if on_error:
-                on_error(vector_store_id, e)
+    from core.cleanup_scheduler import get_scheduler
+
+    return get_scheduler().schedule(vector_store_id, delay_min, on_done=on_done, on_error=on_error)
+
+
+def hold_cleanup(vector_store_id: str) -> None:
+    """
+    Снять отложенное удаление хранилища (в том числе задание прошлого запуска
+    из очереди на диске) и дождаться уже начатого. Нужно перед тем, как
+    продолжить работу с существующим хранилищем.
+    """
+    from core.cleanup_scheduler import get_scheduler
+
+    get_scheduler().hold(vector_store_id)
+
+
+def _client(api_key: str) -> VectorStoreClient:
+    """Общий клиент (пул соединений и повторы 429/5xx — в VectorStoreClient)."""
+    return get_client(api_key)
 
-    threading.Thread(target=_worker, daemon=True).start()
 
+def iter_vector_stores(api_key: str, page_size: int = CLIENT_PAGE_SIZE) -> Iterator[dict]:
+    """Все Vector Stores аккаунта, страница за страницей."""
+    return _client(api_key).iter_stores(page_size)
 
-def _auth_headers(api_key: str) -> dict:
-    return {"Authorization": f"Bearer {api_key}"}
+
+def iter_files(api_key: str, vector_store_id: str, page_size: int = CLIENT_PAGE_SIZE) -> Iterator[dict]:
+    """Все файлы хранилища, страница за страницей."""
+    return _client(api_key).iter_files(vector_store_id, page_size)
+
+
+def iter_uploaded_files(api_key: str, purpose: Optional[str] = None, page_size: int = CLIENT_PAGE_SIZE) -> Iterator[dict]:
+    """Объекты /files аккаунта (опционально — только указанного purpose), страница за страницей."""
+    return _client(api_key).iter_uploaded_files(purpose, page_size)
 
 
 def list_all_vector_stores(api_key: str) -> List[dict]:
     """Возвращает список всех созданных Vector Stores."""
-    url = f"{API_BASE_URL}/vector_stores"
-    resp = requests.get(url, headers=_auth_headers(api_key), timeout=REQUEST_TIMEOUT)
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+    return list(iter_vector_stores(api_key))
 
 
 def list_files(api_key: str, vector_store_id: str) -> List[dict]:
     """Возвращает список файлов в конкретном хранилище."""
-    url = f"{API_BASE_URL}/vector_stores/{vector_store_id}/files"
-    resp = requests.get(url, headers=_auth_headers(api_key), timeout=REQUEST_TIMEOUT)
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+    return list(iter_files(api_key, vector_store_id))
 
 
 def delete_file(api_key: str, vector_store_id: str, file_id: str) -> None:
     """Удаляет файл из Vector Store."""
-    url = f"{API_BASE_URL}/vector_stores/{vector_store_id}/files/{file_id}"
-    resp = requests.delete(url, headers=_auth_headers(api_key), timeout=REQUEST_TIMEOUT)
-    resp.raise_for_status()
+    _client(api_key).delete_file(vector_store_id, file_id)
 
 
 def delete_vector_store(api_key: str, vector_store_id: str) -> None:
-    """Удаляет всё хранилище."""
-    url = f"{API_BASE_URL}/vector_stores/{vector_store_id}"
-    resp = requests.delete(url, headers=_auth_headers(api_key), timeout=REQUEST_TIMEOUT)
-    resp.raise_for_status()
+    """Удаляет всё хранилище (уже удалённое/истёкшее — 404 — тоже считается удалённым)."""
+    _client(api_key).delete_store(vector_store_id)
+
+
+def delete_uploaded_file(api_key: str, file_id: str) -> None:
+    """Удаляет сам объект из /files (а не только привязку к хранилищу)."""
+    _client(api_key).delete_uploaded_file(file_id)
+
+
+# ============================== СВОДКА ==============================
+
+class CleanupSummary:
+    """Итоги очистки: что удалено, что не удалось, что пропущено фильтрами, и сколько это заняло."""
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self.stores_deleted = 0
+        self.files_deleted = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes_reclaimed = 0
+        self.errors: List[str] = []
+        self.delete_sec = 0.0
+        self.elapsed_sec = 0.0
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, *, stores: int = 0, files: int = 0, failed: int = 0, skipped: int = 0,
+            delete_sec: float = 0.0, nbytes: int = 0, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.stores_deleted += stores
+            self.files_deleted += files
+            self.bytes_reclaimed += nbytes
+            self.failed += failed
+            self.skipped += skipped
+            self.delete_sec += delete_sec
+            if error:
+                self.errors.append(error)
+
+    def finish(self) -> "CleanupSummary":
+        self.elapsed_sec = time.perf_counter() - self._started
+        return self
+
+    def as_dict(self) -> dict:
+        deletes = self.stores_deleted + self.files_deleted
+        return {
+            "dry_run": self.dry_run,
+            "stores_deleted": self.stores_deleted,
+            "files_deleted": self.files_deleted,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "avg_delete_sec": round(self.delete_sec / deletes, 3) if deletes else None,
+        }
+
+    def __str__(self) -> str:
+        d = self.as_dict()
+        prefix = "[dry-run] Было бы удалено" if self.dry_run else "Удалено"
+        freed = f", освобождено {self.bytes_reclaimed / 1048576:.2f} МБ" if self.bytes_reclaimed else ""
+        return (
+            f"{prefix} хранилищ: {d['stores_deleted']}, файлов: {d['files_deleted']}{freed}; "
+            f"ошибок: {d['failed']}; пропущено: {d['skipped']}; "
+            f"время: {d['elapsed_sec']} с (в среднем {d['avg_delete_sec']} с на удаление)"
+        )
 
 
-def cleanup_store(vector_store_id: str) -> None:
-    """
-    Удаляет все файлы из указанного Vector Store и затем само хранилище.
-    """
-    api_key = load_api_key()
+# ============================== ОЧИСТКА ==============================
+
+def _timed_delete(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def _delete_store_files(
+    api_key: str,
+    vector_store_id: str,
+    summary: CleanupSummary,
+    log: Callable[[str], None],
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> None:
+    """Удаляет файлы хранилища (через pool, если он передан, иначе последовательно)."""
     try:
         files = list_files(api_key, vector_store_id)
     except Exception as e:
-        print(f"❌ Ошибка получения списка файлов для {vector_store_id}: {e}")
-        files = []
-
-    for f in files:
-        fid = f.get("id")
-        if fid:
-            try:
-                delete_file(api_key, vector_store_id, fid)
-                print(f"   ✅ Файл удалён: {fid}")
-            except Exception as e:
-                print(f"   ❌ Ошибка удаления файла {fid}: {e}")
+        log(f"❌ Ошибка получения списка файлов для {vector_store_id}: {e}")
+        summary.add(failed=1, error=f"{vector_store_id}: {e}")
+        return
 
+    def _one(fid: str) -> None:
+        if summary.dry_run:
+            summary.add(files=1)
+            log(f"   [dry-run] файл был бы удалён: {fid}")
+            return
+        try:
+            summary.add(files=1, delete_sec=_timed_delete(delete_file, api_key, vector_store_id, fid))
+            CLEANUPS.inc(outcome="file_deleted")
+            log(f"   ✅ Файл удалён: {fid}")
+        except Exception as e:
+            summary.add(failed=1, error=f"{vector_store_id}/{fid}: {e}")
+            CLEANUPS.inc(outcome="file_error")
+            log(f"   ❌ Ошибка удаления файла {fid}: {e}")
+
+    ids = [f.get("id") for f in files if f.get("id")]
+    if pool is not None:
+        list(pool.map(_one, ids))
+    else:
+        for fid in ids:
+            _one(fid)
+
+
+def _delete_store(api_key: str, vector_store_id: str, summary: CleanupSummary, log: Callable[[str], None]) -> None:
+    if summary.dry_run:
+        summary.add(stores=1)
+        log(f"[dry-run] хранилище было бы удалено: {vector_store_id}")
+        return
     try:
-        delete_vector_store(api_key, vector_store_id)
-        print(f"🗑 Хранилище удалено: {vector_store_id}")
+        summary.add(stores=1, delete_sec=_timed_delete(delete_vector_store, api_key, vector_store_id))
+        CLEANUPS.inc(outcome="store_deleted")
+        log(f"🗑 Хранилище удалено: {vector_store_id}")
     except Exception as e:
-        print(f"❌ Ошибка удаления хранилища {vector_store_id}: {e}")
-
-
-def cleanup_all() -> None:
-    """Удаляет все файлы и все хранилища."""
+        summary.add(failed=1, error=f"{vector_store_id}: {e}")
+        CLEANUPS.inc(outcome="store_error")
+        log(f"❌ Ошибка удаления хранилища {vector_store_id}: {e}")
+
+
+def cleanup_store(
+    vector_store_id: str,
+    *,
+    dry_run: bool = False,
+    workers: int = CLEANUP_WORKERS,
+    on_progress: Optional[Callable[[str], None]] = print,
+) -> CleanupSummary:
+    """
+    Удаляет все файлы из указанного Vector Store (параллельно) и затем само хранилище.
+    """
+    log = on_progress or (lambda _msg: None)
     api_key = load_api_key()
-    stores = list_all_vector_stores(api_key)
-
-    if not stores:
-        print("✅ Нет созданных Vector Stores — очищать нечего.")
-        return
-
-    print(f"🔍 Найдено хранилищ: {len(stores)}")
+    summary = CleanupSummary(dry_run=dry_run)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cleanup") as pool:
+        _delete_store_files(api_key, vector_store_id, summary, log, pool)
+    _delete_store(api_key, vector_store_id, summary, log)
+    return summary.finish()
+
+
+def _store_matches(store: dict, name_prefix: Optional[str], min_created_at: Optional[float]) -> bool:
+    if name_prefix and not str(store.get("name") or "").startswith(name_prefix):
+        return False
+    if min_created_at is not None:
+        created = store.get("created_at")
+        if not isinstance(created, (int, float)) or created > min_created_at:
+            return False
+    return True
+
+
+def cleanup_all(
+    *,
+    name_prefix: Optional[str] = None,
+    older_than_min: Optional[float] = None,
+    dry_run: bool = False,
+    workers: int = CLEANUP_WORKERS,
+    on_progress: Optional[Callable[[str], None]] = print,
+) -> CleanupSummary:
+    """
+    Удаляет файлы и хранилища аккаунта, подходящие под фильтры:
+    name_prefix — префикс имени (например, "vs-"), older_than_min — созданные
+    раньше, чем N минут назад. Хранилища обрабатываются параллельно (workers).
+    """
+    log = on_progress or (lambda _msg: None)
+    api_key = load_api_key()
+    summary = CleanupSummary(dry_run=dry_run)
+    min_created_at = time.time() - older_than_min * 60 if older_than_min is not None else None
 
-    for store in stores:
+    def _one(store: dict) -> None:
         store_id = store.get("id")
-        name = store.get("name", "(без имени)")
-        print(f"\n🗂 Хранилище: {name} ({store_id})")
-
+        name = store.get("name") or "(без имени)"
+        log(f"🗂 Хранилище: {name} ({store_id})")
+        _delete_store_files(api_key, store_id, summary, log)
+        _delete_store(api_key, store_id, summary, log)
+
+    # сначала весь список: удаление хранилища-курсора (after=last_id) во время
+    # постраничного чтения обрывает обход, и часть хранилищ молча остаётся
+    stores = [s for s in iter_vector_stores(api_key) if s.get("id")]
+    found = len(stores)
+    targets = []
+    for store in stores:
+        if _store_matches(store, name_prefix, min_created_at):
+            targets.append(store)
+        else:
+            summary.add(skipped=1)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cleanup") as pool:
+        futures = [pool.submit(_one, store) for store in targets]
+        for fut in futures:
+            fut.result()
+
+    summary.finish()
+    if not found:
+        log("✅ Нет созданных Vector Stores — очищать нечего.")
+    else:
+        log(f"🔍 Найдено хранилищ: {found}")
+        log(f"✨ {summary}")
+    return summary
+
+
+# ============================== GC /files ==============================
+
+def _attached_file_ids(api_key: str, workers: int) -> set:
+    """file_id всех файлов, привязанных к существующим хранилищам (хранилища обходятся параллельно)."""
+    attached: set = set()
+    lock = threading.Lock()
+
+    def _one(store_id: str) -> None:
+        ids = [f.get("id") for f in iter_files(api_key, store_id) if f.get("id")]
+        with lock:
+            attached.update(ids)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="gc-scan") as pool:
+        futures = [pool.submit(_one, s["id"]) for s in iter_vector_stores(api_key) if s.get("id")]
+        for fut in futures:
+            fut.result()  # ошибка чтения любого хранилища прерывает GC: иначе удалим живые файлы
+    return attached
+
+
+def gc_orphan_files(
+    *,
+    older_than_min: float = GC_FILES_MIN_AGE_MIN,
+    purpose: str = GC_FILES_PURPOSE,
+    dry_run: bool = False,
+    workers: int = CLEANUP_WORKERS,
+    on_progress: Optional[Callable[[str], None]] = print,
+) -> CleanupSummary:
+    """
+    Удаляет из /files объекты указанного purpose, которые не привязаны ни к одному
+    хранилищу и созданы раньше, чем older_than_min минут назад (свежие файлы
+    могут быть ещё в процессе привязки). Возвращает сводку с освобождёнными байтами.
+    """
+    log = on_progress or (lambda _msg: None)
+    api_key = load_api_key()
+    summary = CleanupSummary(dry_run=dry_run)
+    attached = _attached_file_ids(api_key, workers)
+    cutoff = time.time() - older_than_min * 60
+
+    def _one(f: dict) -> None:
+        fid, size = f["id"], int(f.get("bytes") or 0)
+        if dry_run:
+            summary.add(files=1, nbytes=size)
+            log(f"   [dry-run] объект был бы удалён: {fid} ({f.get('filename')}, {size} Б)")
+            return
         try:
-            files = list_files(api_key, store_id)
+            summary.add(files=1, nbytes=size, delete_sec=_timed_delete(delete_uploaded_file, api_key, fid))
+            CLEANUPS.inc(outcome="orphan_deleted")
+            log(f"   ✅ Объект удалён: {fid} ({f.get('filename')})")
         except Exception as e:
-            print(f"   ❌ Ошибка получения списка файлов: {e}")
-            continue
+            summary.add(failed=1, error=f"{fid}: {e}")
+            CLEANUPS.inc(outcome="orphan_error")
+            log(f"   ❌ Ошибка удаления объекта {fid}: {e}")
 
-        for f in files:
-            fid = f.get("id")
-            try:
-                delete_file(api_key, store_id, fid)
-                print(f"   ✅ Файл удалён: {fid}")
-            except Exception as e:
-                print(f"   ❌ Ошибка удаления файла {fid}: {e}")
+    # кандидаты — до первого удаления (см. cleanup_all: курсор after не должен исчезать)
+    candidates = []
+    for f in list(iter_uploaded_files(api_key, purpose)):
+        fid = f.get("id")
+        if not fid:
+            continue
+        if purpose and f.get("purpose") not in (None, purpose):
+            continue
+        created = f.get("created_at")
+        if fid in attached or not isinstance(created, (int, float)) or created > cutoff:
+            summary.add(skipped=1)
+            continue
+        candidates.append(f)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="gc-files") as pool:
+        futures = [pool.submit(_one, f) for f in candidates]
+        for fut in futures:
+            fut.result()
+
+    summary.finish()
+    log(f"🔍 Привязанных файлов: {len(attached)}")
+    log(f"✨ {summary}")
+    return summary
+
+
+# ============================== СВЕРКА С РЕЕСТРОМ ==============================
+
+def reconcile_stores(
+    *,
+    delete_leaked: bool = False,
+    grace_min: float = STORE_RECONCILE_GRACE_MIN,
+    name_prefix: str = "vs-",
+    workers: int = CLEANUP_WORKERS,
+    on_progress: Optional[Callable[[str], None]] = print,
+) -> dict:
+    """
+    Сверяет реестр созданных нами хранилищ с сервером:
+      * gone — в реестре, но на сервере уже нет (истёк expires_after или удалено
+        в другом месте) — помечаются удалёнными;
+      * leaked — живы дольше AUTO_DELETE_DEFAULT_MIN + grace_min и не стоят
+        в очереди очистки; при delete_leaked удаляются;
+      * unmanaged — хранилища с префиксом name_prefix, которых нет в реестре
+        (созданы до появления реестра или другим экземпляром) — только отчёт.
+    """
+    from core.cleanup_scheduler import read_pending
 
-        try:
-            delete_vector_store(api_key, store_id)
-            print("   🗑 Хранилище удалено.")
-        except Exception as e:
-            print(f"   ❌ Ошибка удаления хранилища {store_id}: {e}")
+    log = on_progress or (lambda _msg: None)
+    api_key = load_api_key()
+    registry = load_registry()
+    remote = {
+        s["id"]: s for s in iter_vector_stores(api_key)
+        if s.get("id") and s.get("status") != "expired"
+    }
+    pending = {job["store_id"] for job in read_pending()}
+    deadline = time.time() - (AUTO_DELETE_DEFAULT_MIN + grace_min) * 60
+
+    gone = sorted(sid for sid in registry if sid not in remote)
+    leaked = sorted(
+        sid for sid, rec in registry.items()
+        if sid in remote and sid not in pending and float(rec.get("ts") or 0) < deadline
+    )
+    unmanaged = sorted(
+        sid for sid, s in remote.items()
+        if sid not in registry and str(s.get("name") or "").startswith(name_prefix)
+    )
+    for sid in gone:
+        record_deleted(sid)
+
+    log(f"🔍 В реестре: {len(registry)}, на сервере: {len(remote)}; "
+        f"исчезли: {len(gone)}, утекли: {len(leaked)}, вне реестра: {len(unmanaged)}")
+    for sid in leaked:
+        log(f"   ⚠️ Утёкшее хранилище: {sid} ({remote[sid].get('name')})")
+
+    summary = None
+    if delete_leaked and leaked:
+        summary = CleanupSummary()
+
+        def _one(sid: str) -> None:
+            _delete_store_files(api_key, sid, summary, log)
+            _delete_store(api_key, sid, summary, log)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="reconcile") as pool:
+            list(pool.map(_one, leaked))
+        summary.finish()
+        log(f"✨ {summary}")
 
-    print("\n✨ Все Vector Stores удалены.")
+    try:
+        compact_registry()
+    except OSError:
+        pass
+    return {
+        "registered": len(registry),
+        "remote": len(remote),
+        "gone": gone,
+        "leaked": leaked,
+        "unmanaged": unmanaged,
+        "deleted": summary.as_dict() if summary else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m core.vector_store_cleanup",
+        description="Удаление Vector Stores и их файлов.",
+    )
+    parser.add_argument("--store-id", dest="store_id", help="Удалить только это хранилище.")
+    parser.add_argument("--prefix", dest="name_prefix", help="Только хранилища с именем, начинающимся на префикс (например, vs-).")
+    parser.add_argument("--older-than-min", dest="older_than_min", type=float, help="Только хранилища старше N минут.")
+    parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="Ничего не удалять, только показать.")
+    parser.add_argument("--workers", type=int, default=CLEANUP_WORKERS, help="Сколько удалений выполнять параллельно.")
+    parser.add_argument(
+        "--gc-files",
+        dest="gc_files",
+        action="store_true",
+        help=f"Удалить из /files объекты, не привязанные ни к одному хранилищу "
+             f"(--older-than-min по умолчанию {GC_FILES_MIN_AGE_MIN}).",
+    )
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Сверить локальный реестр созданных хранилищ с сервером и показать утёкшие.",
+    )
+    parser.add_argument(
+        "--delete-leaked",
+        dest="delete_leaked",
+        action="store_true",
+        help="Вместе с --reconcile: удалить утёкшие хранилища.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.reconcile:
+        reconcile_stores(delete_leaked=args.delete_leaked and not args.dry_run, workers=args.workers)
+    elif args.gc_files:
+        gc_orphan_files(
+            older_than_min=args.older_than_min if args.older_than_min is not None else GC_FILES_MIN_AGE_MIN,
+            dry_run=args.dry_run,
+            workers=args.workers,
+        )
+    elif args.store_id:
+        summary = cleanup_store(args.store_id, dry_run=args.dry_run, workers=args.workers)
+        print(f"✨ {summary}")
+    else:
+        cleanup_all(
+            name_prefix=args.name_prefix,
+            older_than_min=args.older_than_min,
+            dry_run=args.dry_run,
+            workers=args.workers,
+        )
 
 
 if __name__ == "__main__":
-    cleanup_all()
+    main()
@@ -1,92 +1,286 @@
 # -*- coding: utf-8 -*-
+"""
+VectorStoreClient — единая точка работы с API Vector Stores / Files / Responses.
+
+Один requests.Session с пулом соединений на экземпляр (pool_size), повторы
+при 429/5xx с учётом Retry-After, ленивые генераторы по страницам списков
+(курсор after / has_more / last_id). Модули core/uploader.py,
+core/vector_store_cleanup.py и core/vector_store_query.py работают через
+общий клиент get_client() — настройка конкурентности и переиспользования
+соединений делается здесь.
+
+Повторы: GET/DELETE повторяются при 429, 5xx и сетевых ошибках; POST —
+только при 429 (запрос не был принят), чтобы не создать дубликаты.
+
+Адрес API: переменная окружения OPENAI_BASE_URL, затем "base_url" в
+settings.json, затем config.BASE_URL (например, локальный
+benchmarks/mock_openai.py). Ключ: OPENAI_API_KEY, иначе файл API_KEY_PATH.
+
+Запись и воспроизведение трафика (HTTP_CASSETTE_MODE) подключаются
+адаптером сессии — см. infra/http_cassette.py.
+"""
+import mimetypes
 import os
+import random
+import threading
 import time
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from infra.config import API_KEY_PATH, BASE_URL, TIMEOUT
+from typing import Any, Dict, Iterator, List, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from core.store_registry import expiry_policy, record_created, record_deleted
+from infra.config import (
+    API_KEY_PATH,
+    CLIENT_MAX_RETRIES,
+    CLIENT_PAGE_SIZE,
+    CLIENT_POOL_SIZE,
+    STORE_EXPIRES_AFTER_MIN,
+    TIMEOUT,
+)
+from infra.http_cassette import wrap_adapter
+from infra.metrics import HTTP_RETRIES
+from infra.settings import get_base_url
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_IDEMPOTENT = {"GET", "HEAD", "DELETE"}
+
+
+def retry_delay(resp: Optional[requests.Response], attempt: int) -> float:
+    """Пауза перед повтором: Retry-After сервера или экспонента с джиттером."""
+    if resp is not None:
+        value = resp.headers.get("Retry-After")
+        if value:
+            try:
+                return min(60.0, max(0.0, float(value)))
+            except ValueError:
+                pass
+    return min(30.0, 0.5 * (2 ** attempt)) * (0.5 + random.random() / 2)
+
+
+def normalize_store_status(raw: Optional[str]) -> str:
+    """Статус хранилища к трём состояниям: indexed / processing / failed (иначе — как есть)."""
+    raw = (raw or "").lower()
+    if raw in {"ready", "indexed", "complete", "completed"}:
+        return "indexed"
+    if raw in {"in_progress", "processing", "pending"}:
+        return "processing"
+    if raw in {"failed", "error"}:
+        return "failed"
+    return raw or "unknown"
+
+
+def load_api_key(path: str = API_KEY_PATH) -> str:
+    """API-ключ: переменная окружения OPENAI_API_KEY, иначе содержимое файла path."""
+    env = os.environ.get("OPENAI_API_KEY", "").strip()
+    if env:
+        return env
+    if not os.path.isfile(path):
+        raise FileNotFoundError(
+            f"Файл с API ключом не найден: {path}\n"
+            f"Убедитесь, что ключ сохранён в этом файле (или задайте OPENAI_API_KEY)."
+        )
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
 
-try:
-    # опционально: логирование, если модуль доступен
-    from infra.log_journal import append_upload_entry
-except Exception:
-    append_upload_entry = None  # нет журнала — просто пропустим
 
 class VectorStoreClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
         api_key_path: str = API_KEY_PATH,
-        base_url: str = BASE_URL,
+        base_url: Optional[str] = None,
         request_timeout: tuple = TIMEOUT,
+        pool_size: int = CLIENT_POOL_SIZE,
+        max_retries: int = CLIENT_MAX_RETRIES,
     ):
-        self.api_key = api_key or self._load_api_key(api_key_path)
-        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key or load_api_key(api_key_path)
+        self.base_url = (base_url or get_base_url()).rstrip("/")
         self.timeout = request_timeout
+        self.max_retries = max_retries
+        self._tls = threading.local()  # счётчик повторов по потокам (для пофайловых замеров)
 
         self.session = requests.Session()
         self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        # пул соединений под параллельные загрузки/удаления (повторы делаем сами)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        # HTTP_CASSETTE_MODE: запись трафика в кассету или ответы из неё (см. infra/http_cassette.py)
+        adapter = wrap_adapter(adapter, self.base_url, secrets=(self.api_key,))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    @staticmethod
-    def _load_api_key(path: str) -> str:
-        if not os.path.isfile(path):
-            raise FileNotFoundError(
-                f"Файл с API ключом не найден: {path}\n"
-                f"Убедитесь, что ключ сохранён в этом файле."
-            )
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+    # -------- транспорт --------
+
+    @property
+    def thread_retries(self) -> int:
+        """Сколько повторов сделал этот клиент в текущем потоке (накопительно)."""
+        return getattr(self._tls, "retries", 0)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        operation: str,
+        *,
+        timeout: Optional[tuple] = None,
+        allow_404: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Запрос к API с повторами (см. политику в docstring модуля).
+        Файлы в kwargs["files"] перематываются перед каждой попыткой.
+        allow_404 — вернуть ответ 404 вместо исключения.
+        """
+        method = method.upper()
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            for value in (kwargs.get("files") or {}).values():
+                if isinstance(value, tuple) and len(value) > 1 and hasattr(value[1], "seek"):
+                    value[1].seek(0)
+            resp = None
+            try:
+                resp = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if method not in _IDEMPOTENT or attempt >= self.max_retries:
+                    raise
+            else:
+                retryable = resp.status_code == 429 or (
+                    method in _IDEMPOTENT and resp.status_code in _RETRY_STATUSES
+                )
+                if not retryable or attempt >= self.max_retries:
+                    if not (allow_404 and resp.status_code == 404):
+                        resp.raise_for_status()
+                    return resp
+            HTTP_RETRIES.inc(operation=operation)
+            self._tls.retries = self.thread_retries + 1
+            time.sleep(retry_delay(resp, attempt))
+            attempt += 1
+
+    def paginate(
+        self, path: str, operation: str, page_size: int = CLIENT_PAGE_SIZE, **params: Any
+    ) -> Iterator[dict]:
+        """Лениво обходит список API по курсору: limit/after, пока has_more."""
+        query: Dict[str, Any] = dict(params, limit=page_size)
+        while True:
+            data = self.request("GET", path, operation, params=query).json()
+            items = data.get("data", []) or []
+            for item in items:
+                yield item
+            last_id = data.get("last_id") or (items[-1].get("id") if items else None)
+            if not data.get("has_more") or not last_id:
+                return
+            query = dict(params, limit=page_size, after=last_id)
 
     # -------- Vector Stores --------
 
-    def create_store(self, name: Optional[str] = None) -> Dict[str, Any]:
+    def create_store(
+        self,
+        name: Optional[str] = None,
+        expires_after_min: Optional[float] = STORE_EXPIRES_AFTER_MIN,
+        timeout: Optional[tuple] = None,
+    ) -> Dict[str, Any]:
         store_name = name or "vs-" + datetime.now().strftime("%Y%m%d-%H%M%S")
-        url = f"{self.base_url}/vector_stores"
-        resp = self.session.post(url, json={"name": store_name}, timeout=self.timeout)
-        resp.raise_for_status()
-        return resp.json()  # содержит id, name, и др.
+        payload: Dict[str, Any] = {"name": store_name}
+        expires_after = expiry_policy(expires_after_min)
+        if expires_after:
+            payload["expires_after"] = expires_after
+        resp = self.request("POST", "/vector_stores", "create_store", json=payload, timeout=timeout)
+        data = resp.json()  # содержит id, name, и др.
+        if data.get("id"):
+            record_created(data["id"], store_name, expires_after)
+        return data
+
+    def get_store(self, store_id: str, timeout: Optional[tuple] = None) -> Dict[str, Any]:
+        return self.request("GET", f"/vector_stores/{store_id}", "get_store", timeout=timeout).json()
+
+    def store_status(self, store_id: str, timeout: Optional[tuple] = None) -> str:
+        """Нормализованный статус хранилища: indexed / processing / failed / …"""
+        return normalize_store_status(self.get_store(store_id, timeout=timeout).get("status"))
+
+    def iter_stores(self, page_size: int = CLIENT_PAGE_SIZE) -> Iterator[dict]:
+        return self.paginate("/vector_stores", "list_stores", page_size)
 
     def list_stores(self) -> List[dict]:
-        url = f"{self.base_url}/vector_stores"
-        resp = self.session.get(url, timeout=self.timeout)
-        resp.raise_for_status()
-        return resp.json().get("data", [])
+        return list(self.iter_stores())
 
     def delete_store(self, store_id: str) -> None:
-        url = f"{self.base_url}/vector_stores/{store_id}"
-        resp = self.session.delete(url, timeout=self.timeout)
-        resp.raise_for_status()
+        """Удаляет хранилище; уже удалённое/истёкшее (404) считается удалённым."""
+        self.request("DELETE", f"/vector_stores/{store_id}", "delete_store", allow_404=True)
+        record_deleted(store_id)
 
     # -------- Files --------
 
-    def upload_file(self, path: str) -> Dict[str, Any]:
+    def upload_file(self, path: str, purpose: str = "assistants", timeout: Optional[tuple] = None) -> Dict[str, Any]:
         if not os.path.isfile(path):
             raise FileNotFoundError(f"Файл не найден: {path}")
 
-        url = f"{self.base_url}/files"
+        mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
         with open(path, "rb") as f:
-            files = {"file": (os.path.basename(path), f)}
-            data = {"purpose": "assistants"}
-            resp = self.session.post(url, files=files, data=data, timeout=self.timeout)
-        resp.raise_for_status()
+            files = {"file": (os.path.basename(path), f, mime)}
+            data = {"purpose": purpose}
+            resp = self.request("POST", "/files", "upload_file", files=files, data=data, timeout=timeout)
         return resp.json()  # содержит id и др.
 
-    def attach_file(self, store_id: str, file_id: str) -> Dict[str, Any]:
-        url = f"{self.base_url}/vector_stores/{store_id}/files"
-        resp = self.session.post(url, json={"file_id": file_id}, timeout=self.timeout)
-        resp.raise_for_status()
+    def attach_file(self, store_id: str, file_id: str, timeout: Optional[tuple] = None) -> Dict[str, Any]:
+        resp = self.request(
+            "POST", f"/vector_stores/{store_id}/files", "attach_file", json={"file_id": file_id}, timeout=timeout
+        )
         return resp.json()
 
+    def iter_files(self, store_id: str, page_size: int = CLIENT_PAGE_SIZE) -> Iterator[dict]:
+        return self.paginate(f"/vector_stores/{store_id}/files", "list_files", page_size)
+
     def list_files(self, store_id: str) -> List[dict]:
-        url = f"{self.base_url}/vector_stores/{store_id}/files"
-        resp = self.session.get(url, timeout=self.timeout)
-        resp.raise_for_status()
-        return resp.json().get("data", [])
+        return list(self.iter_files(store_id))
 
     def delete_file(self, store_id: str, file_id: str) -> None:
-        url = f"{self.base_url}/vector_stores/{store_id}/files/{file_id}"
-        resp = self.session.delete(url, timeout=self.timeout)
-        resp.raise_for_status()
+        """Отвязывает файл от хранилища (объект в /files остаётся)."""
+        self.request("DELETE", f"/vector_stores/{store_id}/files/{file_id}", "delete_file")
+
+    def iter_uploaded_files(self, purpose: Optional[str] = None, page_size: int = CLIENT_PAGE_SIZE) -> Iterator[dict]:
+        params = {"purpose": purpose} if purpose else {}
+        return self.paginate("/files", "list_uploaded_files", page_size, **params)
+
+    def delete_uploaded_file(self, file_id: str) -> None:
+        """Удаляет сам объект из /files."""
+        self.request("DELETE", f"/files/{file_id}", "delete_uploaded_file")
+
+    # -------- File batches --------
+
+    def create_file_batch(self, store_id: str, file_ids: List[str]) -> Dict[str, Any]:
+        """Привязывает несколько загруженных файлов одним запросом."""
+        resp = self.request(
+            "POST", f"/vector_stores/{store_id}/file_batches", "create_file_batch", json={"file_ids": list(file_ids)}
+        )
+        return resp.json()
+
+    def get_file_batch(self, store_id: str, batch_id: str) -> Dict[str, Any]:
+        return self.request("GET", f"/vector_stores/{store_id}/file_batches/{batch_id}", "get_file_batch").json()
+
+    def iter_file_batch_files(self, store_id: str, batch_id: str, page_size: int = CLIENT_PAGE_SIZE) -> Iterator[dict]:
+        return self.paginate(
+            f"/vector_stores/{store_id}/file_batches/{batch_id}/files", "list_file_batch_files", page_size
+        )
+
+    # -------- Responses --------
+
+    def create_response(self, payload: Dict[str, Any], timeout: Optional[tuple] = None) -> Dict[str, Any]:
+        """POST /responses. Ошибка HTTP — RuntimeError с телом ответа."""
+        try:
+            resp = self.request("POST", "/responses", "create_response", json=payload, timeout=timeout)
+        except requests.HTTPError as e:
+            r = e.response
+            try:
+                err = r.json()
+            except Exception:
+                err = r.text if r is not None else str(e)
+            raise RuntimeError(f"Responses API HTTP {r.status_code if r is not None else '?'}: {err}") from e
+        try:
+            return resp.json()
+        except Exception as e:
+            raise RuntimeError(f"Невалидный JSON от Responses API: {e}")
 
     def poll_file_status(
         self,
@@ -96,12 +290,9 @@ class VectorStoreClient:
         max_wait: float = 900.0,
     ) -> dict:
         """Ожидание индексации файла (опционально)."""
-        url = f"{self.base_url}/vector_stores/{store_id}/files/{file_id}"
         start = time.time()
         while True:
-            resp = self.session.get(url, timeout=self.timeout)
-            resp.raise_for_status()
-            data = resp.json()
+            data = self.request("GET", f"/vector_stores/{store_id}/files/{file_id}", "get_file").json()
             status = data.get("status")
             if status in ("processed", "failed"):
                 return data
@@ -109,43 +300,19 @@ class VectorStoreClient:
                 return {"status": "timeout"}
             time.sleep(interval)
 
-    def upload_and_attach_files(self, store_id: str, paths: list[str]) -> dict:
-        """
-        Загружает файлы в /files, привязывает к vector store, ждёт индексацию (необязательно),
-        и записывает в журнал: id хранилища, суммарное время и среднюю скорость.
-        Возвращает метрики для UI.
-        """
-        start = time.time()
-        file_sizes = []
-        for p in paths:
-            size = os.path.getsize(p)
-            file_sizes.append((p, size))
-
-            fmeta = self.upload_file(p)  # POST /files
-            fid = fmeta.get("id")
-            if fid:
-                self.attach_file(store_id, fid)  # POST /vector_stores/{id}/files
-
-        elapsed = time.time() - start
-        total_bytes = sum(sz for _, sz in file_sizes) or 0
-        avg_speed_kb_s = (total_bytes / 1024.0 / elapsed) if elapsed > 0 else None
-
-        # запись в журнал (если доступен модуль журнала)
-        if append_upload_entry:
-            try:
-                append_upload_entry(
-                    store_id=store_id,
-                    files=file_sizes,
-                    elapsed_sec=elapsed,
-                    avg_speed_kb_s=avg_speed_kb_s,
-                )
-            except Exception:
-                pass
 
-        return {
-            "store_id": store_id,
-            "elapsed_sec": round(elapsed, 3),
-            "avg_speed_kb_s": round(avg_speed_kb_s, 3) if avg_speed_kb_s is not None else None,
-            "total_bytes": total_bytes,
-            "files": [{"name": os.path.basename(p), "size_bytes": sz} for p, sz in file_sizes],
-        }
\ No newline at end of file
+_clients: Dict[str, VectorStoreClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: Optional[str] = None) -> VectorStoreClient:
+    """
+    Общий клиент процесса (по одному на API-ключ): все модули делят один
+    Session и пул соединений. Без api_key — см. load_api_key().
+    """
+    key = api_key or load_api_key()
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = VectorStoreClient(api_key=key)
+        return client
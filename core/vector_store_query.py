@@ -1,69 +1,56 @@
 # -*- coding: utf-8 -*-
 """
 vector_store_query.py — вызов OpenAI Responses API (assistants=v2) с file_search.
-Возвращает уже ВАЛИДИРОВАННЫЙ JSON по схеме из system.prompt (через Pydantic).
+Возвращает уже ВАЛИДИРОВАННЫЙ результат по схеме из system.prompt (через Pydantic).
 """
 
 from __future__ import annotations
 
 import os
 import json
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional
 
-import requests
 from pydantic import ValidationError
 
+from core.vector_store_client import get_client, load_api_key
 from infra.config import (
     API_KEY_PATH,
-    BASE_URL,
     DEFAULT_MODEL,
     TIMEOUT,
     SYSTEM_PROMPT_PATH,
 )
+from infra.metrics import EXTRACTIONS, RESPONSE_SECONDS, RESPONSE_TOKENS, VALIDATION_FAILURES
+from infra.tracing import span
+
+if TYPE_CHECKING:
+    from infra.models import ValidatedResult
 
 # опционально: журнал (если модуль инициализирован иначе — просто не пишем в него)
 try:
-    from infra.log_journal import append_log
+    from infra.log_journal import append_log, append_response_entry
 except Exception:
     append_log = None  # type: ignore[misc]
+    append_response_entry = None  # type: ignore[misc]
 
 
 # ============================== ВСПОМОГАТЕЛЬНОЕ ===============================
 
 def _read_api_key(path: str = API_KEY_PATH) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        key = f.read().strip()
+    key = load_api_key(path)  # OPENAI_API_KEY или файл
     if not key:
         raise RuntimeError("Пустой API-ключ в API_KEY_PATH")
     return key
 
 
-def _headers(api_key: str) -> dict:
-    return {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
-
 def _load_system_prompt(path: str = SYSTEM_PROMPT_PATH) -> str:
     with open(path, "r", encoding="utf-8") as f:
         return f.read()
 
 
 def _post_responses(payload: dict, timeout: tuple = TIMEOUT) -> dict:
-    url = f"{BASE_URL}/responses"
-    resp = requests.post(url, headers=_headers(_read_api_key()), json=payload, timeout=timeout)
-    if resp.status_code >= 300:
-        # пробуем вытащить тело с ошибкой
-        try:
-            err = resp.json()
-        except Exception:
-            err = resp.text
-        raise RuntimeError(f"Responses API HTTP {resp.status_code}: {err}")
-    try:
-        return resp.json()
-    except Exception as e:
-        raise RuntimeError(f"Невалидный JSON от Responses API: {e}")
+    """POST /responses через общий VectorStoreClient (429 повторяется; ошибки HTTP — RuntimeError)."""
+    return get_client(_read_api_key()).create_response(payload, timeout=timeout)
 
 
 def _extract_output_text(resp_json: dict) -> str:
@@ -89,6 +76,28 @@ def _extract_output_text(resp_json: dict) -> str:
     return msg
 
 
+def _log_response_usage(resp_json: dict, *, store_id: str, model: str, elapsed_sec: float) -> None:
+    """Пишет в журнал время ответа и расход токенов (usage из Responses API)."""
+    usage = resp_json.get("usage") or {}
+    for kind in ("input", "output"):
+        tokens = usage.get(f"{kind}_tokens")
+        if isinstance(tokens, (int, float)):
+            RESPONSE_TOKENS.inc(tokens, model=model, kind=kind)
+    if not append_response_entry:
+        return
+    try:
+        append_response_entry(
+            store_id=store_id,
+            model=resp_json.get("model") or model,
+            elapsed_sec=elapsed_sec,
+            input_tokens=usage.get("input_tokens"),
+            output_tokens=usage.get("output_tokens"),
+            total_tokens=usage.get("total_tokens"),
+        )
+    except Exception:
+        pass
+
+
 # ============================== ПОЛЕЗНЫЕ ЗАПРОСЫ ==============================
 
 def test_file_search_filenames(
@@ -129,14 +138,27 @@ def run_extraction_with_vector_store(
     model: str = DEFAULT_MODEL,
     system_prompt_path: str = SYSTEM_PROMPT_PATH,
     timeout: tuple = TIMEOUT,
-) -> str:
+) -> "ValidatedResult":
     """
     Основная функция: запускает извлечение по твоему system.prompt и file_search.
-    Возвращает УЖЕ ВАЛИДИРОВАННЫЙ и «очищенный» JSON-строкой (exclude_none=True).
+    Схема ответа выбирается по front-matter промпта (schema/schema_version).
+    Возвращает ValidatedResult: модель, dict и компактный JSON (exclude_none=True),
+    полученные за один разбор ответа.
     """
 
     system_prompt = _load_system_prompt(system_prompt_path)
 
+    # Модель и функция валидации живут в infra/models.py
+    from infra.models import get_validator, schema_for_prompt, validate_extraction  # локальный импорт, чтобы избежать циклов
+
+    # Схему проверяем до платного вызова: неизвестная schema@version — ошибка конфигурации
+    schema = schema_for_prompt(system_prompt_path)
+    try:
+        get_validator(schema)
+    except KeyError:
+        EXTRACTIONS.inc(schema=schema, status="schema_error")
+        raise
+
     # Соединяем инструкцию пользователя (если есть) с краткой подсказкой
     user_msg = (user_instruction or "").strip()
     if not user_msg:
@@ -156,16 +178,28 @@ def run_extraction_with_vector_store(
         ],
     }
 
-    data = _post_responses(payload, timeout)
+    started = time.perf_counter()
+    try:
+        with span("responses_call", model=model, store_id=store_id) as sp:
+            data = _post_responses(payload, timeout)
+            usage = data.get("usage") or {}
+            sp.set(input_tokens=usage.get("input_tokens"), output_tokens=usage.get("output_tokens"))
+    except Exception:
+        RESPONSE_SECONDS.observe(time.perf_counter() - started, model=model, status="error")
+        EXTRACTIONS.inc(schema="-", status="api_error")
+        raise
+    elapsed = time.perf_counter() - started
+    RESPONSE_SECONDS.observe(elapsed, model=model, status="ok")
+    _log_response_usage(data, store_id=store_id, model=model, elapsed_sec=elapsed)
     raw_text = _extract_output_text(data)
 
     # ==== ВАЛИДАЦИЯ ПО СХЕМЕ ИЗ PROMPT (через Pydantic-модели) ====
-    # Модель и функция валидации живут в infra/models.py
-    from infra.models import validate_and_dump_json  # локальный импорт, чтобы избежать циклов
-
     try:
-        clean_json = validate_and_dump_json(raw_text)
+        with span("validation", schema=schema, chars=len(raw_text or "")):
+            result = validate_extraction(raw_text, schema=schema)
     except ValidationError as e:
+        VALIDATION_FAILURES.inc(schema=schema)
+        EXTRACTIONS.inc(schema=schema, status="validation_error")
         # Пишем в журнал (если доступен) и пробрасываем дальше
         if append_log:
             try:
@@ -173,6 +207,8 @@ def run_extraction_with_vector_store(
                     {
                         "ts": __import__("datetime").datetime.now().isoformat(timespec="seconds"),
                         "phase": "validation_error",
+                        "store_id": store_id,
+                        "schema": schema,
                         "errors": e.errors(),
                         "note": "JSON от модели не соответствует схеме из system.prompt",
                     }
@@ -180,12 +216,14 @@ def run_extraction_with_vector_store(
             except Exception:
                 pass
         raise
+    EXTRACTIONS.inc(schema=schema, status="ok")
+
     # === ЗДЕСЬ ЛОГИРУЕМ УСПЕШНЫЙ ВАЛИДИРОВАННЫЙ РЕЗУЛЬТАТ ===
     try:
         from infra.log_journal import append_result_entry
-        append_result_entry(clean_json, note="validated")
+        append_result_entry(result, note="validated", store_id=store_id)
     except Exception:
         pass
 
-    # Успех: возвращаем валидированный JSON (строка)
-    return clean_json
+    # Успех: возвращаем валидированный результат
+    return result
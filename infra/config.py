@@ -11,6 +11,15 @@ PROMPTS_DIR = os.path.join(PROJECT_ROOT, "prompts")
 
 API_KEY_PATH = os.path.join("C:\\", "API_keys", "API_key_GPT.txt")
 SYSTEM_PROMPT_PATH = os.path.join(PROMPTS_DIR, "tender_extractor_system.prompt.md")
+CONTRACT_PROMPT_PATH = os.path.join(PROMPTS_DIR, "contract_extractor_system.prompt.md")
+PRICE_REQUEST_PROMPT_PATH = os.path.join(PROMPTS_DIR, "price_request_extractor_system.prompt.md")
+
+# Тип документа -> system prompt (схема ответа объявлена во front-matter промпта)
+DOCUMENT_PROMPTS = {
+    "tender": SYSTEM_PROMPT_PATH,
+    "contract": CONTRACT_PROMPT_PATH,
+    "price_request": PRICE_REQUEST_PROMPT_PATH,
+}
 
 # === OpenAI API ===
 BASE_URL = "https://api.openai.com/v1"
@@ -44,3 +53,83 @@ os.makedirs(EXTRACTION_RESULTS_DIR, exist_ok=True)
 # === Окно журнала ===
 JOURNAL_WINDOW_SIZE = "900x560"
 JOURNAL_MAX_RECORDS = 1000
+
+# === Ротация журнала ===
+JOURNAL_ROTATE_MAX_BYTES = 20 * 1024 * 1024   # закрыть сегмент при превышении размера (0 — не ротировать по размеру)
+JOURNAL_ROTATE_DAILY = True                    # закрыть сегмент при смене дня
+JOURNAL_RETENTION_SEGMENTS = 60                # сколько сжатых сегментов хранить (0 — без ограничения)
+JOURNAL_RETENTION_DAYS = 90                    # удалять сегменты старше N дней (0 — без ограничения)
+
+# === Фоновая запись журнала (group commit) ===
+JOURNAL_ASYNC = True                # писать через фоновый поток; False — синхронно в вызывающем потоке
+JOURNAL_FLUSH_INTERVAL_SEC = 0.5    # сколько ждать накопления пачки перед записью
+JOURNAL_MAX_BATCH = 500             # максимум записей в одной пачке
+JOURNAL_QUEUE_MAX = 10000           # размер очереди; при переполнении вызывающий поток ждёт
+JOURNAL_FSYNC = "never"             # "never" — полагаться на ОС, "batch" — fsync после каждой пачки
+
+# === Бэкенд журнала ===
+# "jsonl" — только JSONL-файл, "sqlite" — только индексированная база, "both" — оба
+JOURNAL_BACKEND = "jsonl"
+JOURNAL_DB_PATH = os.path.join(EXTRACTION_RESULTS_DIR, "logs", "vector_store_journal.sqlite3")
+
+# === Метрики (Prometheus) ===
+METRICS_NAMESPACE = "aidataextractor"   # префикс имён метрик
+METRICS_PORT = None                      # порт HTTP-эндпоинта /metrics (None — не поднимать)
+METRICS_HOST = "127.0.0.1"               # адрес эндпоинта /metrics (0.0.0.0 — доступ из сети)
+METRICS_TEXTFILE_PATH = None             # путь *.prom для node_exporter textfile collector (None — не писать)
+METRICS_TEXTFILE_INTERVAL_SEC = 15       # как часто переписывать textfile
+
+# === Трассировка этапов ===
+TRACE_EXPORT_DIR = None     # папка для Chrome trace JSON каждого запуска (None — не сохранять)
+TRACE_KEEP_RECENT = 20      # сколько последних трасс держать в памяти
+
+# === HTTP-клиент API (core/vector_store_client.py) ===
+CLIENT_POOL_SIZE = 16       # соединений в пуле на клиент (>= числа параллельных загрузок/удалений)
+CLIENT_MAX_RETRIES = 5      # повторов при 429/5xx (с учётом Retry-After)
+CLIENT_PAGE_SIZE = 100      # размер страницы списков (/vector_stores, /files, file_batches)
+
+# === Очистка Vector Stores ===
+CLEANUP_WORKERS = 8         # параллельных удалений
+
+# === Планировщик отложенной очистки ===
+CLEANUP_QUEUE_PATH = os.path.join(EXTRACTION_RESULTS_DIR, "cleanup_queue.json")  # очередь переживает перезапуск
+CLEANUP_SCHEDULER_WORKERS = 4   # сколько удалений выполнять одновременно
+CLEANUP_MAX_ATTEMPTS = 3        # попыток на задание
+CLEANUP_RETRY_DELAY_MIN = 5     # пауза перед повтором неудачной очистки
+GC_FILES_MIN_AGE_MIN = 60   # GC /files: не трогать объекты моложе N минут (могут ещё привязываться)
+GC_FILES_PURPOSE = "assistants"
+
+# === Срок жизни хранилищ и реестр ===
+STORE_EXPIRES_AFTER_MIN = AUTO_DELETE_DEFAULT_MIN   # серверный срок жизни после последней активности (0 — не задавать)
+STORE_REGISTRY_PATH = os.path.join(EXTRACTION_RESULTS_DIR, "store_registry.jsonl")  # хранилища, созданные нами
+STORE_RECONCILE_GRACE_MIN = 60   # запас сверх AUTO_DELETE_DEFAULT_MIN, после которого хранилище считается «утёкшим»
+
+# === Пакетный режим (cli.py batch) ===
+BATCH_JOBS = 4   # тендеров одновременно (каждый держит свои загрузки; не больше CLIENT_POOL_SIZE)
+
+# === Горячая папка (cli.py watch) ===
+HOTFOLDER_POLL_SEC = 5          # как часто сканировать входящую папку
+HOTFOLDER_SETTLE_SEC = 60       # пакет готов, если не менялся столько секунд (0 — только по маркеру)
+HOTFOLDER_MARKER = "READY"      # файл-маркер: пакет готов сразу (сам маркер не загружается)
+HOTFOLDER_JOBS = 4              # пакетов в обработке одновременно
+HOTFOLDER_QUEUE_SIZE = 8        # очередь готовых пакетов; при заполнении новые ждут во входящей папке
+
+# === HTTP API заданий (cli.py serve) ===
+JOB_API_HOST = "127.0.0.1"      # адрес прослушивания (0.0.0.0 — доступ из сети)
+JOB_API_PORT = 8765
+JOB_API_JOBS = 4                # заданий в обработке одновременно
+JOB_API_QUEUE_SIZE = 500        # заданий в очереди; при заполнении POST /jobs отвечает 503
+JOB_API_MAX_BODY_MB = 200       # предельный размер запроса с файлами
+JOB_API_KEEP_FINISHED = 1000    # сколько завершённых заданий держать в памяти (старые удаляются вместе с файлами)
+JOB_API_SPOOL_DIR = os.path.join(EXTRACTION_RESULTS_DIR, "api_jobs")   # загруженные файлы и result.json заданий
+JOB_API_PATH_ROOTS = []         # папки, из которых можно передавать пути на сервере (пусто — пути запрещены)
+
+# === Сохранение результатов (--save-dir, infra/result_sink.py) ===
+RESULT_SINK = "jsonl"             # "jsonl" — дописывать в общий JSONL, "files" — отдельный JSON на результат
+RESULT_SINK_PARTITION = "daily"   # "daily" — results-YYYYmmdd.jsonl, None — один results.jsonl
+RESULT_SINK_GZIP = False          # сжимать каждую запись отдельным gzip-блоком (файл читается zcat/gzip.open)
+
+# === Запись / воспроизведение HTTP (infra/http_cassette.py) ===
+HTTP_CASSETTE_MODE = None       # "record" — писать трафик клиента в кассету, "replay" — отвечать из неё без сети
+HTTP_CASSETTE_PATH = os.path.join(EXTRACTION_RESULTS_DIR, "http_cassette.jsonl")
+HTTP_CASSETTE_TIME_SCALE = 1.0  # при воспроизведении: длительность ответа × N (0 — без задержек)
@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+"""
+infra/http_cassette.py — запись и воспроизведение HTTP-трафика общего клиента.
+
+Режим задаётся HTTP_CASSETTE_MODE (переменная окружения важнее config):
+
+  * "record" — каждый запрос VectorStoreClient проходит к API как обычно,
+    а в кассету (JSONL, HTTP_CASSETTE_PATH) дописывается взаимодействие:
+    метод, путь относительно base_url, отпечаток тела запроса, статус,
+    заголовки и тело ответа, момент начала и длительность. Секреты
+    вычищаются: Authorization, Cookie, OpenAI-Organization/Project, ключи
+    вида sk-… в телах. Содержимое загружаемых файлов не пишется — только
+    имена и размер;
+  * "replay" — сеть не используется: ответы берутся из кассеты, каждый
+    отдаётся через исходную длительность × HTTP_CASSETTE_TIME_SCALE
+    (1 — как было, 0.5 — вдвое быстрее, 0 — сразу). Сетевые ошибки и 429/5xx
+    воспроизводятся так же, как были записаны.
+
+Сопоставление при воспроизведении: сначала (метод, путь, отпечаток тела),
+затем (метод, путь) — в порядке записи. Идентификаторы (vs_…, file-…) в
+ответах — записанные, поэтому последующие запросы попадают в те же пути.
+Когда записи для запроса кончились, повторяется последняя (опрос статуса
+может сделать больше итераций, чем при записи); запрос, которого нет в
+кассете, — CassetteMiss.
+
+Так вчерашний медленный пакет прогоняется офлайн с другим --jobs:
+
+    HTTP_CASSETTE_MODE=record HTTP_CASSETTE_PATH=night.jsonl python cli.py batch m.jsonl -o out.jsonl
+    HTTP_CASSETTE_MODE=replay HTTP_CASSETTE_PATH=night.jsonl OPENAI_API_KEY=replay \\
+        python cli.py batch m.jsonl -o replay.jsonl --jobs 8 --summary s.json
+    python -m infra.http_cassette night.jsonl      # сводка по кассете
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from infra.config import HTTP_CASSETTE_MODE, HTTP_CASSETTE_PATH, HTTP_CASSETTE_TIME_SCALE
+from infra.journal_stats import LogHistogram
+
+CASSETTE_VERSION = 1
+SCRUBBED = "[scrubbed]"
+_SECRET_HEADERS = {"authorization", "proxy-authorization", "cookie", "set-cookie",
+                   "openai-organization", "openai-project", "api-key", "x-api-key"}
+# тело уже распаковано requests — эти заголовки при воспроизведении только мешают
+_DROP_HEADERS = {"content-encoding", "transfer-encoding", "connection", "keep-alive"}
+_SECRET_RE = re.compile(r"sk-[A-Za-z0-9_\-]{8,}")
+_ID_RE = re.compile(r"^(vs|vsfb|file|resp|batch|msg)[-_][A-Za-z0-9_\-]+$")
+_FILENAME_RE = re.compile(rb'filename="([^"]*)"')
+_ERRORS = {
+    "ConnectTimeout": requests.ConnectTimeout,
+    "ReadTimeout": requests.ReadTimeout,
+    "Timeout": requests.Timeout,
+    "ConnectionError": requests.ConnectionError,
+}
+
+
+class CassetteMiss(requests.RequestException):
+    """В кассете нет ответа на запрос (воспроизведение)."""
+
+
+def cassette_settings() -> Tuple[Optional[str], str, float]:
+    """(режим, путь, масштаб времени): переменные окружения, иначе config."""
+    mode = (os.environ.get("HTTP_CASSETTE_MODE") or HTTP_CASSETTE_MODE or "").strip().lower() or None
+    if mode not in (None, "off", "record", "replay"):
+        raise ValueError(f"HTTP_CASSETTE_MODE: ожидается record / replay / off, получено {mode!r}")
+    path = os.environ.get("HTTP_CASSETTE_PATH") or HTTP_CASSETTE_PATH
+    scale = float(os.environ.get("HTTP_CASSETTE_TIME_SCALE") or HTTP_CASSETTE_TIME_SCALE)
+    return (None if mode == "off" else mode), path, scale
+
+
+# ============================== ОЧИСТКА И КЛЮЧИ ==============================
+
+def scrub_text(text: str, secrets: Tuple[str, ...] = ()) -> str:
+    for secret in secrets:
+        if secret:
+            text = text.replace(secret, SCRUBBED)
+    return _SECRET_RE.sub(SCRUBBED, text)
+
+
+def scrub_headers(headers, secrets: Tuple[str, ...] = ()) -> Dict[str, str]:
+    out = {}
+    for name, value in headers.items():
+        low = name.lower()
+        if low in _DROP_HEADERS:
+            continue
+        out[low] = SCRUBBED if low in _SECRET_HEADERS else scrub_text(str(value), secrets)
+    return out
+
+
+def body_fingerprint(body: Any, content_type: str) -> Tuple[Optional[str], int, List[str]]:
+    """
+    (отпечаток, размер, имена файлов) тела запроса. Для multipart отпечаток —
+    по именам файлов (граница случайная), для JSON — по каноничному JSON.
+    """
+    if body is None:
+        return None, 0, []
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, (bytes, bytearray)):
+        return None, 0, []  # потоковое тело (генератор/файл): отпечатка нет
+    names: List[str] = []
+    if content_type.startswith("multipart/"):
+        names = [m.decode("utf-8", "replace") for m in _FILENAME_RE.findall(body)]
+        digest_src = "\n".join(names).encode("utf-8")
+    elif "json" in content_type:
+        try:
+            digest_src = json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode("utf-8")
+        except ValueError:
+            digest_src = bytes(body)
+    else:
+        digest_src = bytes(body)
+    return hashlib.sha256(digest_src).hexdigest()[:16], len(body), names
+
+
+def operation_label(method: str, path: str) -> str:
+    """«GET /vector_stores/{id}/files» — путь без идентификаторов и query."""
+    parts = [("{id}" if _ID_RE.match(p) else p) for p in path.split("?", 1)[0].split("/")]
+    return f"{method} {'/'.join(parts)}"
+
+
+def _relative_path(url: str, base_path: str) -> str:
+    parts = urlsplit(url)
+    path = parts.path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):] or "/"
+    return path + (f"?{parts.query}" if parts.query else "")
+
+
+# ============================== ЗАПИСЬ ==============================
+
+class CassetteRecorder:
+    """Потокобезопасная запись взаимодействий в JSONL (дописывание, сессия начинается заголовком)."""
+
+    def __init__(self, path: str, base_url: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._t0 = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._fp = open(path, "a", encoding="utf-8")
+        self._write({
+            "cassette": CASSETTE_VERSION,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "base_url": scrub_text(base_url),
+        })
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fp.flush()
+
+    def now(self) -> float:
+        return time.monotonic() - self._t0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._seq += 1
+            record["seq"] = self._seq
+            self._write(record)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fp.closed:
+                self._fp.close()
+
+
+class RecordingAdapter(BaseAdapter):
+    """Обёртка над HTTPAdapter: запрос уходит в сеть, взаимодействие пишется в кассету."""
+
+    def __init__(self, inner: BaseAdapter, recorder: CassetteRecorder, base_url: str, secrets: Tuple[str, ...] = ()):
+        super().__init__()
+        self.inner = inner
+        self.recorder = recorder
+        self.base_path = urlsplit(base_url).path.rstrip("/")
+        self.secrets = secrets
+
+    def send(self, request, **kwargs):
+        content_type = request.headers.get("Content-Type", "") or ""
+        fingerprint, size, names = body_fingerprint(request.body, content_type)
+        path = _relative_path(request.url, self.base_path)
+        record: Dict[str, Any] = {
+            "t": round(self.recorder.now(), 4),
+            "thread": threading.current_thread().name,
+            "request": {
+                "method": request.method,
+                "path": scrub_text(path, self.secrets),
+                "headers": scrub_headers(request.headers, self.secrets),
+                "body_sha256": fingerprint,
+                "body_bytes": size,
+                **({"files": names} if names else {}),
+            },
+        }
+        started = time.perf_counter()
+        try:
+            resp = self.inner.send(request, **kwargs)
+            content = resp.content  # тело читаем здесь, чтобы длительность включала передачу
+        except requests.RequestException as exc:
+            record["elapsed"] = round(time.perf_counter() - started, 4)
+            record["error"] = {"type": type(exc).__name__, "message": scrub_text(str(exc), self.secrets)[:500]}
+            self.recorder.add(record)
+            raise
+        record["elapsed"] = round(time.perf_counter() - started, 4)
+        try:
+            body: Dict[str, Any] = {"text": scrub_text(content.decode("utf-8"), self.secrets)}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+        record["response"] = {
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": scrub_headers(resp.headers, self.secrets),
+            **body,
+        }
+        self.recorder.add(record)
+        return resp
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+# ============================== ВОСПРОИЗВЕДЕНИЕ ==============================
+
+def load_cassette(path: str) -> List[Dict[str, Any]]:
+    """Взаимодействия кассеты (все сессии подряд, заголовки сессий пропускаются)."""
+    interactions = []
+    with open(path, "r", encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # недописанная последняя строка (процесс упал при записи)
+            if "request" in record:
+                interactions.append(record)
+    return interactions
+
+
+class CassettePlayer:
+    """Очереди записанных ответов по (метод, путь, отпечаток) и (метод, путь)."""
+
+    def __init__(self, interactions: List[Dict[str, Any]], time_scale: float = 1.0):
+        self.interactions = interactions
+        self.time_scale = max(0.0, time_scale)
+        self._lock = threading.Lock()
+        self._used = [False] * len(interactions)
+        self._exact: Dict[tuple, Deque[int]] = defaultdict(deque)
+        self._loose: Dict[tuple, Deque[int]] = defaultdict(deque)
+        self._last: Dict[tuple, int] = {}
+        self.served = 0
+        self.repeated = 0
+        self.misses = 0
+        for i, item in enumerate(interactions):
+            req = item["request"]
+            loose = (req["method"], req["path"])
+            self._exact[loose + (req.get("body_sha256"),)].append(i)
+            self._loose[loose].append(i)
+
+    def _pop(self, queue: Deque[int]) -> Optional[int]:
+        while queue:
+            i = queue.popleft()
+            if not self._used[i]:
+                self._used[i] = True
+                return i
+        return None
+
+    def match(self, method: str, path: str, fingerprint: Optional[str]) -> Dict[str, Any]:
+        loose = (method, path)
+        with self._lock:
+            i = self._pop(self._exact.get(loose + (fingerprint,), deque()))
+            if i is None:
+                i = self._pop(self._loose.get(loose, deque()))
+            if i is None:
+                i = self._last.get(loose)
+                if i is None:
+                    self.misses += 1
+                    raise CassetteMiss(f"нет записи в кассете: {method} {path}")
+                self.repeated += 1
+            self._last[loose] = i
+            self.served += 1
+            return self.interactions[i]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "interactions": len(self.interactions),
+                "served": self.served,
+                "repeated": self.repeated,
+                "misses": self.misses,
+                "unused": self._used.count(False),
+            }
+
+
+class ReplayAdapter(BaseAdapter):
+    """Отдаёт ответы из кассеты с исходной (масштабированной) задержкой; в сеть не ходит."""
+
+    def __init__(self, player: CassettePlayer, base_url: str):
+        super().__init__()
+        self.player = player
+        self.base_path = urlsplit(base_url).path.rstrip("/")
+
+    def send(self, request, **kwargs):
+        content_type = request.headers.get("Content-Type", "") or ""
+        fingerprint = body_fingerprint(request.body, content_type)[0]
+        item = self.player.match(request.method, _relative_path(request.url, self.base_path), fingerprint)
+        delay = float(item.get("elapsed") or 0.0) * self.player.time_scale
+        if delay > 0:
+            time.sleep(delay)
+        error = item.get("error")
+        if error:
+            raise _ERRORS.get(error.get("type"), requests.ConnectionError)(error.get("message"), request=request)
+
+        data = item["response"]
+        resp = requests.Response()
+        resp.status_code = int(data["status"])
+        resp.reason = data.get("reason")
+        resp.headers = CaseInsensitiveDict(data.get("headers") or {})
+        if "base64" in data:
+            resp._content = base64.b64decode(data["base64"])
+        else:
+            resp._content = (data.get("text") or "").encode("utf-8")
+        resp._content_consumed = True
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+# ============================== ПОДКЛЮЧЕНИЕ ==============================
+
+_recorders: Dict[str, CassetteRecorder] = {}
+_players: Dict[str, CassettePlayer] = {}
+_open_lock = threading.Lock()
+
+
+def wrap_adapter(adapter: BaseAdapter, base_url: str, secrets: Tuple[str, ...] = ()) -> BaseAdapter:
+    """
+    Адаптер для Session с учётом HTTP_CASSETTE_MODE: без режима — adapter как
+    есть. Кассета одна на процесс и путь: все клиенты пишут/читают её вместе.
+    """
+    mode, path, scale = cassette_settings()
+    if mode is None:
+        return adapter
+    key = os.path.abspath(path)
+    with _open_lock:
+        if mode == "record":
+            recorder = _recorders.get(key)
+            if recorder is None:
+                recorder = _recorders[key] = CassetteRecorder(path, base_url)
+            return RecordingAdapter(adapter, recorder, base_url, secrets)
+        player = _players.get(key)
+        if player is None:
+            player = _players[key] = CassettePlayer(load_cassette(path), scale)
+        return ReplayAdapter(player, base_url)
+
+
+def replay_stats() -> Dict[str, Dict[str, int]]:
+    """Счётчики воспроизведения по открытым кассетам (обслужено, повторов, промахов)."""
+    with _open_lock:
+        return {path: player.stats() for path, player in _players.items()}
+
+
+# ============================== СВОДКА ==============================
+
+def summarize(interactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Запросы, ошибки, длительности по операциям и пиковая параллельность записи."""
+    ops: Dict[str, LogHistogram] = defaultdict(LogHistogram)
+    statuses: Dict[str, int] = defaultdict(int)
+    edges = []
+    for item in interactions:
+        req = item["request"]
+        elapsed = float(item.get("elapsed") or 0.0)
+        ops[operation_label(req["method"], req["path"])].add(elapsed)
+        if item.get("error"):
+            statuses[item["error"].get("type", "error")] += 1
+        else:
+            statuses[str(item["response"]["status"])] += 1
+        start = float(item.get("t") or 0.0)
+        edges += [(start, 1), (start + elapsed, -1)]
+    in_flight = peak = 0
+    for _, delta in sorted(edges, key=lambda e: (e[0], e[1])):
+        in_flight += delta
+        peak = max(peak, in_flight)
+    span_sec = max((t for t, _ in edges), default=0.0) - min((t for t, _ in edges), default=0.0)
+    return {
+        "requests": len(interactions),
+        "span_sec": round(span_sec, 3),
+        "peak_in_flight": peak,
+        "statuses": dict(sorted(statuses.items())),
+        "operations": {
+            name: {
+                "count": h.count,
+                "total_sec": round(h.total, 3),
+                "p50": round(h.quantile(0.5), 4),
+                "p95": round(h.quantile(0.95), 4),
+                "max": round(h.max, 4),
+            }
+            for name, h in sorted(ops.items(), key=lambda kv: -kv[1].total)
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m infra.http_cassette", description="Сводка по HTTP-кассете.")
+    parser.add_argument("path", help="Файл кассеты (HTTP_CASSETTE_PATH).")
+    parser.add_argument("--json", action="store_true", help="Вывести сводку как JSON.")
+    args = parser.parse_args(argv)
+
+    summary = summarize(load_cassette(args.path))
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+    print(f"запросов: {summary['requests']}, интервал: {summary['span_sec']} с, "
+          f"пик параллельных: {summary['peak_in_flight']}, статусы: {summary['statuses']}")
+    for name, st in summary["operations"].items():
+        print(f"  {name:<45} n={st['count']:<5} сумма {st['total_sec']:<9} p50 {st['p50']:<8} "
+              f"p95 {st['p95']:<8} max {st['max']}")
+
+
+__all__ = [
+    "CassetteMiss",
+    "CassetteRecorder",
+    "CassettePlayer",
+    "RecordingAdapter",
+    "ReplayAdapter",
+    "cassette_settings",
+    "load_cassette",
+    "wrap_adapter",
+    "replay_stats",
+    "summarize",
+]
+
+
+if __name__ == "__main__":
+    main()
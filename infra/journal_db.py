@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+infra/journal_db.py — опциональный SQLite-бэкенд журнала.
+
+Каждая запись журнала хранится целиком (JSON) плюс индексируемые колонки:
+ts, phase, store_id, model, elapsed_sec, total_tokens. Это позволяет
+отвечать на вопросы вида «все запуски по store X» или «ответы дольше 60 с
+за прошлую неделю» без сканирования всего JSONL.
+
+База работает в режиме WAL (писатель не блокирует читателей), соединения —
+по одному на поток. digest записи — хэш её JSON-строки и номер повтора
+(«<sha1>:<n>», n — сколько таких уже в базе + 1): две одинаковые записи
+(ts — с точностью до секунды) хранятся обе, и при записи вживую, и при
+импорте. Импорт помнит, сколько строк каждого файла уже перенесено (таблица
+imports, файл узнаётся по первой строке и её номеру среди первых строк
+файлов импорта — переименование и сжатие сегмента его не меняют), поэтому повторный запуск добавляет только новые строки.
+
+Версия схемы хранится в PRAGMA user_version: миграции выполняются один раз
+на базу, а не при каждом открытии.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts            TEXT,
+    phase         TEXT,
+    store_id      TEXT,
+    model         TEXT,
+    elapsed_sec   REAL,
+    total_tokens  INTEGER,
+    digest        TEXT UNIQUE,
+    record        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_journal_ts ON journal(ts);
+CREATE INDEX IF NOT EXISTS ix_journal_phase_ts ON journal(phase, ts);
+CREATE INDEX IF NOT EXISTS ix_journal_store ON journal(store_id, ts);
+CREATE INDEX IF NOT EXISTS ix_journal_model ON journal(model, ts);
+CREATE INDEX IF NOT EXISTS ix_journal_elapsed ON journal(elapsed_sec);
+CREATE INDEX IF NOT EXISTS ix_journal_tokens ON journal(total_tokens);
+CREATE TABLE IF NOT EXISTS imports (
+    head   TEXT PRIMARY KEY,
+    lines  INTEGER NOT NULL
+);
+"""
+_SCHEMA_VERSION = 1
+
+_COLUMNS = "(ts, phase, store_id, model, elapsed_sec, total_tokens, digest, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT = f"INSERT INTO journal {_COLUMNS}"
+_SAVE_IMPORT = "INSERT INTO imports (head, lines) VALUES (?, ?) ON CONFLICT(head) DO UPDATE SET lines = excluded.lines"
+# digest до появления номера повтора — первый (и единственный) экземпляр
+_MIGRATE_DIGESTS = "UPDATE journal SET digest = digest || ':1' WHERE digest IS NOT NULL AND instr(digest, ':') = 0"
+
+Row = Tuple[Any, Any, Any, Any, Any, Any, str, str]
+
+
+def section_value(record: Dict[str, Any], key: str) -> Any:
+    """Ищет key на верхнем уровне или в секциях upload/response/index записи."""
+    if record.get(key) is not None:
+        return record.get(key)
+    for section in ("response", "upload", "index"):
+        sub = record.get(section)
+        if isinstance(sub, dict) and sub.get(key) is not None:
+            return sub.get(key)
+    return None
+
+
+def record_columns(record: Dict[str, Any], line: str) -> Row:
+    """
+    Индексируемые колонки записи; line — её JSON-строка (хранится как есть).
+    digest здесь — хэш строки без номера повтора; номер добавляет insert_rows/import_jsonl.
+    """
+    elapsed = section_value(record, "elapsed_sec")
+    tokens = section_value(record, "total_tokens")
+    digest = hashlib.sha1(line.strip().encode("utf-8")).hexdigest()
+    return (
+        record.get("ts"),
+        record.get("phase"),
+        record.get("store_id"),
+        record.get("model"),
+        float(elapsed) if isinstance(elapsed, (int, float)) else None,
+        int(tokens) if isinstance(tokens, (int, float)) else None,
+        digest,
+        line.strip(),
+    )
+
+
+class JournalDB:
+    """Индексированный журнал в SQLite (WAL, соединение на поток)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Схема и нумерация старых digest — один раз на базу."""
+        conn.executescript(_SCHEMA)
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                conn.execute(_MIGRATE_DIGESTS)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -------- запись --------
+
+    def insert_rows(self, rows: Sequence[Row]) -> int:
+        """
+        Вставляет пачку строк одной транзакцией; возвращает число записей.
+        Одинаковые записи не схлопываются: digest получает номер повтора
+        (сколько таких уже в базе + 1). BEGIN IMMEDIATE — чтобы параллельные
+        писатели не выдали один номер дважды.
+        """
+        if not rows:
+            return 0
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return self._insert_numbered(conn, rows)
+
+    @staticmethod
+    def _insert_numbered(conn: sqlite3.Connection, rows: Sequence[Row]) -> int:
+        """Нумерует digest от числа таких же в базе и вставляет (внутри открытой транзакции)."""
+        seen: Dict[str, int] = {}
+        numbered = []
+        for row in rows:
+            base = row[6]
+            if base not in seen:
+                seen[base] = conn.execute(
+                    "SELECT COUNT(*) FROM journal WHERE digest > ? AND digest < ?", (base + ":", base + ";")
+                ).fetchone()[0]
+            seen[base] += 1
+            numbered.append(row[:6] + (f"{base}:{seen[base]}",) + row[7:])
+        conn.executemany(_INSERT, numbered)
+        return len(numbered)
+
+    def _import_batch(self, rows: Sequence[Row], head: str, lines: int) -> int:
+        """Пачка строк файла и его прогресс (lines) — одной транзакцией."""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            n = self._insert_numbered(conn, rows) if rows else 0
+            conn.execute(_SAVE_IMPORT, (head, lines))
+        return n
+
+    def insert(self, record: Dict[str, Any]) -> int:
+        line = json.dumps(record, ensure_ascii=False)
+        return self.insert_rows([record_columns(record, line)])
+
+    def import_jsonl(self, paths: Iterable[str], batch_size: int = 2000) -> Dict[str, int]:
+        """
+        Импорт существующих JSONL-журналов (в т.ч. .jsonl.gz сегментов).
+        Одинаковые записи — в разных файлах или уже в базе — сохраняются все:
+        номер повтора считается от базы, как в insert_rows. Строки, перенесённые
+        прошлым запуском, пропускаются (skipped); строки, записанные вживую при
+        JOURNAL_BACKEND = "both", от одинаковых записей не отличить — импорт
+        рассчитан на журналы, которые велись до включения SQLite.
+        """
+        stats = {"files": 0, "lines": 0, "imported": 0, "skipped": 0}
+        conn = self._conn()
+        heads: Dict[str, int] = {}  # файлы с одинаковой первой строкой различаются по порядку
+        for path in paths:
+            opener = gzip.open if path.endswith(".gz") else open
+            stats["files"] += 1
+            batch: List[Row] = []
+            head: Optional[str] = None
+            done = 0  # строк этого файла, перенесённых раньше
+            n = 0
+            with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    stats["lines"] += 1
+                    n += 1
+                    if head is None:
+                        head = hashlib.sha1(line.strip().encode("utf-8")).hexdigest()
+                        heads[head] = heads.get(head, 0) + 1
+                        head = f"{head}:{heads[head]}"
+                        saved = conn.execute("SELECT lines FROM imports WHERE head = ?", (head,)).fetchone()
+                        done = saved[0] if saved else 0
+                    if n <= done:
+                        stats["skipped"] += 1
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        stats["skipped"] += 1
+                        continue
+                    if not isinstance(record, dict):
+                        stats["skipped"] += 1
+                        continue
+                    batch.append(record_columns(record, line))
+                    if len(batch) >= batch_size:
+                        stats["imported"] += self._import_batch(batch, head, n)
+                        batch = []
+            if head is not None and n > done:
+                stats["imported"] += self._import_batch(batch, head, n)
+        return stats
+
+    # -------- чтение --------
+
+    def query(
+        self,
+        *,
+        phase: Optional[str] = None,
+        store_id: Optional[str] = None,
+        model: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_elapsed: Optional[float] = None,
+        max_elapsed: Optional[float] = None,
+        limit: int = 100,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Записи по фильтрам. since/until — ISO-время (сравнение строк, как в ts).
+        Страница берётся от самых новых (offset/limit), а возвращается
+        в хронологическом порядке, если не задано newest_first.
+        """
+        where, args = _where(phase, store_id, model, since, until, min_elapsed, max_elapsed)
+        sql = f"SELECT record FROM journal{where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?"
+        rows = self._conn().execute(sql, (*args, int(limit), int(offset))).fetchall()
+        out = []
+        for (text,) in rows:
+            try:
+                out.append(json.loads(text))
+            except ValueError:
+                continue
+        if not newest_first:
+            out.reverse()
+        return out
+
+    def iter_records(
+        self, *, since: Optional[str] = None, until: Optional[str] = None, batch_size: int = 2000
+    ) -> Iterator[Dict[str, Any]]:
+        """Записи интервала в хронологическом порядке, курсором — без загрузки всей выборки."""
+        where, args = _where(None, None, None, since, until, None, None)
+        cur = self._conn().execute(f"SELECT record FROM journal{where} ORDER BY ts, id", args)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            for (text,) in rows:
+                try:
+                    yield json.loads(text)
+                except ValueError:
+                    continue
+
+    def count(self, **filters: Any) -> int:
+        where, args = _where(
+            filters.get("phase"), filters.get("store_id"), filters.get("model"),
+            filters.get("since"), filters.get("until"),
+            filters.get("min_elapsed"), filters.get("max_elapsed"),
+        )
+        return int(self._conn().execute(f"SELECT COUNT(*) FROM journal{where}", args).fetchone()[0])
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _where(phase, store_id, model, since, until, min_elapsed, max_elapsed) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    args: List[Any] = []
+    for column, value in (("phase", phase), ("store_id", store_id), ("model", model)):
+        if value:
+            clauses.append(f"{column} = ?")
+            args.append(value)
+    if since:
+        clauses.append("ts >= ?")
+        args.append(since)
+    if until:
+        clauses.append("ts < ?")
+        args.append(until)
+    if min_elapsed is not None:
+        clauses.append("elapsed_sec >= ?")
+        args.append(float(min_elapsed))
+    if max_elapsed is not None:
+        clauses.append("elapsed_sec <= ?")
+        args.append(float(max_elapsed))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+
+__all__ = ["JournalDB", "record_columns", "section_value"]
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+infra/journal_stats.py — сводная аналитика по журналу.
+
+Один потоковый проход по записям (iter_records) с постоянной памятью:
+вместо хранения всех значений латентность копится в логарифмических
+гистограммах (относительная погрешность перцентиля ~1%), суммы и счётчики —
+в агрегатах группы. Отчёт: p50/p90/p99 загрузки (всей пачки и по файлам),
+привязки, индексации и ответа, скорость загрузки (MB/s), токены на извлечение, стоимость по моделям
+(PRICE_TABLE) и доля ошибок валидации.
+
+Используется командой `cli.py stats`.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from infra.log_journal import _estimate_cost_usd, iter_records
+
+GROUP_BY_CHOICES = ("none", "model", "day", "hour", "phase")
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+# ============================== ГИСТОГРАММА ==============================
+
+class LogHistogram:
+    """
+    Гистограмма с логарифмическими корзинами: значение v попадает в корзину
+    floor(log(v) / log(1 + precision)). Число корзин зависит только от
+    диапазона значений, а не от их количества.
+    """
+
+    __slots__ = ("_log_base", "_buckets", "_zeros", "count", "total", "min", "max")
+
+    def __init__(self, precision: float = 0.02):
+        self._log_base = math.log1p(precision)
+        self._buckets: Dict[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        if value < 0 or math.isnan(value):
+            return
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value == 0:
+            self._zeros += 1
+            return
+        idx = math.floor(math.log(value) / self._log_base)
+        self._buckets[idx] = self._buckets.get(idx, 0) + 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for idx in sorted(self._buckets):
+            seen += self._buckets[idx]
+            if rank < seen:
+                # середина корзины (геометрическая), зажатая в [min, max]
+                value = math.exp((idx + 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, digits: int = 3) -> Optional[Dict[str, Any]]:
+        if not self.count:
+            return None
+        out: Dict[str, Any] = {"count": self.count, "mean": round(self.total / self.count, digits)}
+        for q in _QUANTILES:
+            out[f"p{int(q * 100)}"] = round(self.quantile(q), digits)
+        out["max"] = round(self.max, digits)
+        return out
+
+
+# ============================== АГРЕГАТЫ ==============================
+
+class _GroupStats:
+    """Агрегаты одной группы отчёта."""
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.upload_latency = LogHistogram()
+        self.index_latency = LogHistogram()
+        self.response_latency = LogHistogram()
+        self.upload_mb_s = LogHistogram()
+        self.file_upload_latency = LogHistogram()
+        self.file_attach_latency = LogHistogram()
+        self.file_mb_s = LogHistogram()
+        self.file_retries = 0
+        self.tokens = LogHistogram()
+        self.upload_bytes = 0
+        self.upload_elapsed = 0.0
+        self.index_outcomes: Dict[str, int] = {}
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.results = 0
+        self.validation_errors = 0
+
+    def _model(self, name: str) -> Dict[str, Any]:
+        m = self.models.get(name)
+        if m is None:
+            m = self.models[name] = {
+                "responses": 0, "input_tokens": 0, "output_tokens": 0,
+                "total_tokens": 0, "cost_usd": 0.0, "unpriced": 0,
+            }
+        return m
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        self.records += 1
+        phase = rec.get("phase")
+        if phase == "upload":
+            up = rec.get("upload") or {}
+            elapsed = up.get("elapsed_sec")
+            size = up.get("total_bytes") or 0
+            if isinstance(elapsed, (int, float)):
+                self.upload_latency.add(elapsed)
+                if elapsed > 0 and size:
+                    self.upload_mb_s.add(size / 1048576.0 / elapsed)
+                    self.upload_bytes += int(size)
+                    self.upload_elapsed += float(elapsed)
+            # пофайловые замеры (есть в записях core/uploader.upload_to_vector_store_ex)
+            for f in rec.get("files") or ():
+                if isinstance(f.get("upload_sec"), (int, float)):
+                    self.file_upload_latency.add(f["upload_sec"])
+                if isinstance(f.get("attach_sec"), (int, float)):
+                    self.file_attach_latency.add(f["attach_sec"])
+                if isinstance(f.get("mb_s"), (int, float)):
+                    self.file_mb_s.add(f["mb_s"])
+                self.file_retries += int(f.get("retries") or 0)
+        elif phase == "index":
+            ix = rec.get("index") or {}
+            if isinstance(ix.get("elapsed_sec"), (int, float)):
+                self.index_latency.add(ix["elapsed_sec"])
+            status = str(ix.get("status") or "unknown")
+            self.index_outcomes[status] = self.index_outcomes.get(status, 0) + 1
+        elif phase == "response":
+            resp = rec.get("response") or {}
+            if isinstance(resp.get("elapsed_sec"), (int, float)):
+                self.response_latency.add(resp["elapsed_sec"])
+            name = rec.get("model") or "-"
+            m = self._model(name)
+            m["responses"] += 1
+            inp, outp = resp.get("input_tokens"), resp.get("output_tokens")
+            total = resp.get("total_tokens")
+            if total is None and (inp is not None or outp is not None):
+                total = (inp or 0) + (outp or 0)
+            m["input_tokens"] += int(inp or 0)
+            m["output_tokens"] += int(outp or 0)
+            if total is not None:
+                m["total_tokens"] += int(total)
+                self.tokens.add(total)
+            cost = resp.get("cost_usd_est")
+            if cost is None:
+                cost = _estimate_cost_usd(rec.get("model"), inp, outp)
+            if cost is None:
+                m["unpriced"] += 1
+            else:
+                m["cost_usd"] += float(cost)
+        elif phase == "result":
+            self.results += 1
+        elif phase == "validation_error":
+            self.validation_errors += 1
+
+    def report(self) -> Dict[str, Any]:
+        attempts = self.results + self.validation_errors
+        models = {}
+        for name, m in sorted(self.models.items()):
+            models[name] = dict(m, cost_usd=round(m["cost_usd"], 6))
+        return {
+            "records": self.records,
+            "latency_sec": {
+                "upload": self.upload_latency.summary(),
+                "file_upload": self.file_upload_latency.summary(),
+                "file_attach": self.file_attach_latency.summary(),
+                "index": self.index_latency.summary(),
+                "response": self.response_latency.summary(),
+            },
+            "index_outcomes": dict(sorted(self.index_outcomes.items())),
+            "upload": {
+                "total_mb": round(self.upload_bytes / 1048576.0, 3),
+                "mb_s": self.upload_mb_s.summary(),
+                "file_mb_s": self.file_mb_s.summary(),
+                "file_retries": self.file_retries,
+                "overall_mb_s": (
+                    round(self.upload_bytes / 1048576.0 / self.upload_elapsed, 3) if self.upload_elapsed > 0 else None
+                ),
+            },
+            "tokens_per_extraction": self.tokens.summary(digits=1),
+            "models": models,
+            "cost_usd_total": round(sum(m["cost_usd"] for m in self.models.values()), 6),
+            "validation": {
+                "results": self.results,
+                "errors": self.validation_errors,
+                "failure_rate": round(self.validation_errors / attempts, 4) if attempts else None,
+            },
+        }
+
+
+def _group_key(rec: Dict[str, Any], group_by: str) -> str:
+    if group_by == "model":
+        return str(rec.get("model") or "-")
+    if group_by == "phase":
+        return str(rec.get("phase") or "-")
+    ts = str(rec.get("ts") or "")
+    if group_by == "day":
+        return ts[:10] or "-"
+    if group_by == "hour":
+        return ts[:13] or "-"
+    return "all"
+
+
+# ============================== API ==============================
+
+def parse_window(last: str, now: Optional[datetime] = None) -> str:
+    """«24h», «7d», «30m», «2w» -> ISO-время начала окна (для since)."""
+    units = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    text = (last or "").strip().lower()
+    if len(text) < 2 or text[-1] not in units or not text[:-1].isdigit():
+        raise ValueError(f"Некорректное окно: {last!r} (ожидается, например, 24h или 7d)")
+    start = (now or datetime.now()) - timedelta(**{units[text[-1]]: int(text[:-1])})
+    return start.isoformat(timespec="seconds")
+
+
+def compute_stats(
+    records: Optional[Iterable[Dict[str, Any]]] = None,
+    *,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    group_by: str = "none",
+) -> Dict[str, Any]:
+    """
+    Сводка по журналу за интервал [since, until). records — для своих
+    источников; по умолчанию — весь журнал (JSONL-сегменты или SQLite).
+    Возвращает {"since", "until", "group_by", "groups": {ключ: отчёт}}.
+    """
+    if group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f"group_by должен быть одним из {GROUP_BY_CHOICES}")
+    if records is None:
+        records = iter_records(since=since, until=until)
+    groups: Dict[str, _GroupStats] = {}
+    for rec in records:
+        ts = str(rec.get("ts") or "")
+        if (since and ts < since) or (until and ts >= until):
+            continue
+        key = _group_key(rec, group_by)
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = _GroupStats()
+        g.add(rec)
+    return {
+        "since": since,
+        "until": until,
+        "group_by": group_by,
+        "groups": {k: groups[k].report() for k in sorted(groups)},
+    }
+
+
+__all__ = ["GROUP_BY_CHOICES", "LogHistogram", "compute_stats", "parse_window"]
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+infra/json_scan.py — потоковый поиск JSON-объектов в ответе модели.
+
+Сканер за один проход находит сбалансированные {...} верхнего уровня,
+понимая строковые литералы и escape-последовательности: скобки внутри
+цитат ("quote": "п. {3.1}") не ломают баланс. Текст до/после объекта
+(«Вот результат: ...») пропускается. Данные можно подавать кусками —
+например, по мере прихода streaming-ответа.
+
+Кандидатом считается только «{», за которой (после пробелов) идёт «"» или
+«}», — иначе это не начало JSON-объекта, и «{см. приложение}» или «Note {see
+below.» отбрасываются сразу, не задерживая поток. Непарная «{» в прозе не
+прячет объект: если кандидат не закрылся к концу текста или отвергнут
+потребителем, поиск продолжается со следующей «{» после его начала. Пары
+скобок, найденные при сканировании, запоминаются, поэтому текст не
+сканируется повторно (finish() для потока, iter_candidates_by_start() для
+целого текста).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Внутри объекта одним match-ем (C-скорость) пропускаем всё, кроме скобок:
+# обычный текст и целиком закрытые строковые литералы. Останавливаемся на «{», «}»
+# или на кавычке, чья строка не закрылась в этом куске. Шаблон всегда совпадает
+# (в том числе пустым), поэтому бэктрекинга нет и время остаётся линейным.
+_SKIP_RE = re.compile(r'(?:[^{}"]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+# Внутри незакрытой строки интересны только кавычка и обратный слэш
+_STRING_RE = re.compile(r'["\\]')
+# Начало JSON-объекта: «{», пробелы, затем ключ или «}»
+_OPEN_RE = re.compile(r'\{\s*["}]')
+_WS_RE = re.compile(r'\s*')
+
+
+class JsonObjectScanner:
+    """
+    Инкрементальный сканер: feed(chunk) возвращает список кандидатов — строк
+    со сбалансированным {...} верхнего уровня, завершившихся в этом куске;
+    finish() в конце входа отдаёт то, что пряталось за незакрытой «{».
+
+    Кандидат гарантированно сбалансирован по скобкам вне строк и начинается
+    как JSON-объект, но может не быть валидным JSON — проверку делает
+    потребитель (json.loads / Pydantic).
+
+    Память ограничена размером текущего незавершённого кандидата:
+    текст вне объектов не буферизуется.
+    """
+
+    __slots__ = ("_parts", "_size", "_stack", "_ends", "_opening", "_in_string", "_escape")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._parts: List[str] = []
+        self._size = 0  # длина буфера кандидата
+        self._stack: List[int] = []  # позиции открытых «{» в буфере
+        self._ends: Dict[int, Optional[int]] = {}  # закрытые вложенные пары: «{» → после «}»
+        self._opening = False  # после «{» кандидата ещё не было непробельного символа
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def pending(self) -> bool:
+        """True, если сканер находится внутри незавершённого объекта."""
+        return bool(self._stack)
+
+    def feed(self, chunk: str) -> List[str]:
+        found: List[str] = []
+        n = len(chunk)
+        pos = 0
+        seg: Optional[int] = 0 if self._stack else None  # начало текущего кандидата в chunk
+        delta = self._size  # позиция в буфере = позиция в chunk + delta
+
+        if self._escape and n:
+            # предыдущий кусок закончился на «\» внутри строки — пропускаем экранированный символ
+            self._escape = False
+            pos = 1
+
+        while pos < n:
+            if not self._stack:
+                start = chunk.find("{", pos)
+                if start < 0:
+                    break
+                seg, delta = start, -start
+                self._stack.append(0)
+                self._opening = True
+                pos = start + 1
+                continue
+
+            if self._opening:
+                pos = _WS_RE.match(chunk, pos).end()
+                if pos >= n:
+                    break
+                self._opening = False
+                if chunk[pos] not in '"}':
+                    self.reset()  # не начало JSON-объекта — ищем следующую «{»
+                    seg = None
+                continue
+
+            if self._in_string:
+                m = _STRING_RE.search(chunk, pos)
+                if m is None:
+                    break
+                pos = m.end()
+                if m.group() == "\\":
+                    if pos < n:
+                        pos += 1
+                    else:
+                        self._escape = True
+                else:
+                    self._in_string = False
+                continue
+
+            pos = _SKIP_RE.match(chunk, pos).end()
+            if pos >= n:
+                break
+            ch = chunk[pos]
+            pos += 1
+
+            if ch == '"':
+                self._in_string = True  # строка продолжается в следующем куске
+            elif ch == "{":
+                self._stack.append(pos - 1 + delta)
+            elif ch == "}":
+                open_pos = self._stack.pop()
+                if self._stack:
+                    self._ends[open_pos] = pos + delta
+                else:
+                    self._parts.append(chunk[seg:pos])
+                    found.append("".join(self._parts))
+                    self.reset()
+                    seg = None
+
+        if self._stack and seg is not None:
+            self._parts.append(chunk[seg:])
+            self._size += n - seg
+        return found
+
+    def finish(self) -> List[str]:
+        """
+        Конец входа: незакрытый кандидат начался с непарной «{». Поиск идёт
+        со следующей «{» с уже найденными парами скобок — повторного
+        сканирования буфера нет.
+        """
+        found: List[str] = []
+        if self._stack and not self._opening:
+            text = "".join(self._parts)
+            ends = self._ends
+            for open_pos in self._stack:
+                ends[open_pos] = None
+            last = 0
+            for start, end in _spans_by_start(text, ends, 1):
+                if start >= last:  # вложенные в уже отданный кандидат не отдаём
+                    found.append(text[start:end])
+                    last = end
+        self.reset()
+        return found
+
+
+def iter_json_object_candidates(chunks: Iterable[str]) -> Iterator[str]:
+    """Проходит по кускам текста и отдаёт кандидатов {...} по мере их завершения."""
+    scanner = JsonObjectScanner()
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+    yield from scanner.finish()
+
+
+def _match_from(text: str, start: int) -> Dict[int, Optional[int]]:
+    """
+    Один проход от «{» в text[start] до закрытия этого объекта: для каждой «{»
+    вне строк — позиция после парной «}» (None, если пары нет до конца текста).
+    """
+    result: Dict[int, Optional[int]] = {}
+    stack = [start]
+    pos = start + 1
+    n = len(text)
+    while stack:
+        pos = _SKIP_RE.match(text, pos).end()
+        if pos >= n or text[pos] == '"':
+            break  # конец текста или строка, не закрывшаяся до конца
+        if text[pos] == "{":
+            stack.append(pos)
+        else:
+            result[stack.pop()] = pos + 1
+        pos += 1
+    for open_pos in stack:
+        result[open_pos] = None
+    return result
+
+
+def _spans_by_start(text: str, ends: Dict[int, Optional[int]], pos: int = 0) -> Iterator[Tuple[int, int]]:
+    """(начало, конец) кандидатов с позиции pos; ends — уже известные пары скобок (дополняется)."""
+    while True:
+        start = text.find("{", pos)
+        if start < 0:
+            return
+        pos = start + 1
+        if not _OPEN_RE.match(text, start):
+            continue
+        if start not in ends:
+            ends.update(_match_from(text, start))
+        end = ends[start]
+        if end is not None:
+            yield start, end
+
+
+def iter_candidates_by_start(text: str) -> Iterator[str]:
+    """
+    Кандидаты {...} целого текста по позиции начала: после каждого (отвергнутого
+    потребителем) или незакрытого поиск продолжается со следующей «{» после его
+    начала. Так непарные скобки и кавычки прозы перед объектом его не прячут:
+    первый кандидат, который примет потребитель, — самый ранний валидный.
+    Пары скобок одного прохода запоминаются — «{{{{…» не сканируется заново.
+    """
+    for start, end in _spans_by_start(text, {}):
+        yield text[start:end]
+
+
+def extract_first_json_object(text: str) -> Optional[str]:
+    """
+    Возвращает первый валидный JSON-объект верхнего уровня из текста
+    (прозу вокруг и невалидные «{...}» пропускает) или None.
+    """
+    for candidate in iter_candidates_by_start(text):
+        try:
+            json.loads(candidate)
+        except ValueError:
+            continue
+        return candidate
+    return None
+
+
+__all__ = [
+    "JsonObjectScanner",
+    "iter_json_object_candidates",
+    "iter_candidates_by_start",
+    "extract_first_json_object",
+]
@@ -84,26 +84,174 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
     "settings.language_hint": "\u0418\u0437\u043c\u0435\u043d\u0435\u043d\u0438\u0435\u0020\u044f\u0437\u044b\u043a\u0430\u0020\u043f\u0440\u0438\u043c\u0435\u043d\u044f\u0435\u0442\u0441\u044f\u0020\u0441\u0440\u0430\u0437\u0443\u002e",
     "settings.language_applied": "\u042f\u0437\u044b\u043a\u0020\u043f\u0435\u0440\u0435\u043a\u043b\u044e\u0447\u0435\u043d\u0020\u043d\u0430\u0020\u007b\u006c\u0061\u006e\u0067\u0075\u0061\u0067\u0065\u005f\u006e\u0061\u006d\u0065\u007d\u002e",
     "pipeline.missing_store_id": "\u0417\u0430\u0433\u0440\u0443\u0437\u043a\u0430\u0020\u0437\u0430\u0432\u0435\u0440\u0448\u0438\u043b\u0430\u0441\u044c\u0020\u0431\u0435\u0437\u0020\u0073\u0074\u006f\u0072\u0065\u005f\u0069\u0064\u002e",
+    "cli.arg.document_type": "\u0422\u0438\u043f\u0020\u0434\u043e\u043a\u0443\u043c\u0435\u043d\u0442\u0430\u003a\u0020\u043e\u043f\u0440\u0435\u0434\u0435\u043b\u044f\u0435\u0442\u0020\u0073\u0079\u0073\u0074\u0065\u006d\u0020\u0070\u0072\u006f\u006d\u0070\u0074\u0020\u0438\u0020\u0441\u0445\u0435\u043c\u0443\u0020\u043e\u0442\u0432\u0435\u0442\u0430\u002e",
+    "cli.journal.description": "\u041f\u0440\u043e\u0441\u043c\u043e\u0442\u0440\u0020\u0436\u0443\u0440\u043d\u0430\u043b\u0430\u0020\u0441\u0020\u0444\u0438\u043b\u044c\u0442\u0440\u0430\u043c\u0438\u0020\u0438\u0020\u043f\u043e\u0441\u0442\u0440\u0430\u043d\u0438\u0447\u043d\u044b\u043c\u0020\u0432\u044b\u0432\u043e\u0434\u043e\u043c\u0020\u0028\u0060\u0063\u006c\u0069\u002e\u0070\u0079\u0020\u006a\u006f\u0075\u0072\u006e\u0061\u006c\u0060\u0029\u002e",
+    "cli.journal.arg.phase": "\u0424\u0430\u0437\u0430\u0020\u0437\u0430\u043f\u0438\u0441\u0438\u003a\u0020\u0075\u0070\u006c\u006f\u0061\u0064\u002c\u0020\u0069\u006e\u0064\u0065\u0078\u002c\u0020\u0072\u0065\u0073\u0070\u006f\u006e\u0073\u0065\u002c\u0020\u0072\u0065\u0073\u0075\u006c\u0074\u002c\u0020\u0076\u0061\u006c\u0069\u0064\u0061\u0074\u0069\u006f\u006e\u005f\u0065\u0072\u0072\u006f\u0072\u002e",
+    "cli.journal.arg.store_id": "\u0422\u043e\u043b\u044c\u043a\u043e\u0020\u0437\u0430\u043f\u0438\u0441\u0438\u0020\u0443\u043a\u0430\u0437\u0430\u043d\u043d\u043e\u0433\u043e\u0020\u0056\u0065\u0063\u0074\u006f\u0072\u0020\u0053\u0074\u006f\u0072\u0065\u002e",
+    "cli.journal.arg.model": "\u0422\u043e\u043b\u044c\u043a\u043e\u0020\u0437\u0430\u043f\u0438\u0441\u0438\u0020\u0443\u043a\u0430\u0437\u0430\u043d\u043d\u043e\u0439\u0020\u043c\u043e\u0434\u0435\u043b\u0438\u002e",
+    "cli.journal.arg.since": "\u041d\u0430\u0447\u0430\u043b\u043e\u0020\u0438\u043d\u0442\u0435\u0440\u0432\u0430\u043b\u0430\u0020\u0028\u0049\u0053\u004f\u002c\u0020\u043d\u0430\u043f\u0440\u0438\u043c\u0435\u0440\u0020\u0032\u0030\u0032\u0035\u002d\u0031\u0030\u002d\u0030\u0031\u0020\u0438\u043b\u0438\u0020\u0032\u0030\u0032\u0035\u002d\u0031\u0030\u002d\u0030\u0031\u0054\u0031\u0032\u003a\u0030\u0030\u0029\u002e",
+    "cli.journal.arg.until": "\u041a\u043e\u043d\u0435\u0446\u0020\u0438\u043d\u0442\u0435\u0440\u0432\u0430\u043b\u0430\u0020\u0028\u0049\u0053\u004f\u002c\u0020\u043d\u0435\u0020\u0432\u043a\u043b\u044e\u0447\u0438\u0442\u0435\u043b\u044c\u043d\u043e\u0029\u002e",
+    "cli.journal.arg.min_elapsed": "\u0422\u043e\u043b\u044c\u043a\u043e\u0020\u0437\u0430\u043f\u0438\u0441\u0438\u0020\u0434\u043b\u0438\u0442\u0435\u043b\u044c\u043d\u043e\u0441\u0442\u044c\u044e\u0020\u043d\u0435\u0020\u043c\u0435\u043d\u044c\u0448\u0435\u0020\u004e\u0020\u0441\u0435\u043a\u0443\u043d\u0434\u002e",
+    "cli.journal.arg.limit": "\u0421\u043a\u043e\u043b\u044c\u043a\u043e\u0020\u0437\u0430\u043f\u0438\u0441\u0435\u0439\u0020\u0432\u044b\u0432\u0435\u0441\u0442\u0438\u002e",
+    "cli.journal.arg.offset": "\u0421\u043a\u043e\u043b\u044c\u043a\u043e\u0020\u0441\u0430\u043c\u044b\u0445\u0020\u043d\u043e\u0432\u044b\u0445\u0020\u0437\u0430\u043f\u0438\u0441\u0435\u0439\u0020\u043f\u0440\u043e\u043f\u0443\u0441\u0442\u0438\u0442\u044c\u002e",
+    "cli.journal.arg.import_jsonl": "\u0418\u043c\u043f\u043e\u0440\u0442\u0438\u0440\u043e\u0432\u0430\u0442\u044c\u0020\u0441\u0443\u0449\u0435\u0441\u0442\u0432\u0443\u044e\u0449\u0438\u0435\u0020\u004a\u0053\u004f\u004e\u004c\u002d\u0436\u0443\u0440\u043d\u0430\u043b\u044b\u0020\u0432\u0020\u0053\u0051\u004c\u0069\u0074\u0065\u0020\u0438\u0020\u0432\u044b\u0439\u0442\u0438\u002e",
+    "cli.journal.imported": "\u0418\u043c\u043f\u043e\u0440\u0442\u0020\u0437\u0430\u0432\u0435\u0440\u0448\u0451\u043d\u003a\u0020\u0444\u0430\u0439\u043b\u043e\u0432\u0020\u007b\u0066\u0069\u006c\u0065\u0073\u007d\u002c\u0020\u0441\u0442\u0440\u043e\u043a\u0020\u007b\u006c\u0069\u006e\u0065\u0073\u007d\u002c\u0020\u0434\u043e\u0431\u0430\u0432\u043b\u0435\u043d\u043e\u0020\u007b\u0069\u006d\u0070\u006f\u0072\u0074\u0065\u0064\u007d\u002c\u0020\u043f\u0440\u043e\u043f\u0443\u0449\u0435\u043d\u043e\u0020\u007b\u0073\u006b\u0069\u0070\u0070\u0065\u0064\u007d\u002e",
+    "journal.filter.phase": "\u0424\u0430\u0437\u0430\u003a",
+    "journal.filter.store_id": "\u0053\u0074\u006f\u0072\u0065\u0020\u0049\u0044\u003a",
+    "journal.filter.apply": "\u041f\u0440\u0438\u043c\u0435\u043d\u0438\u0442\u044c",
+    "cli.stats.description": "\u0421\u0432\u043e\u0434\u043a\u0430\u0020\u043f\u043e\u0020\u0436\u0443\u0440\u043d\u0430\u043b\u0443\u003a\u0020\u043f\u0435\u0440\u0446\u0435\u043d\u0442\u0438\u043b\u0438\u0020\u0437\u0430\u0434\u0435\u0440\u0436\u0435\u043a\u002c\u0020\u0441\u043a\u043e\u0440\u043e\u0441\u0442\u044c\u0020\u0437\u0430\u0433\u0440\u0443\u0437\u043a\u0438\u002c\u0020\u0442\u043e\u043a\u0435\u043d\u044b\u002c\u0020\u0441\u0442\u043e\u0438\u043c\u043e\u0441\u0442\u044c\u0020\u043f\u043e\u0020\u043c\u043e\u0434\u0435\u043b\u044f\u043c\u0020\u0438\u0020\u0434\u043e\u043b\u044f\u0020\u043e\u0448\u0438\u0431\u043e\u043a\u0020\u0432\u0430\u043b\u0438\u0434\u0430\u0446\u0438\u0438\u0020\u0028\u0060\u0063\u006c\u0069\u002e\u0070\u0079\u0020\u0073\u0074\u0061\u0074\u0073\u0060\u0029\u002e",
+    "cli.stats.arg.last": "\u041e\u043a\u043d\u043e\u0020\u043e\u0442\u0020\u0442\u0435\u043a\u0443\u0449\u0435\u0433\u043e\u0020\u043c\u043e\u043c\u0435\u043d\u0442\u0430\u003a\u0020\u043d\u0430\u043f\u0440\u0438\u043c\u0435\u0440\u0020\u0032\u0034\u0068\u002c\u0020\u0037\u0064\u002c\u0020\u0033\u0030\u006d\u002c\u0020\u0032\u0077\u0020\u0028\u0437\u0430\u043c\u0435\u043d\u044f\u0435\u0442\u0020\u002d\u002d\u0073\u0069\u006e\u0063\u0065\u0029\u002e",
+    "cli.stats.arg.group_by": "\u0413\u0440\u0443\u043f\u043f\u0438\u0440\u043e\u0432\u043a\u0430\u003a\u0020\u006e\u006f\u006e\u0065\u002c\u0020\u006d\u006f\u0064\u0065\u006c\u002c\u0020\u0064\u0061\u0079\u002c\u0020\u0068\u006f\u0075\u0072\u002c\u0020\u0070\u0068\u0061\u0073\u0065\u002e",
+    "cli.stats.arg.json": "\u0412\u044b\u0432\u0435\u0441\u0442\u0438\u0020\u043e\u0442\u0447\u0451\u0442\u0020\u0432\u0020\u004a\u0053\u004f\u004e\u0020\u0028\u0434\u043b\u044f\u0020\u0434\u0430\u0448\u0431\u043e\u0440\u0434\u043e\u0432\u0029\u002e",
+    "cli.stats.empty": "\u0412\u0020\u0436\u0443\u0440\u043d\u0430\u043b\u0435\u0020\u043d\u0435\u0442\u0020\u0437\u0430\u043f\u0438\u0441\u0435\u0439\u0020\u0437\u0430\u0020\u0432\u044b\u0431\u0440\u0430\u043d\u043d\u044b\u0439\u0020\u0438\u043d\u0442\u0435\u0440\u0432\u0430\u043b\u002e",
+    "cli.stats.summary": "\u006e\u003d\u007b\u0063\u006f\u0075\u006e\u0074\u007d\u0020\u0070\u0035\u0030\u003d\u007b\u0070\u0035\u0030\u007d\u0020\u0070\u0039\u0030\u003d\u007b\u0070\u0039\u0030\u007d\u0020\u0070\u0039\u0039\u003d\u007b\u0070\u0039\u0039\u007d\u0020\u006d\u0061\u0078\u003d\u007b\u006d\u0061\u0078\u007d\u0020\u0441\u0440\u002e\u003d\u007b\u006d\u0065\u0061\u006e\u007d",
+    "cli.stats.group": "\u003d\u003d\u003d\u0020\u007b\u0067\u0072\u006f\u0075\u0070\u007d\u0020\u0028\u0437\u0430\u043f\u0438\u0441\u0435\u0439\u003a\u0020\u007b\u0072\u0065\u0063\u006f\u0072\u0064\u0073\u007d\u0029\u0020\u003d\u003d\u003d",
+    "cli.stats.upload_latency": "\u0417\u0430\u0433\u0440\u0443\u0437\u043a\u0430\u002c\u0020\u0441\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "cli.stats.index_latency": "\u0418\u043d\u0434\u0435\u043a\u0441\u0430\u0446\u0438\u044f\u002c\u0020\u0441\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "cli.stats.response_latency": "\u041e\u0442\u0432\u0435\u0442\u0020\u043c\u043e\u0434\u0435\u043b\u0438\u002c\u0020\u0441\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "cli.stats.upload_speed": "\u0421\u043a\u043e\u0440\u043e\u0441\u0442\u044c\u0020\u0437\u0430\u0433\u0440\u0443\u0437\u043a\u0438\u002c\u0020\u004d\u0042\u002f\u0073\u003a\u0020\u0432\u0441\u0435\u0433\u043e\u0020\u007b\u0074\u006f\u0074\u0061\u006c\u005f\u006d\u0062\u007d\u0020\u004d\u0042\u002c\u0020\u0432\u0020\u0441\u0440\u0435\u0434\u043d\u0435\u043c\u0020\u007b\u006f\u0076\u0065\u0072\u0061\u006c\u006c\u007d\u003b\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "cli.stats.tokens": "\u0422\u043e\u043a\u0435\u043d\u043e\u0432\u0020\u043d\u0430\u0020\u0438\u0437\u0432\u043b\u0435\u0447\u0435\u043d\u0438\u0435\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "cli.stats.model": "\u041c\u043e\u0434\u0435\u043b\u044c\u0020\u007b\u006d\u006f\u0064\u0065\u006c\u007d\u003a\u0020\u043e\u0442\u0432\u0435\u0442\u043e\u0432\u0020\u007b\u0072\u0065\u0073\u0070\u006f\u006e\u0073\u0065\u0073\u007d\u002c\u0020\u0442\u043e\u043a\u0435\u043d\u043e\u0432\u0020\u007b\u0074\u006f\u0074\u0061\u006c\u005f\u0074\u006f\u006b\u0065\u006e\u0073\u007d\u0020\u0028\u0432\u0445\u043e\u0434\u0020\u007b\u0069\u006e\u0070\u0075\u0074\u005f\u0074\u006f\u006b\u0065\u006e\u0073\u007d\u002c\u0020\u0432\u044b\u0445\u043e\u0434\u0020\u007b\u006f\u0075\u0074\u0070\u0075\u0074\u005f\u0074\u006f\u006b\u0065\u006e\u0073\u007d\u0029\u002c\u0020\u007e\u0024\u007b\u0063\u006f\u0073\u0074\u005f\u0075\u0073\u0064\u007d\u0020\u0028\u0431\u0435\u0437\u0020\u0446\u0435\u043d\u044b\u003a\u0020\u007b\u0075\u006e\u0070\u0072\u0069\u0063\u0065\u0064\u007d\u0029",
+    "cli.stats.validation": "\u0412\u0430\u043b\u0438\u0434\u0430\u0446\u0438\u044f\u003a\u0020\u0443\u0441\u043f\u0435\u0448\u043d\u043e\u0020\u007b\u0072\u0065\u0073\u0075\u006c\u0074\u0073\u007d\u002c\u0020\u043e\u0448\u0438\u0431\u043e\u043a\u0020\u007b\u0065\u0072\u0072\u006f\u0072\u0073\u007d\u002c\u0020\u0434\u043e\u043b\u044f\u0020\u043e\u0448\u0438\u0431\u043e\u043a\u0020\u007b\u0072\u0061\u0074\u0065\u007d",
+    "cli.arg.trace": "\u0421\u043e\u0445\u0440\u0430\u043d\u0438\u0442\u044c\u0020\u0442\u0440\u0430\u0441\u0441\u0443\u0020\u044d\u0442\u0430\u043f\u043e\u0432\u0020\u0437\u0430\u043f\u0443\u0441\u043a\u0430\u0020\u0432\u0020\u0444\u043e\u0440\u043c\u0430\u0442\u0435\u0020\u0043\u0068\u0072\u006f\u006d\u0065\u0020\u0074\u0072\u0061\u0063\u0065\u0020\u004a\u0053\u004f\u004e\u0020\u0028\u043e\u0442\u043a\u0440\u044b\u0432\u0430\u0435\u0442\u0441\u044f\u0020\u0432\u0020\u0063\u0068\u0072\u006f\u006d\u0065\u003a\u002f\u002f\u0074\u0072\u0061\u0063\u0069\u006e\u0067\u0020\u0438\u043b\u0438\u0020\u0050\u0065\u0072\u0066\u0065\u0074\u0074\u006f\u0029\u002e",
+    "cli.trace_saved": "\u0422\u0440\u0430\u0441\u0441\u0430\u0020\u0441\u043e\u0445\u0440\u0430\u043d\u0435\u043d\u0430\u003a\u0020\u007b\u0070\u0061\u0074\u0068\u007d",
+    "cli.stats.file_upload_latency": "\u0417\u0430\u0433\u0440\u0443\u0437\u043a\u0430\u0020\u0444\u0430\u0439\u043b\u0430\u002c\u0020\u0441\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "cli.stats.file_attach_latency": "\u041f\u0440\u0438\u0432\u044f\u0437\u043a\u0430\u0020\u0444\u0430\u0439\u043b\u0430\u002c\u0020\u0441\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "cli.stats.file_speed": "\u0421\u043a\u043e\u0440\u043e\u0441\u0442\u044c\u0020\u043f\u043e\u0020\u0444\u0430\u0439\u043b\u0430\u043c\u002c\u0020\u004d\u0042\u002f\u0073\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d\u003b\u0020\u043f\u043e\u0432\u0442\u043e\u0440\u043e\u0432\u003a\u0020\u007b\u0072\u0065\u0074\u0072\u0069\u0065\u0073\u007d",
+    "cli.batch.description": "\u041f\u0430\u043a\u0435\u0442\u043d\u0430\u044f\u0020\u043e\u0431\u0440\u0430\u0431\u043e\u0442\u043a\u0430\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u043e\u0432\u0020\u043f\u043e\u0020\u043c\u0430\u043d\u0438\u0444\u0435\u0441\u0442\u0443\u0020\u0028\u004a\u0053\u004f\u004e\u004c\u0020\u0438\u043b\u0438\u0020\u0043\u0053\u0056\u003a\u0020\u0074\u0065\u006e\u0064\u0065\u0072\u005f\u0069\u0064\u0020\u2192\u0020\u0444\u0430\u0439\u043b\u044b\u0020\u0438\u043b\u0438\u0020\u043f\u0430\u043f\u043a\u0430\u0029\u002e",
+    "cli.batch.arg.manifest": "\u041f\u0443\u0442\u044c\u0020\u043a\u0020\u043c\u0430\u043d\u0438\u0444\u0435\u0441\u0442\u0443\u0020\u0028\u002e\u006a\u0073\u006f\u006e\u006c\u0020\u0438\u043b\u0438\u0020\u002e\u0063\u0073\u0076\u0029\u002e",
+    "cli.batch.arg.output": "\u004a\u0053\u004f\u004e\u004c\u002d\u0444\u0430\u0439\u043b\u0020\u0434\u043b\u044f\u0020\u0440\u0435\u0437\u0443\u043b\u044c\u0442\u0430\u0442\u043e\u0432\u0020\u0028\u0434\u043e\u043f\u0438\u0441\u044b\u0432\u0430\u0435\u0442\u0441\u044f\u0029\u002e",
+    "cli.batch.arg.failures": "\u004a\u0053\u004f\u004e\u004c\u002d\u0444\u0430\u0439\u043b\u0020\u0434\u043b\u044f\u0020\u043e\u0448\u0438\u0431\u043e\u043a\u0020\u0028\u043f\u043e\u0020\u0443\u043c\u043e\u043b\u0447\u0430\u043d\u0438\u044e\u0020\u003c\u006f\u0075\u0074\u0070\u0075\u0074\u003e\u002e\u0066\u0061\u0069\u006c\u0075\u0072\u0065\u0073\u002e\u006a\u0073\u006f\u006e\u006c\u0029\u002e",
+    "cli.batch.arg.jobs": "\u0421\u043a\u043e\u043b\u044c\u043a\u043e\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u043e\u0432\u0020\u043e\u0431\u0440\u0430\u0431\u0430\u0442\u044b\u0432\u0430\u0442\u044c\u0020\u043e\u0434\u043d\u043e\u0432\u0440\u0435\u043c\u0435\u043d\u043d\u043e\u002e",
+    "cli.batch.arg.cleanup_min": "\u0427\u0435\u0440\u0435\u0437\u0020\u0441\u043a\u043e\u043b\u044c\u043a\u043e\u0020\u043c\u0438\u043d\u0443\u0442\u0020\u0443\u0434\u0430\u043b\u0438\u0442\u044c\u0020\u0445\u0440\u0430\u043d\u0438\u043b\u0438\u0449\u0435\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u0430\u0020\u0028\u0030\u0020\u2014\u0020\u043d\u0435\u0020\u043f\u043b\u0430\u043d\u0438\u0440\u043e\u0432\u0430\u0442\u044c\u0029\u002e",
+    "cli.batch.arg.summary": "\u0421\u043e\u0445\u0440\u0430\u043d\u0438\u0442\u044c\u0020\u0441\u0432\u043e\u0434\u043a\u0443\u0020\u0437\u0430\u043f\u0443\u0441\u043a\u0430\u0020\u0432\u0020\u004a\u0053\u004f\u004e\u002d\u0444\u0430\u0439\u043b\u002e",
+    "cli.batch.stage": "\u0020\u0020\u007b\u0073\u0074\u0061\u0067\u0065\u007d\u002c\u0020\u0441\u003a\u0020\u007b\u0076\u0061\u006c\u0075\u0065\u007d",
+    "batch.summary": "\u0422\u0435\u043d\u0434\u0435\u0440\u043e\u0432\u003a\u0020\u007b\u0074\u006f\u0074\u0061\u006c\u007d\u0020\u0028\u0443\u0441\u043f\u0435\u0448\u043d\u043e\u0020\u007b\u006f\u006b\u007d\u002c\u0020\u043e\u0448\u0438\u0431\u043e\u043a\u0020\u007b\u0066\u0061\u0069\u006c\u0065\u0064\u007d\u0029\u0020\u0437\u0430\u0020\u007b\u0065\u006c\u0061\u0070\u0073\u0065\u0064\u007d\u0020\u0441\u0020\u2014\u0020\u007b\u0072\u0061\u0074\u0065\u007d\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u043e\u0432\u002f\u0447\u0430\u0441",
+    "batch.no_files": "\u0412\u0020\u043c\u0430\u043d\u0438\u0444\u0435\u0441\u0442\u0435\u0020\u043d\u0435\u0442\u0020\u0444\u0430\u0439\u043b\u043e\u0432\u0020\u0434\u043b\u044f\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u0430",
+    "batch.missing_files": "\u0424\u0430\u0439\u043b\u044b\u0020\u043d\u0435\u0020\u043d\u0430\u0439\u0434\u0435\u043d\u044b\u003a\u0020\u007b\u0066\u0069\u006c\u0065\u0073\u007d",
+    "batch.item_start": "\u25b6\u0020\u007b\u0074\u0065\u006e\u0064\u0065\u0072\u005f\u0069\u0064\u007d\u003a\u0020\u0444\u0430\u0439\u043b\u043e\u0432\u0020\u007b\u0066\u0069\u006c\u0065\u0073\u007d",
+    "batch.item_done": "\u2705\u0020\u007b\u0074\u0065\u006e\u0064\u0065\u0072\u005f\u0069\u0064\u007d\u003a\u0020\u0433\u043e\u0442\u043e\u0432\u043e\u0020\u0437\u0430\u0020\u007b\u0065\u006c\u0061\u0070\u0073\u0065\u0064\u007d\u0020\u0441",
+    "batch.item_failed": "\u274c\u0020\u007b\u0074\u0065\u006e\u0064\u0065\u0072\u005f\u0069\u0064\u007d\u003a\u0020\u007b\u0065\u0072\u0072\u006f\u0072\u007d",
+    "cli.batch.arg.verbose": "\u041f\u0435\u0447\u0430\u0442\u0430\u0442\u044c\u0020\u043f\u043e\u0434\u0440\u043e\u0431\u043d\u044b\u0439\u0020\u0445\u043e\u0434\u0020\u043a\u043e\u043d\u0432\u0435\u0439\u0435\u0440\u0430\u0020\u0434\u043b\u044f\u0020\u043a\u0430\u0436\u0434\u043e\u0433\u043e\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u0430\u002e",
+    "pipeline.job_resume": "\u21bb\u0020\u041f\u0440\u043e\u0434\u043e\u043b\u0436\u0430\u044e\u0020\u0437\u0430\u0434\u0430\u043d\u0438\u0435\u0020\u0441\u0020\u044d\u0442\u0430\u043f\u0430\u0020\u00ab\u007b\u0073\u0074\u0061\u0067\u0065\u007d\u00bb",
+    "pipeline.job_store_gone": "\u0425\u0440\u0430\u043d\u0438\u043b\u0438\u0449\u0435\u0020\u007b\u0073\u0074\u006f\u0072\u0065\u005f\u0069\u0064\u007d\u0020\u0431\u043e\u043b\u044c\u0448\u0435\u0020\u043d\u0435\u0020\u0441\u0443\u0449\u0435\u0441\u0442\u0432\u0443\u0435\u0442\u0020\u2014\u0020\u0444\u0430\u0439\u043b\u044b\u0020\u0431\u0443\u0434\u0443\u0442\u0020\u0437\u0430\u0433\u0440\u0443\u0436\u0435\u043d\u044b\u0020\u0437\u0430\u043d\u043e\u0432\u043e",
+    "pipeline.job_upload_incomplete": "\u041d\u0435\u0020\u0432\u0441\u0435\u0020\u0444\u0430\u0439\u043b\u044b\u0020\u0437\u0430\u0433\u0440\u0443\u0436\u0435\u043d\u044b\u003a\u0020\u007b\u0066\u0069\u006c\u0065\u0073\u007d",
+    "pipeline.index_unconfirmed": "\u26a0\ufe0f\u0020\u0418\u043d\u0434\u0435\u043a\u0441\u0430\u0446\u0438\u044f\u0020\u043d\u0435\u0020\u043f\u043e\u0434\u0442\u0432\u0435\u0440\u0436\u0434\u0435\u043d\u0430\u003a\u0020\u007b\u0065\u0072\u0072\u006f\u0072\u007d",
+    "batch.item_skipped": "\u23ed\u0020\u007b\u0074\u0065\u006e\u0064\u0065\u0072\u005f\u0069\u0064\u007d\u003a\u0020\u0443\u0436\u0435\u0020\u043e\u0431\u0440\u0430\u0431\u043e\u0442\u0430\u043d",
+    "batch.skipped": "\u043f\u0440\u043e\u043f\u0443\u0449\u0435\u043d\u043e\u0020\u0028\u0443\u0436\u0435\u0020\u043e\u0431\u0440\u0430\u0431\u043e\u0442\u0430\u043d\u044b\u0029\u003a\u0020\u007b\u0073\u006b\u0069\u0070\u0070\u0065\u0064\u007d",
+    "cli.batch.arg.state": "\u0424\u0430\u0439\u043b\u0020\u0441\u043e\u0441\u0442\u043e\u044f\u043d\u0438\u044f\u0020\u0437\u0430\u0434\u0430\u043d\u0438\u0439\u0020\u0028\u0053\u0051\u004c\u0069\u0074\u0065\u0029\u0020\u0434\u043b\u044f\u0020\u0432\u043e\u0437\u043e\u0431\u043d\u043e\u0432\u043b\u0435\u043d\u0438\u044f\u0020\u0028\u043f\u043e\u0020\u0443\u043c\u043e\u043b\u0447\u0430\u043d\u0438\u044e\u0020\u003c\u006f\u0075\u0074\u0070\u0075\u0074\u003e\u002e\u006a\u006f\u0062\u0073\u002e\u0073\u0071\u006c\u0069\u0074\u0065\u0033\u0029\u002e",
+    "cli.batch.arg.no_state": "\u041d\u0435\u0020\u0432\u0435\u0441\u0442\u0438\u0020\u0441\u043e\u0441\u0442\u043e\u044f\u043d\u0438\u0435\u003a\u0020\u043a\u0430\u0436\u0434\u044b\u0439\u0020\u0437\u0430\u043f\u0443\u0441\u043a\u0020\u043e\u0431\u0440\u0430\u0431\u0430\u0442\u044b\u0432\u0430\u0435\u0442\u0020\u0432\u0441\u0435\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u044b\u0020\u0437\u0430\u043d\u043e\u0432\u043e\u002e",
+    "hotfolder.started": "\U0001f440\u0020\u0421\u043b\u0435\u0436\u0443\u0020\u0437\u0430\u0020\u007b\u0069\u006e\u0062\u006f\u0078\u007d\u0020\u0028\u0440\u0435\u0437\u0443\u043b\u044c\u0442\u0430\u0442\u044b\u0020\u2014\u0020\u0432\u0020\u007b\u006f\u0075\u0074\u0062\u006f\u0078\u007d\u002c\u0020\u043e\u0434\u043d\u043e\u0432\u0440\u0435\u043c\u0435\u043d\u043d\u043e\u003a\u0020\u007b\u006a\u006f\u0062\u0073\u007d\u0029\u002e\u0020\u0043\u0074\u0072\u006c\u002b\u0043\u0020\u2014\u0020\u043e\u0441\u0442\u0430\u043d\u043e\u0432\u043a\u0430\u002e",
+    "hotfolder.stopping": "\u041e\u0441\u0442\u0430\u043d\u0430\u0432\u043b\u0438\u0432\u0430\u044e\u0441\u044c\u003a\u0020\u0434\u043e\u0436\u0438\u0434\u0430\u044e\u0441\u044c\u0020\u043f\u0430\u043a\u0435\u0442\u043e\u0432\u0020\u0432\u0020\u0440\u0430\u0431\u043e\u0442\u0435\u2026",
+    "hotfolder.recovered": "\u21bb\u0020\u041d\u0435\u0437\u0430\u0432\u0435\u0440\u0448\u0451\u043d\u043d\u044b\u0445\u0020\u043f\u0430\u043a\u0435\u0442\u043e\u0432\u0020\u0441\u0020\u043f\u0440\u043e\u0448\u043b\u043e\u0433\u043e\u0020\u0437\u0430\u043f\u0443\u0441\u043a\u0430\u003a\u0020\u007b\u0063\u006f\u0075\u006e\u0074\u007d",
+    "hotfolder.queued": "\U0001f4e5\u0020\u007b\u006e\u0061\u006d\u0065\u007d\u003a\u0020\u0432\u0020\u043e\u0447\u0435\u0440\u0435\u0434\u0438\u0020\u0028\u0433\u043b\u0443\u0431\u0438\u043d\u0430\u0020\u007b\u0064\u0065\u0070\u0074\u0068\u007d\u0029",
+    "hotfolder.processed": "\U0001f4e4\u0020\u007b\u006e\u0061\u006d\u0065\u007d\u003a\u0020\u0433\u043e\u0442\u043e\u0432\u043e\u0020\u2192\u0020\u007b\u0070\u0061\u0074\u0068\u007d",
+    "hotfolder.move_failed": "\u26a0\ufe0f\u0020\u007b\u006e\u0061\u006d\u0065\u007d\u003a\u0020\u043d\u0435\u0020\u0443\u0434\u0430\u043b\u043e\u0441\u044c\u0020\u043f\u0435\u0440\u0435\u043c\u0435\u0441\u0442\u0438\u0442\u044c\u0020\u043f\u0430\u043a\u0435\u0442\u003a\u0020\u007b\u0065\u0072\u0072\u006f\u0072\u007d",
+    "hotfolder.scan_error": "\u26a0\ufe0f\u0020\u041e\u0448\u0438\u0431\u043a\u0430\u0020\u0441\u043a\u0430\u043d\u0438\u0440\u043e\u0432\u0430\u043d\u0438\u044f\u0020\u0432\u0445\u043e\u0434\u044f\u0449\u0435\u0439\u0020\u043f\u0430\u043f\u043a\u0438\u003a\u0020\u007b\u0065\u0072\u0072\u006f\u0072\u007d",
+    "cli.watch.description": "\u0414\u0435\u043c\u043e\u043d\u0020\u0433\u043e\u0440\u044f\u0447\u0435\u0439\u0020\u043f\u0430\u043f\u043a\u0438\u003a\u0020\u043e\u0431\u0440\u0430\u0431\u0430\u0442\u044b\u0432\u0430\u0435\u0442\u0020\u043f\u0430\u043a\u0435\u0442\u044b\u0020\u0442\u0435\u043d\u0434\u0435\u0440\u043e\u0432\u002c\u0020\u043f\u043e\u044f\u0432\u043b\u044f\u044e\u0449\u0438\u0435\u0441\u044f\u0020\u0432\u043e\u0020\u0432\u0445\u043e\u0434\u044f\u0449\u0435\u0439\u0020\u043f\u0430\u043f\u043a\u0435\u002e",
+    "cli.watch.arg.inbox": "\u0412\u0445\u043e\u0434\u044f\u0449\u0430\u044f\u0020\u043f\u0430\u043f\u043a\u0430\u0020\u0028\u043a\u0430\u0436\u0434\u044b\u0439\u0020\u043f\u0430\u043a\u0435\u0442\u0020\u2014\u0020\u043f\u043e\u0434\u043f\u0430\u043f\u043a\u0430\u0029\u002e",
+    "cli.watch.arg.outbox": "\u041f\u0430\u043f\u043a\u0430\u0020\u0440\u0435\u0437\u0443\u043b\u044c\u0442\u0430\u0442\u043e\u0432\u0020\u0028\u0070\u0072\u006f\u0063\u0065\u0073\u0073\u0065\u0064\u002f\u002c\u0020\u0066\u0061\u0069\u006c\u0065\u0064\u002f\u002c\u0020\u0073\u0074\u0061\u0074\u0075\u0073\u002e\u006a\u0073\u006f\u006e\u0029\u002e",
+    "cli.watch.arg.jobs": "\u0421\u043a\u043e\u043b\u044c\u043a\u043e\u0020\u043f\u0430\u043a\u0435\u0442\u043e\u0432\u0020\u043e\u0431\u0440\u0430\u0431\u0430\u0442\u044b\u0432\u0430\u0442\u044c\u0020\u043e\u0434\u043d\u043e\u0432\u0440\u0435\u043c\u0435\u043d\u043d\u043e\u002e",
+    "cli.watch.arg.queue_size": "\u0420\u0430\u0437\u043c\u0435\u0440\u0020\u043e\u0447\u0435\u0440\u0435\u0434\u0438\u0020\u0433\u043e\u0442\u043e\u0432\u044b\u0445\u0020\u043f\u0430\u043a\u0435\u0442\u043e\u0432\u002e",
+    "cli.watch.arg.settle_sec": "\u041f\u0430\u043a\u0435\u0442\u0020\u0433\u043e\u0442\u043e\u0432\u002c\u0020\u0435\u0441\u043b\u0438\u0020\u043d\u0435\u0020\u043c\u0435\u043d\u044f\u043b\u0441\u044f\u0020\u0441\u0442\u043e\u043b\u044c\u043a\u043e\u0020\u0441\u0435\u043a\u0443\u043d\u0434\u0020\u0028\u0030\u0020\u2014\u0020\u0442\u043e\u043b\u044c\u043a\u043e\u0020\u043f\u043e\u0020\u043c\u0430\u0440\u043a\u0435\u0440\u0443\u0029\u002e",
+    "cli.watch.arg.marker": "\u0418\u043c\u044f\u0020\u0444\u0430\u0439\u043b\u0430\u002d\u043c\u0430\u0440\u043a\u0435\u0440\u0430\u0020\u0433\u043e\u0442\u043e\u0432\u043d\u043e\u0441\u0442\u0438\u0020\u043f\u0430\u043a\u0435\u0442\u0430\u002e",
+    "cli.watch.arg.poll_sec": "\u0418\u043d\u0442\u0435\u0440\u0432\u0430\u043b\u0020\u0441\u043a\u0430\u043d\u0438\u0440\u043e\u0432\u0430\u043d\u0438\u044f\u0020\u0432\u0445\u043e\u0434\u044f\u0449\u0435\u0439\u0020\u043f\u0430\u043f\u043a\u0438\u002c\u0020\u0441\u002e",
+    "api.started": "\U0001f310\u0020\u0041\u0050\u0049\u0020\u0437\u0430\u0434\u0430\u043d\u0438\u0439\u003a\u0020\u007b\u0075\u0072\u006c\u007d\u0020\u0028\u043e\u0431\u0440\u0430\u0431\u043e\u0442\u0447\u0438\u043a\u043e\u0432\u003a\u0020\u007b\u006a\u006f\u0062\u0073\u007d\u0029\u002e\u0020\u0043\u0074\u0072\u006c\u002b\u0043\u0020\u2014\u0020\u043e\u0441\u0442\u0430\u043d\u043e\u0432\u043a\u0430\u002e",
+    "api.stopping": "\u041e\u0441\u0442\u0430\u043d\u0430\u0432\u043b\u0438\u0432\u0430\u044e\u0441\u044c\u003a\u0020\u0434\u043e\u0436\u0438\u0434\u0430\u044e\u0441\u044c\u0020\u0437\u0430\u0434\u0430\u043d\u0438\u0439\u0020\u0432\u0020\u0440\u0430\u0431\u043e\u0442\u0435\u2026",
+    "api.job_queued": "\U0001f4e5\u0020\u0417\u0430\u0434\u0430\u043d\u0438\u0435\u0020\u007b\u006a\u006f\u0062\u005f\u0069\u0064\u007d\u003a\u0020\u0444\u0430\u0439\u043b\u043e\u0432\u0020\u007b\u0066\u0069\u006c\u0065\u0073\u007d\u002c\u0020\u0432\u0020\u043e\u0447\u0435\u0440\u0435\u0434\u0438\u0020\u007b\u0064\u0065\u0070\u0074\u0068\u007d",
+    "api.job_finished": "\U0001f4e4\u0020\u0417\u0430\u0434\u0430\u043d\u0438\u0435\u0020\u007b\u006a\u006f\u0062\u005f\u0069\u0064\u007d\u003a\u0020\u007b\u0073\u0074\u0061\u0074\u0075\u0073\u007d",
+    "cli.serve.description": "\u041b\u043e\u043a\u0430\u043b\u044c\u043d\u044b\u0439\u0020\u0048\u0054\u0054\u0050\u0020\u0041\u0050\u0049\u003a\u0020\u043f\u0440\u0438\u0451\u043c\u0020\u0437\u0430\u0434\u0430\u043d\u0438\u0439\u0020\u0028\u0444\u0430\u0439\u043b\u044b\u0020\u0438\u043b\u0438\u0020\u043f\u0443\u0442\u0438\u0020\u043d\u0430\u0020\u0441\u0435\u0440\u0432\u0435\u0440\u0435\u0029\u002c\u0020\u0441\u0442\u0430\u0442\u0443\u0441\u0020\u0438\u0020\u0440\u0435\u0437\u0443\u043b\u044c\u0442\u0430\u0442\u002e",
+    "cli.serve.arg.host": "\u0410\u0434\u0440\u0435\u0441\u0020\u043f\u0440\u043e\u0441\u043b\u0443\u0448\u0438\u0432\u0430\u043d\u0438\u044f\u002e",
+    "cli.serve.arg.port": "\u041f\u043e\u0440\u0442\u002e",
+    "cli.serve.arg.jobs": "\u0421\u043a\u043e\u043b\u044c\u043a\u043e\u0020\u0437\u0430\u0434\u0430\u043d\u0438\u0439\u0020\u043e\u0431\u0440\u0430\u0431\u0430\u0442\u044b\u0432\u0430\u0442\u044c\u0020\u043e\u0434\u043d\u043e\u0432\u0440\u0435\u043c\u0435\u043d\u043d\u043e\u002e",
+    "cli.serve.arg.queue_size": "\u0420\u0430\u0437\u043c\u0435\u0440\u0020\u043e\u0447\u0435\u0440\u0435\u0434\u0438\u0020\u0437\u0430\u0434\u0430\u043d\u0438\u0439\u0020\u0028\u043f\u0440\u0438\u0020\u0437\u0430\u043f\u043e\u043b\u043d\u0435\u043d\u0438\u0438\u0020\u2014\u0020\u0035\u0030\u0033\u0029\u002e"
 },
     "en": {
+    "api.job_finished": "\U0001f4e4 Job {job_id}: {status}",
+    "api.job_queued": "\U0001f4e5 Job {job_id}: {files} file(s), queue depth {depth}",
+    "api.started": "\U0001f310 Job API at {url} ({jobs} workers). Press Ctrl+C to stop.",
+    "api.stopping": "Stopping: waiting for jobs in progress\u2026",
+    "batch.item_done": "\u2705 {tender_id}: done in {elapsed} s",
+    "batch.item_failed": "\u274c {tender_id}: {error}",
+    "batch.item_skipped": "\u23ed {tender_id}: already done",
+    "batch.item_start": "\u25b6 {tender_id}: {files} files",
+    "batch.missing_files": "Files not found: {files}",
+    "batch.no_files": "No files listed for the tender",
+    "batch.skipped": "skipped (already done): {skipped}",
+    "batch.summary": "Tenders: {total} ({ok} ok, {failed} failed) in {elapsed} s, {rate} tenders/hour",
     "button.journal": "Journal",
     "button.process": "Process",
     "button.select_files": "Select files",
     "button.settings": "Settings",
     "button.upload": "Upload",
     "checkbox.auto_delete": "Delete after processing",
+    "cli.arg.document_type": "Document type: selects the system prompt and the response schema.",
     "cli.arg.files": "Paths to files.",
     "cli.arg.language": "Force the interface language.",
     "cli.arg.no_wait_index": "Do not wait for indexing (wait by default).",
     "cli.arg.save_dir": "Directory to additionally save the validated result record (same format as the journal).",
+    "cli.arg.trace": "Save a stage trace of the run as Chrome trace JSON (open in chrome://tracing or Perfetto).",
+    "cli.batch.arg.cleanup_min": "Delete each tender's store after N minutes (0 disables).",
+    "cli.batch.arg.failures": "JSONL file for failures (default: <output>.failures.jsonl).",
+    "cli.batch.arg.jobs": "How many tenders to process concurrently.",
+    "cli.batch.arg.manifest": "Path to the manifest (.jsonl or .csv).",
+    "cli.batch.arg.no_state": "Do not keep job state; every run processes all tenders again.",
+    "cli.batch.arg.output": "JSONL file for results (appended to).",
+    "cli.batch.arg.state": "Job state file (SQLite) used to resume (default: <output>.jobs.sqlite3).",
+    "cli.batch.arg.summary": "Save the run summary to a JSON file.",
+    "cli.batch.arg.verbose": "Print detailed pipeline progress for every tender.",
+    "cli.batch.description": "Process many tenders from a manifest (JSONL or CSV: tender_id -> files or folder).",
+    "cli.batch.stage": "  {stage}, s: {value}",
     "cli.description": "CLI for uploading and processing files via Vector Store",
+    "cli.journal.arg.import_jsonl": "Import existing JSONL journals into SQLite and exit.",
+    "cli.journal.arg.limit": "How many records to print.",
+    "cli.journal.arg.min_elapsed": "Only records that took at least N seconds.",
+    "cli.journal.arg.model": "Only records for this model.",
+    "cli.journal.arg.offset": "How many of the newest records to skip.",
+    "cli.journal.arg.phase": "Record phase: upload, index, response, result, validation_error.",
+    "cli.journal.arg.since": "Start of the time range (ISO, e.g. 2025-10-01 or 2025-10-01T12:00).",
+    "cli.journal.arg.store_id": "Only records for this Vector Store.",
+    "cli.journal.arg.until": "End of the time range (ISO, exclusive).",
+    "cli.journal.description": "Filtered, paginated journal view (`cli.py journal`).",
+    "cli.journal.imported": "Import finished: {files} files, {lines} lines, {imported} added, {skipped} skipped.",
     "cli.language_set": "CLI language: {language_name} ({language_code}).",
     "cli.no_files": "No files selected. Exiting.",
     "cli.processing_error": "Processing error: {error}",
     "cli.processing_start": "\n\u2014 Starting extraction with the system prompt\u2026",
     "cli.saved_result": "\U0001f4be Result also saved: {path}",
+    "cli.serve.arg.host": "Address to listen on.",
+    "cli.serve.arg.jobs": "How many jobs to process concurrently.",
+    "cli.serve.arg.port": "Port.",
+    "cli.serve.arg.queue_size": "Job queue capacity (503 when full).",
+    "cli.serve.description": "Local HTTP API: submit jobs (files or server-side paths), poll status and fetch results.",
+    "cli.stats.arg.group_by": "Grouping: none, model, day, hour, phase.",
+    "cli.stats.arg.json": "Print the report as JSON (for dashboards).",
+    "cli.stats.arg.last": "Window ending now, e.g. 24h, 7d, 30m, 2w (overrides --since).",
+    "cli.stats.description": "Journal summary: latency percentiles, upload throughput, tokens, cost per model and validation failure rate (`cli.py stats`).",
+    "cli.stats.empty": "No journal records in the selected range.",
+    "cli.stats.file_attach_latency": "File attach, s: {value}",
+    "cli.stats.file_speed": "Per-file speed, MB/s: {value}; retries: {retries}",
+    "cli.stats.file_upload_latency": "File upload, s: {value}",
+    "cli.stats.group": "=== {group} ({records} records) ===",
+    "cli.stats.index_latency": "Indexing, s: {value}",
+    "cli.stats.model": "Model {model}: {responses} responses, {total_tokens} tokens (in {input_tokens}, out {output_tokens}), ~${cost_usd} ({unpriced} unpriced)",
+    "cli.stats.response_latency": "Model response, s: {value}",
+    "cli.stats.summary": "n={count} p50={p50} p90={p90} p99={p99} max={max} mean={mean}",
+    "cli.stats.tokens": "Tokens per extraction: {value}",
+    "cli.stats.upload_latency": "Upload, s: {value}",
+    "cli.stats.upload_speed": "Upload speed, MB/s: {total_mb} MB total, {overall} overall; {value}",
+    "cli.stats.validation": "Validation: {results} ok, {errors} errors, failure rate {rate}",
+    "cli.trace_saved": "Trace saved: {path}",
     "cli.upload_error": "Error: {error}",
     "cli.wait_index_disabled": "\u26a0 Indexing skipped (--no-wait-index). Extraction will not start.",
+    "cli.watch.arg.inbox": "Inbox folder (one subfolder per package).",
+    "cli.watch.arg.jobs": "How many packages to process concurrently.",
+    "cli.watch.arg.marker": "Name of the marker file that makes a package ready.",
+    "cli.watch.arg.outbox": "Output folder (processed/, failed/, status.json).",
+    "cli.watch.arg.poll_sec": "Inbox polling interval, s.",
+    "cli.watch.arg.queue_size": "Capacity of the ready-package queue.",
+    "cli.watch.arg.settle_sec": "A package is ready after this many seconds without changes (0: marker only).",
+    "cli.watch.description": "Hot-folder daemon: process tender packages as they appear in an inbox folder.",
     "dialog.error.title": "Error",
     "dialog.invalid_delay.message": "Enter a positive number of minutes greater than or equal to {minimum}.",
     "dialog.invalid_delay.title": "Invalid value",
@@ -120,7 +268,17 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
     "dialog.settings.title": "Settings",
     "dialog.validation_error.message": "The JSON does not conform to the schema. Check the log window for details.",
     "dialog.validation_error.title": "JSON validation",
+    "hotfolder.move_failed": "\u26a0\ufe0f {name}: could not move the package: {error}",
+    "hotfolder.processed": "\U0001f4e4 {name}: done \u2192 {path}",
+    "hotfolder.queued": "\U0001f4e5 {name}: queued (depth {depth})",
+    "hotfolder.recovered": "\u21bb Unfinished packages from the previous run: {count}",
+    "hotfolder.scan_error": "\u26a0\ufe0f Inbox scan failed: {error}",
+    "hotfolder.started": "\U0001f440 Watching {inbox} (outputs in {outbox}, {jobs} at a time). Press Ctrl+C to stop.",
+    "hotfolder.stopping": "Stopping: waiting for packages in progress\u2026",
     "journal.empty": "No records yet.\n",
+    "journal.filter.apply": "Apply",
+    "journal.filter.phase": "Phase:",
+    "journal.filter.store_id": "Store ID:",
     "journal.window_title": "Upload journal",
     "label.delete_delay": "Delay (min):",
     "log.cleanup_done": "\U0001f5d1 Store removed automatically: {store_id}",
@@ -140,6 +298,10 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
     "log.upload_result_header": "\n=== UPLOAD SUMMARY ===",
     "log.upload_start": "\n\u2014 Starting upload\u2026",
     "log.validation_error": "\n\u274c JSON validation error against the system.prompt schema.",
+    "pipeline.index_unconfirmed": "\u26a0\ufe0f Indexing not confirmed: {error}",
+    "pipeline.job_resume": "\u21bb Resuming the job after stage '{stage}'",
+    "pipeline.job_store_gone": "Store {store_id} no longer exists; the files will be uploaded again",
+    "pipeline.job_upload_incomplete": "Not all files were uploaded: {files}",
     "pipeline.missing_store_id": "Upload completed without a store_id.",
     "prompt.extract_instruction": "Extract the data strictly according to the system prompt.",
     "settings.close": "Close",
@@ -5,15 +5,58 @@
 
 По умолчанию кладём файл в <results>/logs/vector_store_journal.jsonl
 (папка results берётся из config.EXCTRACTION_RESULTS_DIR)
+
+Активный файл ротируется по размеру и/или смене дня: закрытый сегмент
+переименовывается в vector_store_journal.<YYYYmmdd-HHMMSS>.jsonl и в фоне
+сжимается в .jsonl.gz; старые сегменты удаляются по политике хранения.
+Чтение (read_last/read_range/iter_records) прозрачно охватывает активный
+файл и все сегменты.
+
+Запись идёт через фоновый JournalWriter: append_log только ставит готовую
+строку в очередь, а поток-писатель пачками (group commit) дописывает их
+одним write() в файл, открытый на O_APPEND, — строки из разных потоков
+не перемешиваются. При выходе интерпретатора очередь сбрасывается на диск.
+Ошибка записи пачки не теряет её молча: пачка повторяется с паузами, затем
+дописывается в LOG_FILE без ротации; то, что не удалось записать никуда,
+учитывается в journal_metrics()["records_lost"]. Глубина очереди, пачки и
+задержка сброса экспортируются и в REGISTRY (/metrics, textfile) как journal_*.
+
+При JOURNAL_BACKEND = "sqlite" / "both" те же пачки пишутся одной транзакцией
+в индексированную базу (infra/journal_db.py); query_journal() выбирает
+бэкенд сам и используется окном журнала в GUI и командой `cli.py journal`.
 """
 
 from __future__ import annotations
 import os
+import atexit
+import gzip
 import json
-from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+import queue
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from infra.config import EXTRACTION_RESULTS_DIR
+from infra.config import (
+    EXTRACTION_RESULTS_DIR,
+    JOURNAL_ASYNC,
+    JOURNAL_BACKEND,
+    JOURNAL_DB_PATH,
+    JOURNAL_FLUSH_INTERVAL_SEC,
+    JOURNAL_FSYNC,
+    JOURNAL_MAX_BATCH,
+    JOURNAL_QUEUE_MAX,
+    JOURNAL_RETENTION_DAYS,
+    JOURNAL_RETENTION_SEGMENTS,
+    JOURNAL_ROTATE_DAILY,
+    JOURNAL_ROTATE_MAX_BYTES,
+)
+from infra.metrics import REGISTRY
+from infra.tracing import current_trace_id
 
 # === Где хранить журнал ===
 LOGS_DIR = os.path.join(EXTRACTION_RESULTS_DIR, "logs")
@@ -50,12 +93,412 @@ def _estimate_cost_usd(model: Optional[str], input_tokens: Optional[int], output
     return round((itok / 1_000_000.0) * input_rate + (otok / 1_000_000.0) * output_rate, 6)
 
 
-def append_log(record: Dict[str, Any]) -> None:
-    """Добавляет произвольную запись в журнал (как JSON в одну строку)."""
+# ============================== РОТАЦИЯ ==============================
+
+_write_lock = threading.Lock()
+_compress_lock = threading.Lock()
+
+
+def _segment_naming() -> Tuple[str, str]:
+    """(папка, префикс имени сегмента) для текущего LOG_FILE."""
+    base = os.path.basename(LOG_FILE)
+    stem = base[:-len(".jsonl")] if base.endswith(".jsonl") else base
+    return os.path.dirname(LOG_FILE), stem + "."
+
+
+def _segment_sort_key(path: str) -> Tuple[str, int]:
+    # vector_store_journal.20251019-153000[-N].jsonl[.gz] -> (метка времени, N)
+    stamp = os.path.basename(path).split(".jsonl")[0].rsplit(".", 1)[-1]
+    parts = stamp.split("-")
+    n = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
+    return "-".join(parts[:2]), n
+
+
+def journal_segments() -> List[str]:
+    """Закрытые сегменты журнала (сжатые и ещё не сжатые) — от старых к новым."""
+    folder, prefix = _segment_naming()
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    active = os.path.basename(LOG_FILE)
+    segs = [
+        os.path.join(folder, n)
+        for n in names
+        if n != active and n.startswith(prefix) and (n.endswith(".jsonl") or n.endswith(".jsonl.gz"))
+    ]
+    segs.sort(key=_segment_sort_key)
+    return segs
+
+
+def _journal_files() -> List[str]:
+    """Все файлы журнала от старых к новым: сегменты + активный файл."""
+    files = journal_segments()
+    if os.path.exists(LOG_FILE):
+        files.append(LOG_FILE)
+    return files
+
+
+def _needs_rotation() -> bool:
+    try:
+        st = os.stat(LOG_FILE)
+    except OSError:
+        return False
+    if st.st_size == 0:
+        return False
+    if JOURNAL_ROTATE_MAX_BYTES and st.st_size >= JOURNAL_ROTATE_MAX_BYTES:
+        return True
+    return bool(JOURNAL_ROTATE_DAILY) and date.fromtimestamp(st.st_mtime) != date.today()
+
+
+def rotate_journal() -> Optional[str]:
+    """
+    Закрывает активный файл как сегмент (имя — по времени последней записи)
+    и запускает фоновое сжатие. Возвращает путь сегмента или None.
+    """
+    try:
+        st = os.stat(LOG_FILE)
+    except OSError:
+        return None
+    folder, prefix = _segment_naming()
+    stamp = datetime.fromtimestamp(st.st_mtime).strftime("%Y%m%d-%H%M%S")
+    # Номер только растёт: имена, освобождённые политикой хранения, не переиспользуем,
+    # иначе новый сегмент отсортировался бы раньше старых
+    taken = [n for st_, n in map(_segment_sort_key, journal_segments()) if st_ == stamp]
+    if taken or os.path.exists(os.path.join(folder, f"{prefix}{stamp}.jsonl")):
+        path = os.path.join(folder, f"{prefix}{stamp}-{max(taken, default=0) + 1}.jsonl")
+    else:
+        path = os.path.join(folder, f"{prefix}{stamp}.jsonl")
+    os.replace(LOG_FILE, path)
+    threading.Thread(target=compress_segments, daemon=True).start()
+    return path
+
+
+def _gzip_segment(path: str) -> None:
+    tmp = path + ".gz.tmp"
+    with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    mtime = os.path.getmtime(path)
+    os.replace(tmp, path + ".gz")
+    os.utime(path + ".gz", (mtime, mtime))
+    os.remove(path)
+
+
+def compress_segments() -> None:
+    """Сжимает несжатые сегменты (в т.ч. оставшиеся после аварийного выхода) и применяет хранение."""
+    with _compress_lock:
+        for path in journal_segments():
+            if path.endswith(".jsonl"):
+                try:
+                    _gzip_segment(path)
+                except OSError:
+                    continue
+        _apply_retention()
+
+
+def _apply_retention() -> None:
+    segs = [p for p in journal_segments() if p.endswith(".gz")]
+    drop = set()
+    if JOURNAL_RETENTION_SEGMENTS and len(segs) > JOURNAL_RETENTION_SEGMENTS:
+        drop.update(segs[:len(segs) - JOURNAL_RETENTION_SEGMENTS])
+    if JOURNAL_RETENTION_DAYS:
+        cutoff = time.time() - JOURNAL_RETENTION_DAYS * 86400
+        for p in segs:
+            try:
+                if os.path.getmtime(p) < cutoff:
+                    drop.add(p)
+            except OSError:
+                continue
+    for p in drop:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+# ============================== ЗАПИСЬ ==============================
+
+_db = None
+_db_lock = threading.Lock()
+
+
+def _jsonl_enabled() -> bool:
+    return JOURNAL_BACKEND in ("jsonl", "both")
+
+
+def _sqlite_enabled() -> bool:
+    return JOURNAL_BACKEND in ("sqlite", "both")
+
+
+def get_journal_db():
+    """SQLite-бэкенд журнала (создаётся при первом обращении)."""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                from infra.journal_db import JournalDB
+                _db = JournalDB(JOURNAL_DB_PATH)
+    return _db
+
+
+def _db_row(record: Dict[str, Any], line: str):
+    if not _sqlite_enabled():
+        return None
+    from infra.journal_db import record_columns
+    return record_columns(record, line)
+
+
+def _commit_batch(items: List[Tuple[str, Any]], fsync: bool = False) -> None:
+    """Пишет пачку (строка JSONL, строка для БД) во включённые бэкенды."""
+    if _jsonl_enabled():
+        _write_lines([line for line, _ in items], fsync=fsync)
+    rows = [row for _, row in items if row is not None]
+    if rows:
+        get_journal_db().insert_rows(rows)
+
+
+def _write_lines(lines: List[str], fsync: bool = False) -> None:
+    """
+    Дописывает готовые строки одним write() в файл на O_APPEND.
+    Под _write_lock — чтобы ротация и запись из разных потоков не пересекались.
+    """
+    data = "".join(lines).encode("utf-8")
     _ensure_jsonl_file()
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        json.dump(record, f, ensure_ascii=False)
-        f.write("\n")
+    with _write_lock:
+        if _needs_rotation():
+            rotate_journal()
+        fd = os.open(LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _append_plain(lines: List[str]) -> None:
+    """Запасной путь: дописать строки в LOG_FILE без ротации (если сломалась она или SQLite)."""
+    with _write_lock:
+        with open(LOG_FILE, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+
+_STOP = object()
+_RETRY_DELAYS = (0.05, 0.2, 0.8)   # паузы между попытками записи пачки фоновым писателем
+
+
+class JournalWriter:
+    """
+    Фоновый писатель журнала. Записи копятся в очереди и пишутся пачками:
+    пачка закрывается по flush_interval, по max_batch или по запросу flush().
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = JOURNAL_FLUSH_INTERVAL_SEC,
+        max_batch: int = JOURNAL_MAX_BATCH,
+        fsync: str = JOURNAL_FSYNC,
+        queue_max: int = JOURNAL_QUEUE_MAX,
+    ):
+        self.flush_interval = float(flush_interval)
+        self.max_batch = max(1, int(max_batch))
+        self.fsync = fsync
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_max)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._records = 0
+        self._batches = 0
+        self._errors = 0
+        self._fallbacks = 0
+        self._lost = 0
+        self._last_error: Optional[str] = None
+        self._last_flush_ms: Optional[float] = None
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        # Сериализуем в вызывающем потоке: дальнейшие изменения record не попадут в журнал
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._ensure_started()
+        self._queue.put((line, _db_row(record, line)))
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Дожидается записи всего, что было в очереди на момент вызова."""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "records_written": self._records,
+                "batches": self._batches,
+                "errors": self._errors,
+                "fallback_batches": self._fallbacks,
+                "records_lost": self._lost,
+                "last_error": self._last_error,
+                "last_flush_ms": self._last_flush_ms,
+                "avg_flush_ms": round(self._total_flush_ms / self._batches, 3) if self._batches else None,
+                "max_flush_ms": round(self._max_flush_ms, 3),
+                "fsync": self.fsync,
+            }
+
+    def _collect(self):
+        """Семейства для REGISTRY (/metrics и textfile): очередь, пачки, задержка сброса."""
+        with self._stats_lock:
+            depth = self._queue.qsize()
+            counters = (
+                ("journal_records_written_total", "Journal records written.", self._records),
+                ("journal_batches_total", "Journal batches committed.", self._batches),
+                ("journal_write_errors_total", "Journal write errors (each retry counts).", self._errors),
+                ("journal_fallback_batches_total", "Journal batches appended to LOG_FILE as a fallback.", self._fallbacks),
+                ("journal_records_lost_total", "Journal records written to no backend.", self._lost),
+                ("journal_flush_seconds_total", "Total time spent committing journal batches.", self._total_flush_ms / 1000.0),
+            )
+            last = round((self._last_flush_ms or 0.0) / 1000.0, 6)
+            longest = self._max_flush_ms / 1000.0
+        families = [
+            ("journal_queue_depth", "gauge", "Journal records waiting for the writer.",
+             [("journal_queue_depth", {}, depth)]),
+            ("journal_last_flush_seconds", "gauge", "Duration of the last journal batch commit.",
+             [("journal_last_flush_seconds", {}, last)]),
+            ("journal_max_flush_seconds", "gauge", "Longest journal batch commit.",
+             [("journal_max_flush_seconds", {}, longest)]),
+        ]
+        families += [(name, "counter", help, [(name, {}, value)]) for name, help, value in counters]
+        return families
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Tuple[str, Any]] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit(batch)
+            for ev in waiters:
+                ev.set()
+            if stop:
+                return
+
+    def _error(self, e: BaseException) -> None:
+        with self._stats_lock:
+            self._errors += 1
+            self._last_error = f"{type(e).__name__}: {e}"
+
+    def _attempt(self, fn, *args: Any) -> bool:
+        """fn(*args) с повторами по _RETRY_DELAYS; False — если все попытки упали."""
+        for delay in (0.0,) + _RETRY_DELAYS:
+            if delay:
+                time.sleep(delay)
+            try:
+                fn(*args)
+                return True
+            except (OSError, sqlite3.Error) as e:
+                self._error(e)
+        return False
+
+    def _commit(self, batch: List[Tuple[str, Any]]) -> None:
+        """
+        Пишет пачку в каждый бэкенд отдельно, с повторами. Если JSONL не
+        пишется (например, сломалась ротация или сжатие) или SQLite заблокирована
+        при выключенном JSONL — строки дописываются в LOG_FILE без ротации
+        (для SQLite их потом подхватит import_jsonl). Потеря пачки видна в
+        metrics()["records_lost"] и в stderr.
+        """
+        started = time.perf_counter()
+        lines = [line for line, _ in batch]
+        in_jsonl = _jsonl_enabled() and self._attempt(_write_lines, lines, self.fsync == "batch")
+        rows = [row for _, row in batch if row is not None]
+        in_db = bool(rows) and self._attempt(get_journal_db().insert_rows, rows)
+        if not in_jsonl and (_jsonl_enabled() or not in_db):
+            try:
+                _append_plain(lines)
+                with self._stats_lock:
+                    self._fallbacks += 1
+            except OSError as e:
+                self._error(e)
+                if not in_db:
+                    with self._stats_lock:
+                        self._lost += len(batch)
+                    print(f"[journal] потеряно записей: {len(batch)} ({self._last_error})", file=sys.stderr)
+                    return
+        took_ms = (time.perf_counter() - started) * 1000.0
+        with self._stats_lock:
+            self._records += len(batch)
+            self._batches += 1
+            self._last_flush_ms = round(took_ms, 3)
+            self._total_flush_ms += took_ms
+            self._max_flush_ms = max(self._max_flush_ms, took_ms)
+
+
+_writer = JournalWriter()
+atexit.register(_writer.close)
+REGISTRY.add_collector(_writer._collect)
+
+
+def append_log(record: Dict[str, Any]) -> None:
+    """
+    Добавляет произвольную запись в журнал (как JSON в одну строку).
+    Внутри активной трассы (infra/tracing.py) к записи добавляется trace_id.
+    """
+    if "trace_id" not in record:
+        trace_id = current_trace_id()
+        if trace_id:
+            record = dict(record, trace_id=trace_id)
+    if JOURNAL_ASYNC:
+        _writer.submit(record)
+    else:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        _commit_batch([(line, _db_row(record, line))], fsync=JOURNAL_FSYNC != "never")
+
+
+def flush_journal(timeout: Optional[float] = 5.0) -> bool:
+    """Сбрасывает очередь фонового писателя на диск (перед чтением журнала)."""
+    return _writer.flush(timeout)
+
+
+def journal_metrics() -> Dict[str, Any]:
+    """Метрики писателя: глубина очереди, число записей/пачек, задержка сброса."""
+    return _writer.metrics()
 
 
 def append_upload_entry(
@@ -64,13 +507,24 @@ def append_upload_entry(
     files: Iterable[Tuple[str, int]],
     elapsed_sec: float,
     avg_speed_kb_s: Optional[float],
+    file_stats: Optional[Iterable[Dict[str, Any]]] = None,
 ) -> None:
-    """Логирует этап отправки/индексации."""
+    """
+    Логирует этап отправки/индексации.
+    file_stats — пофайловые замеры в порядке files (upload_sec, attach_sec,
+    mb_s, retries, …); добавляются в записи поля files.
+    """
+    files = list(files)
+    stats = list(file_stats or ())
+    stats += [{}] * (len(files) - len(stats))
     entry = {
         "ts": _iso_now(),
         "phase": "upload",
         "store_id": store_id,
-        "files": [{"name": os.path.basename(p), "size_bytes": int(sz)} for p, sz in files],
+        "files": [
+            dict({"name": os.path.basename(p), "size_bytes": int(sz)}, **st)
+            for (p, sz), st in zip(files, stats)
+        ],
         "upload": {
             "elapsed_sec": round(float(elapsed_sec), 3),
             "avg_speed_kb_s": round(float(avg_speed_kb_s), 3) if avg_speed_kb_s is not None else None,
@@ -107,38 +561,241 @@ def append_response_entry(
     append_log(entry)
 
 
+def append_index_entry(
+    *,
+    store_id: Optional[str],
+    elapsed_sec: float,
+    status: str,
+    polls: int,
+) -> None:
+    """Логирует ожидание индексации Vector Store (сколько ждали и чем закончилось)."""
+    entry = {
+        "ts": _iso_now(),
+        "phase": "index",
+        "store_id": store_id,
+        "index": {
+            "elapsed_sec": round(float(elapsed_sec), 3),
+            "status": status,
+            "polls": int(polls),
+        },
+    }
+    append_log(entry)
+
+
+# Размер блока для чтения журнала с конца
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _iter_lines_reverse(path: str, block_size: int = _TAIL_BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    Отдаёт непустые строки файла с конца, читая блоками через seek.
+    Режем по байту b"\n" — в UTF-8 он не встречается внутри многобайтовых
+    символов, поэтому декодируются только целые строки и граница блока
+    не может разрезать символ. Память — один блок плюс хвост текущей строки.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines[0]  # начало строки может быть в предыдущем блоке
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def _iter_lines_forward(path: str) -> Iterator[bytes]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def _decode(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        try:
+            yield json.loads(line.decode("utf-8"))
+        except Exception:
+            continue
+
+
+def _iter_records_reverse(need: int, match=None) -> Iterator[Dict[str, Any]]:
+    """
+    Записи журнала от новых к старым по всем файлам; битые строки пропускаются.
+    Несжатые файлы читаются с конца; gzip-сегмент приходится читать с начала,
+    но в памяти держим только последние need подходящих записей (deque).
+    """
+    for path in reversed(_journal_files()):
+        try:
+            if path.endswith(".gz"):
+                records = _decode(_iter_lines_forward(path))
+                if match is not None:
+                    records = filter(match, records)
+                for rec in reversed(deque(records, maxlen=need)):
+                    yield rec
+            else:
+                records = _decode(_iter_lines_reverse(path))
+                if match is not None:
+                    records = filter(match, records)
+                for rec in records:
+                    yield rec
+        except FileNotFoundError:
+            continue  # сегмент сжали/удалили во время чтения
+
+
+def iter_records(since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Все записи журнала в хронологическом порядке (сегменты + активный файл).
+    Потоковое чтение с постоянной памятью — для аналитики.
+    since/until (ISO-время) ограничивают интервал; без JSONL-бэкенда
+    записи читаются из SQLite по индексу ts.
+    """
+    flush_journal()
+    if not _jsonl_enabled():
+        yield from get_journal_db().iter_records(since=since, until=until)
+        return
+    for path in _journal_files():
+        try:
+            for rec in _decode(_iter_lines_forward(path)):
+                ts = str(rec.get("ts") or "")
+                if since and ts < since:
+                    continue
+                if until and ts >= until:
+                    continue
+                yield rec
+        except FileNotFoundError:
+            continue
+
+
+def read_range(offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Страница журнала для просмотрщиков: пропускает offset самых новых записей
+    и возвращает следующие limit (в хронологическом порядке).
+    Читает с конца — память ограничена offset + limit, а не размером журнала.
+    """
+    if limit <= 0:
+        return []
+    flush_journal()
+    out: List[Dict[str, Any]] = []
+    skipped = 0
+    for rec in _iter_records_reverse(offset + limit):
+        if skipped < offset:
+            skipped += 1
+            continue
+        out.append(rec)
+        if len(out) >= limit:
+            break
+    out.reverse()
+    return out
+
+
 def read_last(n: int = 50) -> List[Dict[str, Any]]:
     """Читает последние n записей журнала (если нужно быстро посмотреть в консоли/GUI)."""
-    if not os.path.exists(LOG_FILE):
+    if not _jsonl_enabled():
+        return query_journal(limit=n)
+    return read_range(0, n)
+
+
+def _record_matches(rec: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    for key in ("phase", "store_id", "model"):
+        if filters.get(key) and rec.get(key) != filters[key]:
+            return False
+    ts = str(rec.get("ts") or "")
+    if filters.get("since") and ts < filters["since"]:
+        return False
+    if filters.get("until") and ts >= filters["until"]:
+        return False
+    if filters.get("min_elapsed") is not None or filters.get("max_elapsed") is not None:
+        from infra.journal_db import section_value
+        elapsed = section_value(rec, "elapsed_sec")
+        if not isinstance(elapsed, (int, float)):
+            return False
+        if filters.get("min_elapsed") is not None and elapsed < filters["min_elapsed"]:
+            return False
+        if filters.get("max_elapsed") is not None and elapsed > filters["max_elapsed"]:
+            return False
+    return True
+
+
+def query_journal(
+    *,
+    phase: Optional[str] = None,
+    store_id: Optional[str] = None,
+    model: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    min_elapsed: Optional[float] = None,
+    max_elapsed: Optional[float] = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Записи журнала по фильтрам (фаза, store, модель, интервал времени, длительность)
+    с пагинацией от самых новых; результат — в хронологическом порядке.
+    С SQLite-бэкендом — запрос по индексам, иначе — чтение JSONL с конца.
+    """
+    filters = {
+        "phase": phase, "store_id": store_id, "model": model,
+        "since": since, "until": until,
+        "min_elapsed": min_elapsed, "max_elapsed": max_elapsed,
+    }
+    if _sqlite_enabled():
+        flush_journal()
+        return get_journal_db().query(limit=limit, offset=offset, **filters)
+    if limit <= 0:
         return []
-    with open(LOG_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-    lines = lines[-n:]
+    flush_journal()
     out: List[Dict[str, Any]] = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            out.append(json.loads(line))
-        except Exception:
+    skipped = 0
+    match = lambda rec: _record_matches(rec, filters)  # noqa: E731
+    for rec in _iter_records_reverse(offset + limit, match):
+        if skipped < offset:
+            skipped += 1
             continue
+        out.append(rec)
+        if len(out) >= limit:
+            break
+    out.reverse()
     return out
-def append_result_entry(clean_json_str: str, note: str = None):
+
+
+def import_jsonl_to_db() -> Dict[str, int]:
+    """Перенос JSONL-журналов (с сегментами) в SQLite; повторный запуск добавляет только новые строки."""
+    flush_journal()
+    return get_journal_db().import_jsonl(_journal_files())
+
+
+def append_result_entry(result: Any, note: str = None, store_id: Optional[str] = None):
     """
     Пишет в журнал валидированный результат модели.
-    clean_json_str — строка JSON, прошедшая validate_and_dump_json (exclude_none=True).
+    result — ValidatedResult (используется готовый dict, без повторного разбора)
+             или строка JSON, прошедшая validate_and_dump_json (exclude_none=True).
     """
-    try:
-        payload = json.loads(clean_json_str)
-    except Exception:
-        payload = {"raw_text": (clean_json_str[:2000] + "…") if len(clean_json_str) > 2000 else clean_json_str}
+    payload = getattr(result, "data", None)
+    if payload is None:
+        clean_json_str = str(result)
+        try:
+            payload = json.loads(clean_json_str)
+        except Exception:
+            payload = {"raw_text": (clean_json_str[:2000] + "…") if len(clean_json_str) > 2000 else clean_json_str}
 
     rec = {
         "ts": datetime.now().isoformat(timespec="seconds"),
         "phase": "result",
         "result": payload,
     }
+    if store_id:
+        rec["store_id"] = store_id
+    schema = getattr(result, "schema", None)
+    if schema:
+        rec["schema"] = schema
     if note:
         rec["note"] = note
     append_log(rec)
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+infra/metrics.py — метрики процесса в формате Prometheus (text exposition 0.0.4).
+
+Реестр счётчиков и гистограмм живёт в памяти процесса. Снаружи его можно:
+  * опрашивать по HTTP: start_http_server(port) -> GET /metrics;
+  * выгружать в файл для node_exporter textfile collector: write_textfile(path)
+    (атомарно, через временный файл и os.replace).
+
+Горячий путь (inc/observe) — это поиск набора меток в словаре и короткая
+критическая секция с парой сложений; границу корзины гистограммы ищем
+bisect-ом до захвата блокировки. Значения, которые и так где-то считаются
+(например, статистика lru_cache), отдаются через коллекторы — они
+вызываются только при выгрузке.
+
+Настройки экспорта — METRICS_* в infra/config.py; ensure_exporters()
+запускает их один раз за процесс.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from infra.config import (
+    METRICS_HOST,
+    METRICS_NAMESPACE,
+    METRICS_PORT,
+    METRICS_TEXTFILE_INTERVAL_SEC,
+    METRICS_TEXTFILE_PATH,
+)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+# Корзины по умолчанию — секунды: от быстрых HTTP-вызовов до долгих ответов модели
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# ============================== МЕТРИКИ ==============================
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: ожидаются метки {self.labelnames}, получено {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> Iterator[Sample]:  # pragma: no cover - переопределяется
+        return iter(())
+
+
+class Counter(_Metric):
+    """Монотонный счётчик: inc(amount, **labels)."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        # в формате 0.0.4 имя семейства счётчика совпадает с именем сэмпла (…_total)
+        super().__init__(name if name.endswith("_total") else name + "_total", help, labelnames)
+        self._values: Dict[LabelValues, float] = {} if labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels) if labels or self.labelnames else ()
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными корзинами: observe(value, **labels) и time(**labels)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # для набора меток: [счётчики по корзинам (+Inf последней), сумма]
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels) if labels or self.labelnames else ()
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][idx] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = [(k, list(v[0]), v[1]) for k, v in self._series.items()]
+        for key, counts, total in sorted(items):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield self.name + "_bucket", dict(labels, le=_format_value(bound)), cumulative
+            yield self.name + "_sum", labels, total
+            yield self.name + "_count", labels, cumulative
+
+
+# ============================== РЕЕСТР ==============================
+
+Collector = Callable[[], Iterable[Tuple[str, str, str, Iterable[Sample]]]]
+
+
+class Registry:
+    """Набор метрик процесса; render() — текст для /metrics."""
+
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _full_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        full = self._full_name(name)
+        with self._lock:
+            metric = self._metrics.get(full)
+            if metric is None:
+                metric = self._metrics[full] = cls(full, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Метрика {full} уже зарегистрирована с другим типом или метками")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)  # type: ignore[return-value]
+
+    def add_collector(self, collector: Collector) -> None:
+        """collector() -> [(имя, тип, help, [(имя_сэмпла, метки, значение), ...]), ...]; вызывается при render()."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def emit(name: str, kind: str, help: str, samples: Iterable[Sample]) -> None:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+            collectors = list(self._collectors)
+        for metric in metrics:
+            emit(metric.name, metric.kind, metric.help, metric.samples())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                continue
+            for name, kind, help, samples in families:
+                emit(self._full_name(name), kind, help,
+                     ((self._full_name(s), labels, v) for s, labels, v in samples))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry(METRICS_NAMESPACE)
+
+# ============================ МЕТРИКИ КОНВЕЙЕРА ============================
+
+FILES_UPLOADED = REGISTRY.counter("files_uploaded", "Files uploaded to /files.", ["status"])
+UPLOAD_BYTES = REGISTRY.counter("upload_bytes", "Bytes uploaded to /files.")
+UPLOAD_SECONDS = REGISTRY.histogram("upload_duration_seconds", "Per-file upload duration.")
+ATTACH_SECONDS = REGISTRY.histogram("attach_duration_seconds", "Attaching a file to a Vector Store.", ["status"])
+INDEX_SECONDS = REGISTRY.histogram("index_wait_seconds", "Waiting for Vector Store indexing.", ["outcome"])
+RESPONSE_SECONDS = REGISTRY.histogram("response_duration_seconds", "Responses API call duration.", ["model", "status"])
+RESPONSE_TOKENS = REGISTRY.counter("response_tokens", "Tokens reported by the Responses API.", ["model", "kind"])
+HTTP_RETRIES = REGISTRY.counter("http_retries", "Retried HTTP requests to the API.", ["operation"])
+EXTRACTIONS = REGISTRY.counter("extractions", "Extraction runs by outcome.", ["schema", "status"])
+VALIDATION_FAILURES = REGISTRY.counter("validation_failures", "Model outputs that failed schema validation.", ["schema"])
+PIPELINE_SECONDS = REGISTRY.histogram("pipeline_duration_seconds", "End-to-end run_pipeline duration.", ["status"])
+CLEANUPS = REGISTRY.counter("cleanups", "Vector Store cleanup outcomes.", ["outcome"])
+HOTFOLDER_PACKAGES = REGISTRY.counter("hotfolder_packages", "Hot-folder packages by outcome.", ["status"])
+HOTFOLDER_SECONDS = REGISTRY.histogram(
+    "hotfolder_latency_seconds", "Hot-folder package latency from detection to outbox.", ["status"],
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 3600.0),
+)
+API_JOBS = REGISTRY.counter("api_jobs", "Job API submissions by state transition.", ["status"])
+API_JOB_SECONDS = REGISTRY.histogram(
+    "api_job_latency_seconds", "Job API latency from submission to a final state.", ["status"],
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 3600.0),
+)
+
+
+def _cache_collector() -> Iterable[Tuple[str, str, str, Iterable[Sample]]]:
+    """Попадания/промахи lru_cache-кэшей валидатора и нормализации (без затрат на горячем пути)."""
+    from infra import models, normalize
+
+    caches = {
+        "validator": models.get_validator,
+        "parse_date": normalize.parse_date,
+        "parse_period": normalize._parse_period,
+        "parse_quantity": normalize.parse_quantity,
+        "parse_money": normalize._parse_money,
+        "parse_terms": normalize._parse_terms,
+    }
+    hits: List[Sample] = []
+    misses: List[Sample] = []
+    for name, fn in caches.items():
+        info = fn.cache_info()
+        hits.append(("cache_hits_total", {"cache": name}, info.hits))
+        misses.append(("cache_misses_total", {"cache": name}, info.misses))
+    return [
+        ("cache_hits_total", "counter", "In-process cache hits.", hits),
+        ("cache_misses_total", "counter", "In-process cache misses.", misses),
+    ]
+
+
+REGISTRY.add_collector(_cache_collector)
+
+
+# ============================== ЭКСПОРТ ==============================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: Registry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802 - имя задаёт BaseHTTPRequestHandler
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # не засоряем stdout запросами скрейпера
+        pass
+
+
+def start_http_server(port: int, addr: str = METRICS_HOST, registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Поднимает /metrics в фоновом потоке; возвращает сервер (server.shutdown() — остановка)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((addr, int(port)), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_textfile(path: str, registry: Registry = REGISTRY) -> None:
+    """Атомарно пишет метрики в файл (*.prom) для node_exporter textfile collector."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+def _textfile_loop(path: str, interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            write_textfile(path)
+        except OSError:
+            pass
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def ensure_exporters() -> None:
+    """Запускает экспорт по настройкам (METRICS_PORT / METRICS_TEXTFILE_PATH) один раз за процесс."""
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    if METRICS_PORT:
+        try:
+            start_http_server(METRICS_PORT)
+        except OSError:
+            pass  # порт занят другим воркером — метрики останутся доступны через textfile
+    if METRICS_TEXTFILE_PATH:
+        threading.Thread(
+            target=_textfile_loop,
+            args=(METRICS_TEXTFILE_PATH, float(METRICS_TEXTFILE_INTERVAL_SEC)),
+            name="metrics-textfile",
+            daemon=True,
+        ).start()
+        atexit.register(lambda: write_textfile(METRICS_TEXTFILE_PATH))
+
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "FILES_UPLOADED",
+    "UPLOAD_BYTES",
+    "UPLOAD_SECONDS",
+    "ATTACH_SECONDS",
+    "INDEX_SECONDS",
+    "RESPONSE_SECONDS",
+    "RESPONSE_TOKENS",
+    "HTTP_RETRIES",
+    "EXTRACTIONS",
+    "VALIDATION_FAILURES",
+    "PIPELINE_SECONDS",
+    "CLEANUPS",
+    "HOTFOLDER_PACKAGES",
+    "HOTFOLDER_SECONDS",
+    "API_JOBS",
+    "API_JOB_SECONDS",
+    "start_http_server",
+    "write_textfile",
+    "ensure_exporters",
+]
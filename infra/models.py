@@ -1,16 +1,23 @@
 # -*- coding: utf-8 -*-
 """
-infra/models.py — Pydantic-модели под схему из system.prompt
-и функция validate_and_dump_json с очисткой Markdown-кодблоков.
+infra/models.py — Pydantic-модели под схемы из prompts/*.prompt.md,
+реестр схем (выбор по front-matter промпта, валидаторы строятся один раз)
+и функции validate_extraction / validate_and_dump_json с очисткой Markdown-кодблоков.
 """
 
 from __future__ import annotations
 
 import json
+import os
 import re
-from typing import Optional, List, Literal
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Literal, Type
 
-from pydantic import BaseModel, Field, ConfigDict, ValidationError
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, ValidationError
+
+from infra.json_scan import iter_candidates_by_start
+from infra.normalize import normalize_extract
 
 
 # =========================== МОДЕЛИ ПОД СХЕМУ ===========================
@@ -76,6 +83,183 @@ class TenderExtract(BaseModel):
     uncertainties: List[UncertaintyItem]
 
 
+class ContractInfo(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    number: Optional[str] = None
+    # Дата в формате YYYY-MM-DD — как строка
+    date: Optional[str] = None
+    subject: Optional[str] = None
+
+
+class ContractParties(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    customer: Optional[str] = None
+    supplier: Optional[str] = None
+
+
+class ContractPrice(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    amount: Optional[float] = None
+    currency: Optional[str] = None
+    vat_included: Optional[bool] = None
+
+
+class ContractExtract(BaseModel):
+    """
+    Корневая схема ответа по contract_extractor_system.prompt.md:
+      {
+        "contract": {...},
+        "parties": {...},
+        "price": {...},
+        "delivery": {...},
+        "payment_terms": null | str,
+        "penalties": null | str,
+        "evidence": [ ... ],
+        "uncertainties": [ ... ]
+      }
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    contract: ContractInfo
+    parties: ContractParties
+    price: ContractPrice
+    delivery: Delivery
+    payment_terms: Optional[str] = None
+    penalties: Optional[str] = None
+    evidence: List[EvidenceItem]
+    uncertainties: List[UncertaintyItem]
+
+
+class PriceRequestInfo(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    number: Optional[str] = None
+    customer: Optional[str] = None
+    # Крайний срок подачи предложения, YYYY-MM-DD
+    response_deadline: Optional[str] = None
+
+
+class PriceRequestItem(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    name: Optional[str] = None
+    qty: Optional[int] = None
+    unit: Optional[str] = None
+    condition: Optional[Literal["new", "used"]] = None
+
+
+class PriceRequestExtract(BaseModel):
+    """
+    Корневая схема ответа по price_request_extractor_system.prompt.md:
+      {
+        "request": {...},
+        "items": [ ... ],
+        "delivery": {...},
+        "payment_terms": null | str,
+        "evidence": [ ... ],
+        "uncertainties": [ ... ]
+      }
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    request: PriceRequestInfo
+    items: List[PriceRequestItem]
+    delivery: Delivery
+    payment_terms: Optional[str] = None
+    evidence: List[EvidenceItem]
+    uncertainties: List[UncertaintyItem]
+
+
+# ============================== РЕЕСТР СХЕМ ==============================
+# Ключ схемы — "<name>@<version>"; промпт объявляет его во front-matter:
+#   schema: tender_extract
+#   schema_version: 1
+# Промпты без этих полей валидируются по DEFAULT_SCHEMA.
+
+DEFAULT_SCHEMA = "tender_extract@1"
+
+_SCHEMAS: Dict[str, Type[BaseModel]] = {}
+_registry_lock = threading.Lock()
+
+
+def schema_key(name: str, version: Any) -> str:
+    return f"{str(name).strip()}@{str(version).strip()}"
+
+
+def register_schema(name: str, version: Any, model: Type[BaseModel]) -> str:
+    """Регистрирует корневую модель под ключом name@version и возвращает ключ."""
+    key = schema_key(name, version)
+    with _registry_lock:
+        _SCHEMAS[key] = model
+    get_validator.cache_clear()
+    return key
+
+
+def registered_schemas() -> Dict[str, Type[BaseModel]]:
+    with _registry_lock:
+        return dict(_SCHEMAS)
+
+
+@lru_cache(maxsize=None)
+def get_validator(schema: str = DEFAULT_SCHEMA) -> TypeAdapter:
+    """
+    TypeAdapter для схемы: строится при первом обращении и кэшируется,
+    так что на каждый ответ нет накладных расходов на сборку валидатора.
+    """
+    with _registry_lock:
+        model = _SCHEMAS.get(schema)
+    if model is None:
+        raise KeyError(f"Неизвестная схема ответа: {schema}")
+    return TypeAdapter(model)
+
+
+register_schema("tender_extract", 1, TenderExtract)
+register_schema("contract_extract", 1, ContractExtract)
+register_schema("price_request_extract", 1, PriceRequestExtract)
+
+
+_FRONT_MATTER_RE = re.compile(r"\A\ufeff?---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+
+
+def parse_front_matter(text: str) -> Dict[str, str]:
+    """
+    Разбирает простой front-matter промпта (строки «ключ: значение» между ---).
+    Вложенные структуры не поддерживаются — в промптах их нет.
+    """
+    m = _FRONT_MATTER_RE.match(text)
+    if not m:
+        return {}
+    meta: Dict[str, str] = {}
+    for line in m.group(1).splitlines():
+        if ":" not in line or line.lstrip().startswith("#"):
+            continue
+        key, value = line.split(":", 1)
+        meta[key.strip()] = value.strip().strip("\"'")
+    return meta
+
+
+@lru_cache(maxsize=64)
+def _schema_for_prompt_cached(path: str, _mtime: float) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        meta = parse_front_matter(f.read())
+    name = meta.get("schema")
+    if not name:
+        return DEFAULT_SCHEMA
+    return schema_key(name, meta.get("schema_version", "1"))
+
+
+def schema_for_prompt(path: str) -> str:
+    """Ключ схемы, объявленный во front-matter промпта (кэшируется по mtime файла)."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return DEFAULT_SCHEMA
+    return _schema_for_prompt_cached(os.path.abspath(path), mtime)
+
+
 # ======================== ОЧИСТКА И ВАЛИДАЦИЯ ==========================
 
 _CODE_FENCE_RE = re.compile(
@@ -92,61 +276,98 @@ def _strip_markdown_code_fences(text: str) -> str:
     return m.group(1).strip() if m else text.strip()
 
 
-def _coerce_to_json_object(text: str) -> str:
+def _is_json_syntax_error(err: ValidationError) -> bool:
+    """True, если Pydantic упал на разборе JSON, а не на несоответствии схеме."""
+    return any(e.get("type") == "json_invalid" for e in err.errors())
+
+
+class ValidatedResult:
     """
-    Если в тексте есть «мусор» до/после и Pydantic не смог распарсить,
-    пытаемся вырезать первый JSON-объект по балансу скобок.
-    Возвращаем как строку (JSON).
+    Результат валидации ответа модели: всё, что нужно потребителям, за один разбор.
+
+    model      — экземпляр Pydantic-модели (TenderExtract, ContractExtract, …)
+    data       — dict (model_dump(exclude_none=True)), готовый для записи в журнал/файл
+    clean_json — компактная JSON-строка того же содержимого (без None, без ASCII-эскейпа)
+    schema     — ключ схемы из реестра, по которой шла валидация
+    normalized — типизированные даты/сроки/суммы рядом с исходными строками
+                 (infra.normalize, считается при первом обращении)
     """
-    s = text.strip()
-    # быстрый путь — уже валидный JSON-объект
-    if s.startswith("{") and s.endswith("}"):
-        return s
 
-    # вырезаем самый внешний {...} по балансу
-    start = s.find("{")
-    if start == -1:
-        return s  # пусть провалится на валидации
+    __slots__ = ("model", "data", "clean_json", "schema", "_normalized")
+
+    def __init__(self, model: BaseModel, data: Dict[str, Any], clean_json: str, schema: str = DEFAULT_SCHEMA):
+        self.model = model
+        self.data = data
+        self.clean_json = clean_json
+        self.schema = schema
+        self._normalized: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @classmethod
+    def from_model(cls, obj: BaseModel, schema: str = DEFAULT_SCHEMA) -> "ValidatedResult":
+        # Сериализуем уже провалидированный объект — повторного разбора текста нет
+        return cls(
+            model=obj,
+            data=obj.model_dump(exclude_none=True),
+            clean_json=obj.model_dump_json(exclude_none=True),
+            schema=schema,
+        )
 
-    depth = 0
-    for i in range(start, len(s)):
-        ch = s[i]
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                candidate = s[start:i + 1]
-                # проверим, что это реально JSON-объект
-                try:
-                    json.loads(candidate)
-                    return candidate
-                except Exception:
-                    break
-    return s  # не удалось — оставляем как есть
+    @property
+    def normalized(self) -> Dict[str, Dict[str, Any]]:
+        if self._normalized is None:
+            self._normalized = normalize_extract(self.data)
+        return self._normalized
 
+    def pretty(self) -> str:
+        """Человекочитаемый JSON для консоли/GUI (строится из dict, без json.loads)."""
+        return json.dumps(self.data, ensure_ascii=False, indent=2)
 
-def validate_and_dump_json(model_output_text: str) -> str:
+    def __str__(self) -> str:
+        return self.clean_json
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return "ValidatedResult(model={}, size={})".format(type(self.model).__name__, len(self.clean_json))
+
+
+def validate_extraction(model_output_text: str, schema: str = DEFAULT_SCHEMA) -> ValidatedResult:
     """
-    Валидирует JSON-строку от LLM по схеме TenderExtract.
+    Валидирует ответ LLM по схеме из реестра (по умолчанию TenderExtract)
+    и возвращает ValidatedResult.
     1) Убирает Markdown-кодблоки ```...```
-    2) Пытается вырезать первый JSON-объект, если есть лишний текст
-    3) Валидирует через Pydantic
-    Возвращает аккуратно сериализованный JSON (exclude_none=True).
+    2) Валидирует через Pydantic (быстрый путь — ровно один разбор текста)
+    3) Если есть лишний текст — вырезает первый JSON-объект и валидирует его
     Бросает ValidationError при несоответствии схеме.
     """
     # Шаг 1: убираем ```json ... ```
     text = _strip_markdown_code_fences(model_output_text)
+    validator = get_validator(schema)
 
-    # Шаг 2: если дальше будет ошибка — попробуем «добыть» { ... }
+    # Шаг 2: быстрый путь — текст уже является JSON-объектом
     try:
-        obj = TenderExtract.model_validate_json(text)
-    except ValidationError:
-        text2 = _coerce_to_json_object(text)
-        obj = TenderExtract.model_validate_json(text2)
-
-    # Шаг 3: сериализуем обратно без None и без ASCII-эскейпа
-    return json.dumps(
-        obj.model_dump(exclude_none=True),
-        ensure_ascii=False
-    )
+        obj = validator.validate_json(text)
+    except ValidationError as first_error:
+        # Валидный JSON не той схемы — вырезать нечего
+        if not _is_json_syntax_error(first_error):
+            raise
+        # Шаг 3: ищем первый JSON-объект в прозе (сканер понимает строки и экранирование)
+        obj = None
+        for candidate in iter_candidates_by_start(text):
+            try:
+                obj = validator.validate_json(candidate)
+                break
+            except ValidationError as e:
+                if _is_json_syntax_error(e):
+                    continue  # «{"см. приложение"}» и т.п. — пробуем следующий кандидат
+                raise
+        if obj is None:
+            raise first_error
+
+    return ValidatedResult.from_model(obj, schema=schema)
+
+
+def validate_and_dump_json(model_output_text: str, schema: str = DEFAULT_SCHEMA) -> str:
+    """
+    Совместимая обёртка над validate_extraction: возвращает только компактную
+    JSON-строку (exclude_none=True). Бросает ValidationError при несоответствии схеме.
+    """
+    return validate_extraction(model_output_text, schema=schema).clean_json
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+infra/normalize.py — нормализация извлечённых значений после валидации.
+
+Промпт просит даты в YYYY-MM-DD и числа без пробелов, но модель часто
+возвращает «до 15 марта 2025 г.», «с 01.03.2025 по 31.03.2025»,
+«в течение 30 (тридцати) календарных дней», «1 500 000,00 руб.».
+Здесь — предкомпилированные шаблоны для русских форматов дат, интервалов,
+количеств и денежных сумм. Результат: для каждого поля словарь с исходной
+строкой ("raw") и типизированными значениями рядом.
+
+normalize_results() обрабатывает набор результатов за один проход;
+одинаковые строки (частые «в течение 30 дней») разбираются один раз.
+Кэшируемые разборщики со словарями/списками в результате (_parse_period,
+_parse_money, _parse_terms) наружу не отдаются: публичные функции
+возвращают копию, чтобы изменение результата не портило кэш.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# ============================== ШАБЛОНЫ ==============================
+
+_MONTHS = {
+    "январ": 1, "феврал": 2, "март": 3, "апрел": 4, "ма": 5, "июн": 6,
+    "июл": 7, "август": 8, "сентябр": 9, "октябр": 10, "ноябр": 11, "декабр": 12,
+}
+_MONTH_ALT = r"(?P<mon>январ[ья]|феврал[ья]|марта?|апрел[ья]|ма[йя]|июн[ья]|июл[ья]|августа?|сентябр[ья]|октябр[ья]|ноябр[ья]|декабр[ья])"
+
+# Одна дата в любом из поддерживаемых форматов (именованные группы разных веток)
+_DATE = (
+    r"(?:(?P<iy>\d{4})-(?P<im>\d{1,2})-(?P<id>\d{1,2})"
+    r"|(?P<nd>\d{1,2})[./](?P<nm>\d{1,2})[./](?P<ny>\d{4}|\d{2})(?!\d)"
+    r"|«?(?P<td>\d{1,2})»?\s+" + _MONTH_ALT + r"\s+(?P<ty>\d{4}))"
+)
+_DATE_RE = re.compile(_DATE, re.IGNORECASE)
+
+# Интервал «с <дата> по <дата>» или «<дата> — <дата>»
+_INTERVAL_RE = re.compile(
+    r"(?:\bс\s+)?(?P<a>" + _DATE.replace("?P<", "?P<a_") + r")\s*(?:г\.?\s*)?"
+    r"(?:по|до|-|–|—)\s*(?P<b>" + _DATE.replace("?P<", "?P<b_") + r")",
+    re.IGNORECASE,
+)
+
+# «не позднее <даты>», «до <даты>» — верхняя граница
+_UNTIL_RE = re.compile(r"\b(?:не\s+позднее|не\s+позже|до|по)\s*$", re.IGNORECASE)
+
+# «в течение 30 (тридцати) календарных дней», «10 рабочих дней», «2 месяцев»
+_PERIOD_RE = re.compile(
+    r"(?P<n>\d{1,4})\s*(?:\([^)]*\)\s*)?(?P<kind>календарн\w*|рабоч\w*|банковск\w*)?\s*"
+    r"(?P<unit>дн(?:я|ей|ь)|недел[ьиюя]\w*|месяц\w*)",
+    re.IGNORECASE,
+)
+
+# Число с разделителями разрядов: «1 500 000,00», «1 500», «1500.5»
+_NUMBER = r"\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?"
+
+_QTY_RE = re.compile(
+    r"(?P<num>" + _NUMBER + r")\s*(?P<unit>шт|штук\w*|ед\.?|единиц\w*|компл\w*|к-т|упак\w*|кг|т\b|м2|м³|м3|м\b|л\b|пар\w*)?",
+    re.IGNORECASE,
+)
+
+_MULTIPLIERS = {"тыс": 1_000, "млн": 1_000_000, "млрд": 1_000_000_000}
+_CURRENCIES = (
+    ("RUB", r"руб\w*|₽|rub|р\.(?!\w)"),
+    ("USD", r"долл\w*|\$|usd"),
+    ("EUR", r"евро|€|eur"),
+    ("CNY", r"юан\w*|¥|cny"),
+)
+_CURRENCY_ALT = "|".join(f"(?P<{code}>{alt})" for code, alt in _CURRENCIES)
+_MONEY_RE = re.compile(
+    r"(?P<num>" + _NUMBER + r")\s*(?P<mult>тыс|млн|млрд)?\.?\s*(?:" + _CURRENCY_ALT + r")",
+    re.IGNORECASE,
+)
+
+_PERCENT_RE = re.compile(r"(?P<num>\d{1,3}(?:[.,]\d+)?)\s*(?:%|процент\w*)", re.IGNORECASE)
+_PREPAY_RE = re.compile(r"предоплат|аванс", re.IGNORECASE)
+
+
+# ============================ РАЗБОР ЗНАЧЕНИЙ ============================
+
+def _to_number(text: str) -> float:
+    return float(re.sub(r"[ \u00a0\u202f]", "", text).replace(",", "."))
+
+
+def _date_from_match(m: "re.Match[str]", prefix: str = "") -> Optional[str]:
+    g = m.groupdict()
+    try:
+        if g.get(prefix + "iy"):
+            d = date(int(g[prefix + "iy"]), int(g[prefix + "im"]), int(g[prefix + "id"]))
+        elif g.get(prefix + "ny"):
+            year = int(g[prefix + "ny"])
+            if year < 100:
+                year += 2000
+            d = date(year, int(g[prefix + "nm"]), int(g[prefix + "nd"]))
+        elif g.get(prefix + "ty"):
+            mon = g[prefix + "mon"].lower()
+            month = next(v for k, v in _MONTHS.items() if mon.startswith(k))
+            d = date(int(g[prefix + "ty"]), month, int(g[prefix + "td"]))
+        else:
+            return None
+    except (ValueError, StopIteration):
+        return None
+    return d.isoformat()
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> Optional[str]:
+    """Первая дата в строке в формате YYYY-MM-DD (или None)."""
+    m = _DATE_RE.search(text or "")
+    return _date_from_match(m) if m else None
+
+
+def _fresh(value: Any) -> Any:
+    """Копия кэшированного результата (вложенные dict/list из скаляров)."""
+    if isinstance(value, dict):
+        return {k: _fresh(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fresh(v) for v in value]
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _parse_period(text: str) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    if not text:
+        return out
+
+    m = _INTERVAL_RE.search(text)
+    if m:
+        a = _date_from_match(m, "a_")
+        b = _date_from_match(m, "b_")
+        if a and b:
+            out["date_from"], out["date_to"] = a, b
+    if not out:
+        m = _DATE_RE.search(text)
+        if m:
+            d = _date_from_match(m)
+            if d:
+                if _UNTIL_RE.search(text[:m.start()]):
+                    out["date_to"] = d
+                else:
+                    out["date"] = d
+
+    m = _PERIOD_RE.search(text)
+    if m:
+        n = int(m.group("n"))
+        unit = m.group("unit").lower()
+        if unit.startswith("недел"):
+            n *= 7
+        elif unit.startswith("месяц"):
+            n *= 30
+        out["days"] = n
+        kind = (m.group("kind") or "").lower()
+        if kind:
+            out["day_kind"] = "business" if kind.startswith(("рабоч", "банковск")) else "calendar"
+    return out
+
+
+def parse_period(text: str) -> Dict[str, Any]:
+    """
+    Срок: дата, интервал или относительный период.
+    Возвращает только найденные ключи: date, date_from, date_to, days, day_kind.
+    """
+    return _fresh(_parse_period(text))
+
+
+@lru_cache(maxsize=4096)
+def parse_quantity(text: str) -> Optional[Tuple[float, Optional[str]]]:
+    """«1 500 шт.» -> (1500.0, "шт"). None, если числа нет."""
+    m = _QTY_RE.search(text or "")
+    if not m:
+        return None
+    unit = m.group("unit")
+    return _to_number(m.group("num")), (unit.rstrip(".").lower() if unit else None)
+
+
+@lru_cache(maxsize=4096)
+def _parse_money(text: str) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for m in _MONEY_RE.finditer(text or ""):
+        amount = _to_number(m.group("num"))
+        mult = m.group("mult")
+        if mult:
+            amount *= _MULTIPLIERS[mult.lower()]
+        currency = next(code for code, _ in _CURRENCIES if m.group(code))
+        out.append({"amount": round(amount, 2), "currency": currency})
+    return out
+
+
+def parse_money(text: str) -> List[Dict[str, Any]]:
+    """Все денежные суммы в строке: [{"amount": 1500000.0, "currency": "RUB"}, ...]."""
+    return _fresh(_parse_money(text))
+
+
+@lru_cache(maxsize=4096)
+def _parse_terms(text: str) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    if not text:
+        return out
+    percents = [_to_number(m.group("num")) for m in _PERCENT_RE.finditer(text)]
+    if percents:
+        out["percents"] = percents
+        m = _PREPAY_RE.search(text)
+        if m:
+            # процент, ближайший к слову «предоплата»/«аванс»
+            nearest = min(_PERCENT_RE.finditer(text), key=lambda p: abs(p.start() - m.start()))
+            out["prepayment_pct"] = _to_number(nearest.group("num"))
+    money = _parse_money(text)
+    if money:
+        out["amounts"] = money
+    out.update(_parse_period(text))
+    return out
+
+
+def parse_terms(text: str) -> Dict[str, Any]:
+    """Условия оплаты/ответственности: проценты, предоплата, суммы и сроки."""
+    return _fresh(_parse_terms(text))
+
+
+# ========================= НОРМАЛИЗАЦИЯ РЕЗУЛЬТАТОВ =========================
+
+# Поле (путь через точку) -> разборщик. Поля, которых нет в схеме, просто пропускаются.
+_FIELD_PARSERS = {
+    "delivery.deadline": parse_period,
+    "contract.date": parse_period,
+    "request.response_deadline": parse_period,
+    "payment_terms": parse_terms,
+    "penalties": parse_terms,
+}
+
+
+def _get_path(data: Dict[str, Any], path: str) -> Any:
+    cur: Any = data
+    for part in path.split("."):
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(part)
+    return cur
+
+
+def normalize_extract(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Нормализует один результат (dict из ValidatedResult.data).
+    Возвращает {"delivery.deadline": {"raw": "...", "date_to": "2025-03-15"}, ...}
+    только для непустых строковых полей.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    for path, parser in _FIELD_PARSERS.items():
+        raw = _get_path(data, path)
+        if isinstance(raw, str) and raw.strip():
+            typed = parser(raw.strip())  # свежая копия: кэш разборщика не затрагивается
+            typed["raw"] = raw
+            out[path] = typed
+    return out
+
+
+def normalize_results(results: Iterable[Any]) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Пакетная нормализация: принимает dict-ы или ValidatedResult и возвращает
+    список нормализованных полей в том же порядке. Разборщики мемоизированы,
+    поэтому повторяющиеся строки во всём наборе разбираются один раз.
+    """
+    return [normalize_extract(getattr(r, "data", r)) for r in results]
+
+
+__all__ = [
+    "parse_date",
+    "parse_period",
+    "parse_quantity",
+    "parse_money",
+    "parse_terms",
+    "normalize_extract",
+    "normalize_results",
+]
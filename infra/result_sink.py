@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+infra/result_sink.py — куда сохраняются провалидированные результаты (--save-dir).
+
+Два вида хранилища с общим интерфейсом write(record) -> путь:
+
+  * JsonlSink — компактные записи дописываются в results.jsonl или, при
+    RESULT_SINK_PARTITION = "daily", в results-YYYYmmdd.jsonl. С
+    RESULT_SINK_GZIP каждая запись пишется отдельным gzip-блоком
+    (results-YYYYmmdd.jsonl.gz): склейка блоков — корректный gzip-файл,
+    который читают zcat и gzip.open, а одну запись можно распаковать по
+    смещению, не трогая остальные;
+  * FileSink — прежнее поведение: отдельный JSON-файл на каждый результат.
+
+Рядом с данными лежит индекс index.sqlite3: store_id / tender_id → (файл,
+смещение, длина). get(store_id=…) читает ровно одну запись без сканирования
+файлов. Если индекс потерян или отстал (процесс упал между записью и
+индексацией), его восстанавливает reindex().
+
+В одну папку могут писать несколько процессов (batch и hotfolder с общим
+--save-dir): JsonlSink берёт монопольную блокировку файла данных (flock,
+в Windows — msvcrt) на время «смещение конца → запись», поэтому смещения
+в индексе не перекрываются.
+
+    python -m infra.result_sink results/ --store-id vs_abc     # запись по store_id
+    python -m infra.result_sink results/ --tender-id T-42      # по тендеру
+    python -m infra.result_sink results/ --reindex             # перестроить индекс
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+try:
+    import fcntl  # POSIX: монопольная блокировка файла данных между процессами
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+from infra.config import RESULT_SINK, RESULT_SINK_GZIP, RESULT_SINK_PARTITION
+from infra.models import ValidatedResult
+from infra.tracing import current_trace_id
+
+INDEX_NAME = "index.sqlite3"
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts         TEXT,
+    store_id   TEXT,
+    tender_id  TEXT,
+    file       TEXT NOT NULL,
+    offset     INTEGER NOT NULL,
+    length     INTEGER NOT NULL,
+    UNIQUE (file, offset)
+);
+CREATE INDEX IF NOT EXISTS ix_results_store ON results(store_id);
+CREATE INDEX IF NOT EXISTS ix_results_tender ON results(tender_id);
+"""
+
+
+def build_record(
+    store_id: Optional[str],
+    result: ValidatedResult,
+    *,
+    tender_id: Optional[str] = None,
+    trace_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Запись результата в формате журнала (phase = "result"); trace_id по умолчанию — текущей трассы."""
+    record: Dict[str, Any] = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "phase": "result",
+        "store_id": store_id,
+    }
+    if tender_id:
+        record["tender_id"] = tender_id
+    trace_id = trace_id or current_trace_id()
+    if trace_id:
+        record["trace_id"] = trace_id
+    record.update({
+        "schema": result.schema,
+        "result": result.data,
+        "normalized": result.normalized,
+        "note": "validated",
+    })
+    return record
+
+
+# ============================== ИНДЕКС ==============================
+
+class _ResultIndex:
+    """store_id / tender_id → (файл относительно папки, смещение, длина)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._db = sqlite3.connect(os.path.join(directory, INDEX_NAME), timeout=30.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_INDEX_SCHEMA)
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any], path: str, offset: int, length: int) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (ts, store_id, tender_id, file, offset, length) VALUES (?, ?, ?, ?, ?, ?)",
+                (record.get("ts"), record.get("store_id"), record.get("tender_id"),
+                 os.path.relpath(path, self.directory), offset, length),
+            )
+
+    def lookup(self, *, store_id: Optional[str] = None, tender_id: Optional[str] = None) -> List[Tuple[str, int, int]]:
+        """Все места записи по ключу — от новых к старым."""
+        column, value = ("store_id", store_id) if store_id else ("tender_id", tender_id)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT file, offset, length FROM results WHERE {column} = ? ORDER BY id DESC", (value,)
+            ).fetchall()
+        return [(os.path.join(self.directory, f), o, n) for f, o, n in rows]
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+@contextmanager
+def _exclusive(fp) -> Iterator[None]:
+    """Монопольная блокировка открытого файла данных (между процессами)."""
+    if fcntl is not None:
+        fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+    elif msvcrt is not None:  # pragma: no cover - Windows
+        fp.seek(0)
+        msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:  # pragma: no cover - Windows
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _decode(blob: bytes, path: str) -> Dict[str, Any]:
+    if path.endswith(".gz"):
+        blob = gzip.decompress(blob)
+    return json.loads(blob.decode("utf-8"))
+
+
+# ============================== ХРАНИЛИЩА ==============================
+
+class ResultSink(ABC):
+    """Общая часть: индекс и чтение по ключу. Подклассы реализуют _append()."""
+
+    def __init__(self, directory: str, index: bool = True):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = _ResultIndex(self.directory) if index else None
+
+    def write(self, record: Dict[str, Any]) -> str:
+        """Сохраняет запись, возвращает путь файла, в котором она лежит."""
+        path, offset, length = self._append(record)
+        if self._index is not None:
+            self._index.add(record, path, offset, length)
+        return path
+
+    @abstractmethod
+    def _append(self, record: Dict[str, Any]) -> Tuple[str, int, int]:
+        """Дописывает запись; возвращает (файл, смещение, длина)."""
+
+    def get(self, *, store_id: Optional[str] = None, tender_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Последняя запись по store_id или tender_id (None — нет такой)."""
+        if self._index is None:
+            raise RuntimeError("result index is disabled for this sink")
+        for path, offset, length in self._index.lookup(store_id=store_id, tender_id=tender_id):
+            try:
+                with open(path, "rb") as fp:
+                    fp.seek(offset)
+                    return _decode(fp.read(length), path)
+            except (OSError, ValueError, EOFError):
+                continue  # файл удалён/повреждён — пробуем более раннюю запись
+        return None
+
+    @abstractmethod
+    def iter_records(self) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        """(файл, смещение, длина, запись) по всем данным папки — для reindex()."""
+
+    def reindex(self) -> int:
+        """Перестраивает индекс по файлам данных; возвращает число записей."""
+        if self._index is None:
+            return 0
+        n = 0
+        with self._lock:
+            self._index.clear()
+            for path, offset, length, record in self.iter_records():
+                self._index.add(record, path, offset, length)
+                n += 1
+        return n
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+
+
+class JsonlSink(ResultSink):
+    """Дописывает компактные записи в общий (или дневной) JSONL, по желанию — gzip-блоками."""
+
+    def __init__(self, directory: str, partition: Optional[str] = RESULT_SINK_PARTITION,
+                 compress: bool = RESULT_SINK_GZIP, index: bool = True):
+        super().__init__(directory, index=index)
+        self.partition = partition
+        self.compress = compress
+        self._path: Optional[str] = None
+        self._fp = None
+
+    def _current_path(self) -> str:
+        name = "results"
+        if self.partition == "daily":
+            name += datetime.now().strftime("-%Y%m%d")
+        return os.path.join(self.directory, name + (".jsonl.gz" if self.compress else ".jsonl"))
+
+    def _append(self, record: Dict[str, Any]) -> Tuple[str, int, int]:
+        data = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data, mtime=0)
+        with self._lock:
+            path = self._current_path()
+            if path != self._path:
+                if self._fp is not None:
+                    self._fp.close()
+                self._fp = open(path, "ab")
+                self._path = path
+            with _exclusive(self._fp):  # конец файла мог сдвинуть другой процесс
+                offset = self._fp.seek(0, os.SEEK_END)
+                self._fp.write(data)
+                self._fp.flush()
+        return path, offset, len(data)
+
+    def _data_files(self) -> List[str]:
+        names = sorted(
+            n for n in os.listdir(self.directory)
+            if n.startswith("results") and (n.endswith(".jsonl") or n.endswith(".jsonl.gz"))
+        )
+        return [os.path.join(self.directory, n) for n in names]
+
+    def iter_records(self) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        for path in self._data_files():
+            if path.endswith(".gz"):
+                yield from self._iter_gzip_members(path)
+                continue
+            with open(path, "rb") as fp:
+                offset = 0
+                for line in fp:
+                    if line.strip():
+                        try:
+                            yield path, offset, len(line), json.loads(line)
+                        except ValueError:
+                            pass  # недописанная строка после падения
+                    offset += len(line)
+
+    @staticmethod
+    def _iter_gzip_members(path: str, chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        with open(path, "rb") as fp:
+            blob = fp.read()
+        offset = 0
+        while offset < len(blob):
+            d = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            parts: List[bytes] = []
+            pos = offset
+            try:
+                while not d.eof and pos < len(blob):
+                    chunk = blob[pos:pos + chunk_size]
+                    parts.append(d.decompress(chunk))
+                    pos += len(chunk)
+            except zlib.error:
+                return  # хвост после падения — дальше читать нечего
+            if not d.eof:
+                return
+            length = pos - offset - len(d.unused_data)
+            for line in b"".join(parts).splitlines():
+                if line.strip():
+                    yield path, offset, length, json.loads(line)
+            offset += length
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+                self._path = None
+        super().close()
+
+
+class FileSink(ResultSink):
+    """Отдельный JSON-файл extract_<время>_<store>_<uuid>.json на каждый результат."""
+
+    def _append(self, record: Dict[str, Any]) -> Tuple[str, int, int]:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        sid = (record.get("store_id") or "noid").replace("/", "_")
+        path = os.path.join(self.directory, f"extract_{stamp}_{sid}_{uuid4().hex[:6]}.json")
+        data = json.dumps(record, ensure_ascii=False, indent=2).encode("utf-8")
+        with open(path, "wb") as fp:
+            fp.write(data)
+        return path, 0, len(data)
+
+    def iter_records(self) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith("extract_") and name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    with open(path, "rb") as fp:
+                        data = fp.read()
+                    yield path, 0, len(data), json.loads(data)
+                except (OSError, ValueError):
+                    continue
+
+
+# ============================== ОТКРЫТИЕ ==============================
+
+_sinks: Dict[Tuple[str, str], ResultSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(directory: str, kind: str = RESULT_SINK) -> ResultSink:
+    """
+    Хранилище для папки (одно на процесс: параллельные batch/hotfolder/API
+    дописывают в один открытый файл под общей блокировкой; другие процессы
+    разделяет блокировка файла данных).
+    """
+    key = (os.path.abspath(directory), kind)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            if kind == "files":
+                sink = FileSink(directory)
+            elif kind == "jsonl":
+                sink = JsonlSink(directory)
+            else:
+                raise ValueError(f"unknown result sink: {kind}")
+            _sinks[key] = sink
+        return sink
+
+
+def save_result(
+    directory: str,
+    store_id: Optional[str],
+    result: ValidatedResult,
+    *,
+    tender_id: Optional[str] = None,
+    trace_id: Optional[str] = None,
+) -> str:
+    """Сохраняет результат в хранилище папки directory; возвращает путь файла."""
+    record = build_record(store_id, result, tender_id=tender_id, trace_id=trace_id)
+    return get_sink(directory).write(record)
+
+
+@atexit.register
+def close_all() -> None:
+    with _sinks_lock:
+        for sink in _sinks.values():
+            sink.close()
+        _sinks.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m infra.result_sink", description="Поиск сохранённых результатов.")
+    parser.add_argument("directory", help="Папка результатов (--save-dir).")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--store-id", dest="store_id")
+    group.add_argument("--tender-id", dest="tender_id")
+    group.add_argument("--reindex", action="store_true", help="Перестроить index.sqlite3 по файлам данных.")
+    parser.add_argument("--kind", choices=("jsonl", "files"), default=RESULT_SINK)
+    args = parser.parse_args(argv)
+
+    sink = get_sink(args.directory, args.kind)
+    if args.reindex:
+        print(f"записей: {sink.reindex()}")
+        return
+    record = sink.get(store_id=args.store_id, tender_id=args.tender_id)
+    if record is None:
+        raise SystemExit(1)
+    print(json.dumps(record, ensure_ascii=False, indent=2))
+
+
+__all__ = [
+    "ResultSink",
+    "JsonlSink",
+    "FileSink",
+    "build_record",
+    "get_sink",
+    "save_result",
+    "close_all",
+]
+
+
+if __name__ == "__main__":
+    main()
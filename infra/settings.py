@@ -7,7 +7,7 @@ import os
 import threading
 from typing import Any, Dict
 
-from infra.config import PROJECT_ROOT
+from infra.config import BASE_URL, PROJECT_ROOT
 
 SETTINGS_PATH = os.path.join(PROJECT_ROOT, "settings.json")
 DEFAULT_SETTINGS: Dict[str, Any] = {
@@ -76,6 +76,16 @@ def set_language(language: str) -> None:
     update_settings(language=language)
 
 
+def get_base_url(default: str = BASE_URL) -> str:
+    """API root: ``OPENAI_BASE_URL`` env, then ``base_url`` in settings.json, then ``config.BASE_URL``."""
+    env = os.environ.get("OPENAI_BASE_URL", "").strip()
+    if env:
+        return env
+    with _lock:
+        value = _ensure_loaded().get("base_url")
+    return str(value or default)
+
+
 __all__ = [
     "DEFAULT_SETTINGS",
     "SETTINGS_PATH",
@@ -84,4 +94,5 @@ __all__ = [
     "update_settings",
     "get_language",
     "set_language",
+    "get_base_url",
 ]
\ No newline at end of file
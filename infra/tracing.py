@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+infra/tracing.py — лёгкая трассировка этапов конвейера.
+
+    with span("upload_file", file=name, bytes=size) as sp:
+        ...
+        sp.set(file_id=file_id)
+
+Спаны вкладываются друг в друга через contextvars: внешний span без
+родителя открывает новую трассу (trace_id), вложенные попадают в неё же.
+trace_id текущей трассы добавляется в записи журнала (append_log), так что
+запуск можно найти и в журнале, и в трассе.
+
+Завершённые трассы хранятся в памяти (последние TRACE_KEEP_RECENT) и при
+заданном TRACE_EXPORT_DIR сохраняются в формате Chrome trace-event JSON —
+файл открывается в chrome://tracing или https://ui.perfetto.dev.
+
+Новые потоки не наследуют контекст автоматически: задачи для пулов
+запускайте через contextvars.copy_context().run(...), если их спаны должны
+попасть в трассу вызывающего.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from infra.config import TRACE_EXPORT_DIR, TRACE_KEEP_RECENT
+
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """Один этап: имя, интервал времени, атрибуты и место в дереве трассы."""
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start_us", "duration_us", "attrs", "tid", "_t0")
+
+    def __init__(self, name: str, trace: "Trace", parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent else None
+        self.attrs = attrs
+        self.tid = threading.get_ident()
+        self.start_us = time.time_ns() // 1000
+        self.duration_us: Optional[int] = None
+        self._t0 = time.perf_counter()
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def finish(self) -> None:
+        if self.duration_us is None:
+            self.duration_us = int((time.perf_counter() - self._t0) * 1_000_000)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_us": self.start_us,
+            "duration_us": self.duration_us,
+            "attrs": dict(self.attrs),
+        }
+
+
+class Trace:
+    """Завершённые спаны одной трассы (потокобезопасное накопление)."""
+
+    def __init__(self, name: str, trace_id: Optional[str] = None):
+        self.name = name
+        self.trace_id = trace_id or secrets.token_hex(8)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, sp: Span) -> None:
+        with self._lock:
+            self.spans.append(sp)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """Chrome trace-event JSON: события «X» (complete) с длительностью в микросекундах."""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: (s.start_us, s.span_id))
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": f"{self.name} {self.trace_id}"}},
+        ]
+        for sp in spans:
+            args = {k: v if isinstance(v, (str, int, float, bool)) or v is None else str(v) for k, v in sp.attrs.items()}
+            args.update(span_id=sp.span_id, parent_id=sp.parent_id)
+            events.append({
+                "name": sp.name,
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": sp.start_us,
+                "dur": sp.duration_us or 0,
+                "pid": pid,
+                "tid": sp.tid,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"trace_id": self.trace_id}}
+
+    def export_chrome(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f, ensure_ascii=False)
+        return path
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("pipeline_span", default=None)
+_recent: Deque[Trace] = deque(maxlen=max(1, int(TRACE_KEEP_RECENT)))
+
+
+def _finish_trace(trace: Trace) -> None:
+    _recent.append(trace)
+    if TRACE_EXPORT_DIR:
+        try:
+            trace.export_chrome(os.path.join(TRACE_EXPORT_DIR, f"trace_{trace.trace_id}.json"))
+        except OSError:
+            pass
+
+
+@contextmanager
+def span(name: str, /, **attrs: Any) -> Iterator[Span]:
+    """Открывает span; без активного родителя — новую трассу. Исключение записывается в attrs["error"]."""
+    parent = _current.get()
+    trace = parent.trace if parent is not None else Trace(name)
+    sp = Span(name, trace, parent, attrs)
+    token = _current.set(sp)
+    try:
+        yield sp
+    except BaseException as exc:
+        sp.attrs["error"] = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        sp.finish()
+        _current.reset(token)
+        trace.add(sp)
+        if parent is None:
+            _finish_trace(trace)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    sp = _current.get()
+    return sp.trace_id if sp is not None else None
+
+
+def get_trace(trace_id: str) -> Optional[Trace]:
+    """Недавняя завершённая трасса по trace_id (или None, если уже вытеснена)."""
+    for trace in reversed(_recent):
+        if trace.trace_id == trace_id:
+            return trace
+    return None
+
+
+__all__ = ["Span", "Trace", "span", "current_span", "current_trace_id", "get_trace"]
@@ -29,18 +29,21 @@ from infra.config import (
     JOURNAL_MAX_RECORDS,
 )
 from infra import localization as i18n
+from infra.models import ValidatedResult
 
 i18n.reload_language_from_settings()
 T = i18n.translate
 
 try:
-    from infra.log_journal import append_upload_entry, read_last  # type: ignore
+    from infra.log_journal import append_upload_entry, query_journal  # type: ignore
     _JOURNAL_OK = True
 except Exception:  # pragma: no cover - optional dependency
     append_upload_entry = None  # type: ignore
-    read_last = None  # type: ignore
+    query_journal = None  # type: ignore
     _JOURNAL_OK = False
 
+JOURNAL_PHASES = ("", "upload", "index", "response", "result", "validation_error")
+
 
 class SettingsDialog(Toplevel):
     """Simple settings window to select the interface language."""
@@ -135,7 +138,7 @@ class VectorStoreGUI(tk.Tk):
         self.journal_ok = _JOURNAL_OK
         self.selected_files: List[str] = []
         self.store_id: Optional[str] = None
-        self._last_clean_json: Optional[str] = None
+        self._last_result: Optional[ValidatedResult] = None
 
         self.status: tk.StringVar = tk.StringVar()
         self._status_key: Optional[str] = None
@@ -321,13 +324,6 @@ class VectorStoreGUI(tk.Tk):
         if also_print:
             print(msg, flush=True)
 
-    @staticmethod
-    def _format_json(text: str) -> str:
-        try:
-            return json.dumps(json.loads(text), ensure_ascii=False, indent=2)
-        except Exception:
-            return text
-
     def open_settings(self) -> None:
         if self.settings_window is not None and self.settings_window.winfo_exists():
             self.settings_window.lift()
@@ -347,7 +343,7 @@ class VectorStoreGUI(tk.Tk):
 
         self.selected_files = list(paths)
         self.store_id = None
-        self._last_clean_json = None
+        self._last_result = None
         if self.btn_process is not None:
             self.btn_process.config(state=tk.DISABLED)
         if self.txt_logs is not None:
@@ -420,17 +416,16 @@ class VectorStoreGUI(tk.Tk):
     def _handle_upload_success(self, result: PipelineResult) -> None:
         self._log(T("log.upload_complete"))
         self.store_id = result.store_id
-        self._last_clean_json = result.clean_json
+        self._last_result = result.result
 
         if self.store_id:
             self._set_status("status.ready_with_id", store_id=self.store_id)
         else:
             self._set_status("status.ready")
 
-        if result.clean_json:
-            pretty = self._format_json(result.clean_json)
+        if result.result is not None:
             self._log(T("log.extraction_header"))
-            self._log(pretty)
+            self._log(result.result.pretty())
             self._log(T("log.extraction_footer"))
 
         if result.saved_copy:
@@ -460,7 +455,7 @@ class VectorStoreGUI(tk.Tk):
 
         def worker() -> None:
             try:
-                result_json = run_extraction_with_vector_store(
+                result = run_extraction_with_vector_store(
                     store_id=self.store_id,
                     user_instruction=T("prompt.extract_instruction"),
                     model=DEFAULT_MODEL,
@@ -471,17 +466,16 @@ class VectorStoreGUI(tk.Tk):
             except Exception as exc:
                 self.after(0, lambda e=exc: self._handle_processing_error(e))
             else:
-                self.after(0, lambda payload=result_json: self._handle_processing_success(payload))
+                self.after(0, lambda r=result: self._handle_processing_success(r))
             finally:
                 self.after(0, self._processing_finish)
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _handle_processing_success(self, payload: str) -> None:
-        self._last_clean_json = payload
-        pretty = self._format_json(payload)
+    def _handle_processing_success(self, result: ValidatedResult) -> None:
+        self._last_result = result
         self._log(T("log.extraction_header"))
-        self._log(pretty)
+        self._log(result.pretty())
         self._log(T("log.extraction_footer"))
         self._set_status("status.processing_done")
 
@@ -506,7 +500,7 @@ class VectorStoreGUI(tk.Tk):
     # ---- Journal ---------------------------------------------------------
 
     def show_journal(self) -> None:
-        if not self.journal_ok or read_last is None:
+        if not self.journal_ok or query_journal is None:
             messagebox.showwarning(T("dialog.journal.title"), T("dialog.journal.missing"))
             return
 
@@ -514,26 +508,47 @@ class VectorStoreGUI(tk.Tk):
         top.title(T("journal.window_title"))
         top.geometry(JOURNAL_WINDOW_SIZE)
 
+        filters = tk.Frame(top)
+        filters.pack(fill=tk.X, padx=PAD_X, pady=(PAD_Y, 4))
+
+        tk.Label(filters, text=T("journal.filter.phase")).pack(side=tk.LEFT)
+        phase_var = tk.StringVar(value="")
+        ttk.Combobox(filters, state="readonly", textvariable=phase_var, values=JOURNAL_PHASES, width=16).pack(
+            side=tk.LEFT, padx=(4, 12)
+        )
+
+        tk.Label(filters, text=T("journal.filter.store_id")).pack(side=tk.LEFT)
+        store_var = tk.StringVar(value="")
+        tk.Entry(filters, textvariable=store_var, width=32).pack(side=tk.LEFT, padx=(4, 12))
+
         text = ScrolledText(top, font=LOG_FONT)
-        text.pack(fill=tk.BOTH, expand=True)
 
-        try:
-            rows = read_last(JOURNAL_MAX_RECORDS)
-        except Exception as exc:  # pragma: no cover - defensive UI path
-            top.destroy()
-            messagebox.showerror(T("dialog.journal.error_title"), str(exc))
-            return
+        def load() -> None:
+            try:
+                rows = query_journal(
+                    phase=phase_var.get() or None,
+                    store_id=store_var.get().strip() or None,
+                    limit=JOURNAL_MAX_RECORDS,
+                )
+            except Exception as exc:  # pragma: no cover - defensive UI path
+                messagebox.showerror(T("dialog.journal.error_title"), str(exc), parent=top)
+                return
 
-        if not rows:
-            text.insert(tk.END, T("journal.empty"))
-        else:
-            for row in rows:
-                try:
-                    pretty = json.dumps(row, ensure_ascii=False, indent=2)
-                except Exception:
-                    pretty = str(row)
-                text.insert(tk.END, pretty + "\n\n")
-        text.see(tk.END)
+            text.delete("1.0", tk.END)
+            if not rows:
+                text.insert(tk.END, T("journal.empty"))
+            else:
+                for row in rows:
+                    try:
+                        pretty = json.dumps(row, ensure_ascii=False, indent=2)
+                    except Exception:
+                        pretty = str(row)
+                    text.insert(tk.END, pretty + "\n\n")
+            text.see(tk.END)
+
+        tk.Button(filters, text=T("journal.filter.apply"), command=load).pack(side=tk.LEFT)
+        text.pack(fill=tk.BOTH, expand=True)
+        load()
 
 
 __all__ = ["VectorStoreGUI", "SettingsDialog"]
\ No newline at end of file